@@ -53,10 +53,15 @@ INSTALLED_APPS = [
 # -----------------------------------------------------------------------------
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.ApiGZipMiddleware",
+    "core.middleware.MetricasMiddleware",
+    "core.middleware.PresupuestoQueriesMiddleware",
+    "core.middleware.ConsultasLentasMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.PerfiladoMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -142,6 +147,12 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
 
+    # JSON con orjson (si está instalado); la API navegable solo en desarrollo
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.JSONRapidoRenderer",
+        *(["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
+    ],
+
     # Conservador: API pública por ahora (ya restringiste export en viewset).
     # Cuando metas auth con tokens, aquí lo afinamos.
     "DEFAULT_PERMISSION_CLASSES": [
@@ -149,6 +160,73 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Compresión de respuestas de la API (core.middleware.ApiGZipMiddleware)
+API_GZIP_PREFIJO = "/api/"
+API_GZIP_MIN_BYTES = env.int("API_GZIP_MIN_BYTES", default=1024)
+
+# -----------------------------------------------------------------------------
+# Ventas
+# -----------------------------------------------------------------------------
+# Minutos que dura una reserva de artículos antes de que el barrido la libere
+# (python manage.py liberar_reservas, cada minuto vía cron/systemd timer).
+VENTAS_RESERVA_TTL_MINUTOS = env.int("VENTAS_RESERVA_TTL_MINUTOS", default=30)
+
+# Concurrencia en servicios de venta (reservar/pagar/cancelar/entregar/recalcular):
+# - "pesimista": SELECT ... FOR UPDATE (default)
+# - "optimista": sin locks de fila; UPDATE compare-and-swap sobre `version` y
+#   reintento automático si hay conflicto.
+VENTAS_CONCURRENCIA = env("VENTAS_CONCURRENCIA", default="pesimista")
+
+# save() de InventarioItem/VentaDetalle/Pago (core.infrastructure.db.ValidacionEnBDMixin):
+# True: UNIQUE/CHECK los valida la BD (sin SELECT previo por constraint);
+# False: full_clean() completo antes de cada save().
+VALIDACION_EN_BD = env.bool("VALIDACION_EN_BD", default=True)
+
+# -----------------------------------------------------------------------------
+# Presupuesto de queries por request (core.middleware.PresupuestoQueriesMiddleware)
+# -----------------------------------------------------------------------------
+# Activo por default en desarrollo; en producción, con muestreo (p. ej. 0.01).
+PRESUPUESTO_QUERIES_ACTIVO = env.bool("PRESUPUESTO_QUERIES_ACTIVO", default=DEBUG)
+PRESUPUESTO_QUERIES_MUESTREO = env.float("PRESUPUESTO_QUERIES_MUESTREO", default=1.0)
+# Presupuesto para vistas sin @presupuesto_queries (None = solo detectar N+1)
+PRESUPUESTO_QUERIES_DEFAULT = env.int("PRESUPUESTO_QUERIES_DEFAULT", default=None)
+# Misma forma de SQL repetida N veces en un request = posible N+1
+PRESUPUESTO_QUERIES_REPETIDAS = env.int("PRESUPUESTO_QUERIES_REPETIDAS", default=5)
+# True: excederse lanza PresupuestoExcedido (tests/CI); False: solo log
+PRESUPUESTO_QUERIES_ESTRICTO = env.bool("PRESUPUESTO_QUERIES_ESTRICTO", default=False)
+
+# -----------------------------------------------------------------------------
+# Métricas Prometheus (/metrics)
+# -----------------------------------------------------------------------------
+# Multiproceso: exporta PROMETHEUS_MULTIPROC_DIR (directorio vacío) antes de
+# arrancar los workers. /metrics exige "Authorization: Bearer <METRICAS_TOKEN>"; sin
+# token responde 403, salvo con DEBUG (desarrollo), donde queda abierto.
+METRICAS_TOKEN = env("METRICAS_TOKEN", default="")
+
+# -----------------------------------------------------------------------------
+# Consultas lentas (core.middleware.ConsultasLentasMiddleware -> admin "Consultas lentas")
+# -----------------------------------------------------------------------------
+CONSULTAS_LENTAS_ACTIVO = env.bool("CONSULTAS_LENTAS_ACTIVO", default=True)
+CONSULTAS_LENTAS_UMBRAL_MS = env.float("CONSULTAS_LENTAS_UMBRAL_MS", default=500)
+# Fracción de SELECT lentos a los que se les corre EXPLAIN (ANALYZE, BUFFERS) en segundo plano
+CONSULTAS_LENTAS_MUESTREO_PLAN = env.float("CONSULTAS_LENTAS_MUESTREO_PLAN", default=0.1)
+CONSULTAS_LENTAS_EXPLAIN_TIMEOUT_MS = env.int("CONSULTAS_LENTAS_EXPLAIN_TIMEOUT_MS", default=10_000)
+
+# -----------------------------------------------------------------------------
+# Perfilado bajo demanda (core.middleware.PerfiladoMiddleware -> admin "Perfiles capturados")
+# -----------------------------------------------------------------------------
+# Staff: header `X-Perfilar: 1` o `?_perfilar=1` en cualquier vista (HTML o API)
+PERFILADO_ACTIVO = env.bool("PERFILADO_ACTIVO", default=True)
+PERFILADO_LINEAS = env.int("PERFILADO_LINEAS", default=60)  # funciones en el resumen pstats
+
+# -----------------------------------------------------------------------------
+# Health checks (/health/ liveness, /health/ready/ readiness)
+# -----------------------------------------------------------------------------
+# Resultado de readiness cacheado por proceso: los health checks no agregan carga.
+HEALTH_CACHE_SEGUNDOS = env.int("HEALTH_CACHE_SEGUNDOS", default=5)
+# Round trip a la BD arriba de esto = no listo
+HEALTH_DB_MAX_MS = env.int("HEALTH_DB_MAX_MS", default=250)
+
 # -----------------------------------------------------------------------------
 # Seguridad mínima en producción
 # -----------------------------------------------------------------------------
@@ -160,6 +238,14 @@ if not DEBUG:
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True
     SECURE_HSTS_PRELOAD = True
     SECURE_SSL_REDIRECT = True
+    # El balanceador prueba por HTTP directo al worker: sin redirect a https
+    SECURE_REDIRECT_EXEMPT = [r"^health/"]
+
+# -----------------------------------------------------------------------------
+# Tests
+# -----------------------------------------------------------------------------
+# Excluye por default los tags pesados (planes de consulta); se corren con --tag planes
+TEST_RUNNER = "core.test_runner.TestRunner"
 
 # -----------------------------------------------------------------------------
 # Logging configuration
@@ -179,5 +265,10 @@ LOGGING = {
             "level": "INFO",
             "propagate": True,
         },
+        "core": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
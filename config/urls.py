@@ -4,7 +4,7 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import RedirectView
 
-from core.views import login_view, logout_view
+from core.views import login_view, logout_view, metrics
 
 urlpatterns = [
     # Home -> login (o cámbialo a /inventario/ si prefieres)
@@ -20,6 +20,9 @@ urlpatterns = [
     # Health
     path("health/", include("core.urls")),
 
+    # Métricas Prometheus (sin slash final: así lo pide el scraper por default)
+    path("metrics", metrics, name="metrics"),
+
     # API
     path("api/", include("inventario.api.urls")),
 
@@ -1,3 +1,162 @@
+from __future__ import annotations
+
 from django.contrib import admin
+from django.db.models import Count, F, Max, Window
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+
+from .models import ConsultaLenta, PerfilCapturado
+
+
+# ----------------------------
+# Observabilidad
+# ----------------------------
+@admin.register(ConsultaLenta)
+class ConsultaLentaAdmin(admin.ModelAdmin):
+    """
+    Peores primero: ordenado por duración; `veces` y `peor_ms` agrupan por huella
+    (la misma forma de SQL) para ver qué query pega más seguido.
+    """
+
+    list_display = (
+        "duracion_ms",
+        "veces",
+        "peor_ms",
+        "vista",
+        "metodo",
+        "usuario",
+        "sql_corto",
+        "con_plan",
+        "creada_en",
+    )
+    list_filter = ("vista", "metodo", "creada_en")
+    search_fields = ("sql", "vista", "huella")
+    ordering = ("-duracion_ms",)
+    date_hierarchy = "creada_en"
+    list_select_related = ("usuario",)
+    readonly_fields = (
+        "creada_en",
+        "vista",
+        "metodo",
+        "usuario",
+        "duracion_ms",
+        "huella",
+        "sql_pre",
+        "plan_pre",
+    )
+    fields = readonly_fields
+
+    def get_queryset(self, request):
+        por_huella = {"partition_by": [F("huella")]}
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                _veces=Window(Count("id"), **por_huella),
+                _peor_ms=Window(Max("duracion_ms"), **por_huella),
+            )
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Veces", ordering="_veces")
+    def veces(self, obj):
+        return obj._veces
+
+    @admin.display(description="Peor (ms)", ordering="_peor_ms")
+    def peor_ms(self, obj):
+        return obj._peor_ms
+
+    @admin.display(description="SQL")
+    def sql_corto(self, obj):
+        return obj.sql[:120] + ("…" if len(obj.sql) > 120 else "")
+
+    @admin.display(description="Plan", boolean=True)
+    def con_plan(self, obj):
+        return bool(obj.plan)
+
+    @admin.display(description="SQL")
+    def sql_pre(self, obj):
+        return format_html("<pre style='white-space: pre-wrap'>{}</pre>", obj.sql)
+
+    @admin.display(description="EXPLAIN (ANALYZE, BUFFERS)")
+    def plan_pre(self, obj):
+        return format_html("<pre>{}</pre>", obj.plan or "—")
+
+
+@admin.register(PerfilCapturado)
+class PerfilCapturadoAdmin(admin.ModelAdmin):
+    """Perfiles pedidos con `X-Perfilar: 1` / `?_perfilar=1`. Solo lectura; el .prof se descarga."""
+
+    list_display = ("creado_en", "metodo", "ruta", "status", "duracion_ms", "queries", "db_ms", "usuario")
+    list_filter = ("vista", "metodo", "creado_en")
+    search_fields = ("ruta", "vista")
+    date_hierarchy = "creado_en"
+    list_select_related = ("usuario",)
+    readonly_fields = (
+        "creado_en",
+        "vista",
+        "metodo",
+        "ruta",
+        "status",
+        "usuario",
+        "duracion_ms",
+        "queries",
+        "db_ms",
+        "descargar",
+        "perfil_pre",
+        "sql_pre",
+    )
+    fields = readonly_fields
+
+    def get_queryset(self, request):
+        # El binario solo se lee al descargar
+        return super().get_queryset(request).defer("crudo")
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/prof/",
+                self.admin_site.admin_view(self.descargar_prof),
+                name="core_perfilcapturado_prof",
+            ),
+            *super().get_urls(),
+        ]
+
+    def descargar_prof(self, request, pk):
+        perfil = get_object_or_404(PerfilCapturado, pk=pk)
+        response = HttpResponse(bytes(perfil.crudo), content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="perfil-{perfil.pk}.prof"'
+        return response
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Archivo .prof")
+    def descargar(self, obj):
+        url = reverse("admin:core_perfilcapturado_prof", args=[obj.pk])
+        return format_html("<a href='{}'>perfil-{}.prof</a> (pstats / snakeviz)", url, obj.pk)
+
+    @admin.display(description="cProfile")
+    def perfil_pre(self, obj):
+        return format_html("<pre>{}</pre>", obj.perfil or "—")
 
-# Register your models here.
+    @admin.display(description="SQL (inicio ms · duración ms)")
+    def sql_pre(self, obj):
+        if not obj.sql:
+            return "—"
+        filas = format_html_join(
+            "\n",
+            "{}  {}  {}",
+            ((f"{q['inicio_ms']:9.1f}", f"{q['ms']:8.1f}", q["sql"]) for q in obj.sql),
+        )
+        return format_html("<pre style='white-space: pre-wrap'>{}</pre>", filas)
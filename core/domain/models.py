@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import models
+
+
+# ----------------------------
+# Observabilidad
+# ----------------------------
+class ConsultaLenta(models.Model):
+    """
+    SQL que pasó el umbral (CONSULTAS_LENTAS_UMBRAL_MS). Sin parámetros: solo la
+    forma del SQL con placeholders (y literales redactados).
+    `plan` = EXPLAIN (ANALYZE, BUFFERS) para una muestra de los SELECT.
+    """
+
+    creada_en = models.DateTimeField(auto_now_add=True)
+    vista = models.CharField(max_length=200, blank=True, db_index=True)
+    metodo = models.CharField(max_length=10, blank=True)
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    duracion_ms = models.FloatField()
+    sql = models.TextField()
+    huella = models.CharField(max_length=32, db_index=True)  # md5 del SQL normalizado: agrupa "la misma" query
+    plan = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Consulta lenta"
+        verbose_name_plural = "Consultas lentas"
+        ordering = ("-creada_en", "-id")
+        indexes = [
+            models.Index(fields=["-duracion_ms"], name="consultalenta_duracion_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.duracion_ms:.0f}ms {self.vista or '-'}"
+
+
+class PerfilCapturado(models.Model):
+    """
+    Perfil cProfile de un request puntual (staff con `X-Perfilar: 1` o `?_perfilar=1`).
+    `perfil` = pstats legible; `crudo` = stats en formato .prof (snakeviz/pstats);
+    `sql` = línea de tiempo [{"inicio_ms", "ms", "sql"}] de las queries del request.
+    """
+
+    creado_en = models.DateTimeField(auto_now_add=True)
+    vista = models.CharField(max_length=200, blank=True, db_index=True)
+    metodo = models.CharField(max_length=10, blank=True)
+    ruta = models.CharField(max_length=500, blank=True)
+    status = models.PositiveSmallIntegerField(null=True, blank=True)
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    duracion_ms = models.FloatField()
+    queries = models.PositiveIntegerField(default=0)
+    db_ms = models.FloatField(default=0)
+    perfil = models.TextField(blank=True)
+    crudo = models.BinaryField(blank=True, editable=False)
+    sql = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        verbose_name = "Perfil capturado"
+        verbose_name_plural = "Perfiles capturados"
+        ordering = ("-creado_en", "-id")
+
+    def __str__(self) -> str:
+        return f"{self.metodo} {self.ruta} ({self.duracion_ms:.0f}ms)"
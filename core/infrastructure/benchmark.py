@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from inventario.models import Articulo, ArticuloEstado, Categoria, InventarioItem, Ubicacion
+from ventas.application.services import cancelar_venta, marcar_pagada, reservar_articulos
+from ventas.models import Cliente, MetodoPago, Venta, VentaDetalle, VentaEstado
+
+
+@dataclass
+class Escenario:
+    """
+    `correr(estado)` es lo que se mide. `preparar()` (opcional) arma el estado
+    sin medirse. Cada repetición corre en una transacción que se revierte:
+    el dataset no cambia entre corridas ni entre benchmarks.
+    """
+
+    nombre: str
+    correr: Callable[[Any], Any]
+    preparar: Callable[[], Any] | None = None
+
+
+@dataclass
+class Medicion:
+    nombre: str
+    repeticiones: int
+    wall_ms_p50: float
+    wall_ms_min: float
+    wall_ms_max: float
+    queries: int
+    db_ms: float
+    peak_kb: float
+
+
+@dataclass
+class Reporte:
+    meta: dict[str, Any] = field(default_factory=dict)
+    resultados: dict[str, Medicion] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"meta": self.meta, "resultados": {k: asdict(v) for k, v in self.resultados.items()}}
+
+
+# ----------------------------
+# Medición
+# ----------------------------
+def _una_corrida(escenario: Escenario, memoria: bool) -> tuple[float, int, float, float]:
+    with transaction.atomic():
+        estado = escenario.preparar() if escenario.preparar else None
+        if memoria:
+            tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as ctx:
+                t0 = time.perf_counter()
+                escenario.correr(estado)
+                wall = (time.perf_counter() - t0) * 1000
+            peak = tracemalloc.get_traced_memory()[1] / 1024 if memoria else 0.0
+        finally:
+            if memoria:
+                tracemalloc.stop()
+        transaction.set_rollback(True)
+
+    db_ms = sum(float(q.get("time") or 0) for q in ctx.captured_queries) * 1000
+    return wall, len(ctx.captured_queries), db_ms, peak
+
+
+def medir(escenario: Escenario, repeticiones: int = 5, calentamiento: int = 1) -> Medicion:
+    """
+    Tiempos sin tracemalloc (lo alentaría); la memoria pico sale de una corrida aparte.
+    Queries/DB time de la última corrida medida (deben ser estables).
+    """
+    for _ in range(calentamiento):
+        _una_corrida(escenario, memoria=False)
+
+    tiempos = []
+    queries = 0
+    db_ms = 0.0
+    for _ in range(repeticiones):
+        wall, queries, db_ms, _ = _una_corrida(escenario, memoria=False)
+        tiempos.append(wall)
+
+    *_, peak = _una_corrida(escenario, memoria=True)
+
+    return Medicion(
+        nombre=escenario.nombre,
+        repeticiones=repeticiones,
+        wall_ms_p50=round(statistics.median(tiempos), 2),
+        wall_ms_min=round(min(tiempos), 2),
+        wall_ms_max=round(max(tiempos), 2),
+        queries=queries,
+        db_ms=round(db_ms, 2),
+        peak_kb=round(peak, 1),
+    )
+
+
+# ----------------------------
+# Escenarios
+# ----------------------------
+def _get(client: Client, url: str) -> Callable[[Any], None]:
+    def correr(_):
+        # secure=True: sin DEBUG, SECURE_SSL_REDIRECT mandaría 301 a https
+        response = client.get(url, secure=True)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} -> {response.status_code}")
+        # Consumir el cuerpo: exports/streaming cuentan completos
+        if response.streaming:
+            b"".join(response.streaming_content)
+        else:
+            response.content
+
+    return correr
+
+
+def _venta_con_detalles(usuario, detalles: int) -> Venta:
+    articulos = list(
+        Articulo.objects.filter(estado=ArticuloEstado.DISPONIBLE, venta_detalle__isnull=True)
+        .select_related("producto")
+        .order_by("id")[:detalles]
+    )
+    if len(articulos) < detalles:
+        raise RuntimeError("No hay artículos DISPONIBLE suficientes (corre generar_dataset).")
+
+    venta = Venta.objects.create(cliente=Cliente.objects.order_by("id").first(), vendedor=usuario)
+    VentaDetalle.objects.bulk_create(
+        [VentaDetalle(venta=venta, articulo=a, precio=a.producto.precio_venta) for a in articulos]
+    )
+    Venta.recalcular_totales_por_id(venta.pk)
+    venta.refresh_from_db()
+    return venta
+
+
+def escenarios(usuario, detalles: int = 3, busqueda: str = "dell") -> list[Escenario]:
+    client = Client()
+    client.force_login(usuario)
+
+    total_items = InventarioItem.objects.count()
+    pagina_media = max(1, total_items // settings.REST_FRAMEWORK.get("PAGE_SIZE", 20) // 2)
+
+    # Exports acotados a una categoría/ubicación (sin filtro serían todo el inventario)
+    filtro = ""
+    categoria = Categoria.objects.order_by("id").values_list("id", flat=True).first()
+    ubicacion = Ubicacion.objects.order_by("id").values_list("id", flat=True).first()
+    if categoria and ubicacion:
+        filtro = f"?categoria={categoria}&ubicacion={ubicacion}"
+
+    lista = [
+        Escenario("item_list", _get(client, "/inventario/")),
+        Escenario("item_list_busqueda", _get(client, f"/inventario/?q={busqueda}")),
+        Escenario("api_items_p1", _get(client, "/api/items/")),
+        Escenario("api_items_pagina_media", _get(client, f"/api/items/?page={pagina_media}")),
+        Escenario("export_xlsx", _get(client, f"/api/items/export/xlsx/{filtro}")),
+        Escenario("export_pdf", _get(client, f"/api/items/export/pdf/{filtro}")),
+    ]
+
+    venta_id = (
+        Venta.objects.filter(estado__in=[VentaEstado.PAGADA, VentaEstado.ENTREGADA])
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+    )
+    if venta_id:
+        lista.append(Escenario("venta_detail", _get(client, f"/ventas/{venta_id}/")))
+
+    def preparar():
+        return _venta_con_detalles(usuario, detalles)
+
+    def preparar_reservada():
+        return reservar_articulos(_venta_con_detalles(usuario, detalles))
+
+    lista += [
+        Escenario("reservar", reservar_articulos, preparar),
+        Escenario("pagar", lambda v: marcar_pagada(v, MetodoPago.EFECTIVO, v.total), preparar_reservada),
+        Escenario("cancelar", cancelar_venta, preparar_reservada),
+    ]
+    return lista
+
+
+def correr_benchmarks(usuario, repeticiones: int = 5, solo: list[str] | None = None, **opciones) -> Reporte:
+    reporte = Reporte(
+        meta={
+            "fecha": timezone.now().isoformat(),
+            "repeticiones": repeticiones,
+            "concurrencia": settings.VENTAS_CONCURRENCIA,
+            "items": InventarioItem.objects.count(),
+            "articulos": Articulo.objects.count(),
+            "ventas": Venta.objects.count(),
+        }
+    )
+    # El Client de pruebas usa "testserver" como host
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for escenario in escenarios(usuario, **opciones):
+            if solo and escenario.nombre not in solo:
+                continue
+            reporte.resultados[escenario.nombre] = medir(escenario, repeticiones)
+    return reporte
+
+
+# ----------------------------
+# Baseline
+# ----------------------------
+def comparar(actual: dict[str, Any], baseline: dict[str, Any], tolerancia: float = 0.25) -> list[str]:
+    """
+    Regresiones contra un reporte guardado (mismo formato que Reporte.as_dict()):
+    - queries: cualquier aumento (son deterministas)
+    - wall p50 y memoria pico: más allá de `tolerancia` (0.25 = +25%)
+    """
+    regresiones = []
+    base = baseline.get("resultados", {})
+    for nombre, m in actual.get("resultados", {}).items():
+        b = base.get(nombre)
+        if not b:
+            continue
+        if m["queries"] > b["queries"]:
+            regresiones.append(f"{nombre}: queries {b['queries']} -> {m['queries']}")
+        if m["wall_ms_p50"] > b["wall_ms_p50"] * (1 + tolerancia):
+            regresiones.append(f"{nombre}: wall p50 {b['wall_ms_p50']}ms -> {m['wall_ms_p50']}ms")
+        if b["peak_kb"] and m["peak_kb"] > b["peak_kb"] * (1 + tolerancia):
+            regresiones.append(f"{nombre}: memoria pico {b['peak_kb']}KB -> {m['peak_kb']}KB")
+    return regresiones
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Literales que se cuelan en SQL crudo: '...' y números sueltos -> ?
+_LITERAL_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_LITERAL_NUMERO = re.compile(r"(?<![\w.\"])\d+(?:\.\d+)?(?![\w.])")
+# IN (%s, %s, %s) -> IN (%s...): misma "forma" sin importar cuántos parámetros
+LISTA_PARAMS = re.compile(r"%s(?:\s*,\s*%s)+")
+# EXPLAIN ANALYZE ejecuta la sentencia: solo SELECT de lectura
+_SOLO_LECTURA = re.compile(r"^\s*SELECT\b(?!.*\bFOR\s+(?:NO\s+KEY\s+)?UPDATE\b)(?!.*\bFOR\s+SHARE\b)", re.I | re.S)
+
+
+def forma(sql: str) -> str:
+    """Forma de la sentencia: listas de parámetros colapsadas (base de huella y del detector de N+1)."""
+    return LISTA_PARAMS.sub("%s...", sql)
+
+
+def redactar(sql: str) -> str:
+    return _LITERAL_NUMERO.sub("?", _LITERAL_TEXTO.sub("'?'", sql))
+
+
+def huella(sql: str) -> str:
+    return hashlib.md5(forma(sql).encode()).hexdigest()
+
+
+@dataclass
+class Lenta:
+    sql: str
+    params: tuple | list | dict | None  # solo para EXPLAIN; nunca se guarda
+    duracion_ms: float
+    vista: str = ""
+    metodo: str = ""
+    usuario_id: int | None = None
+
+
+class Registro:
+    """
+    execute_wrapper: junta las sentencias arriba del umbral durante el request.
+    El middleware las manda a la cola al final (ya con vista y usuario).
+    """
+
+    def __init__(self, umbral_ms: float):
+        self.umbral_ms = umbral_ms
+        self.lentas: list[Lenta] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            if ms >= self.umbral_ms:
+                self.lentas.append(Lenta(sql=sql, params=None if many else params, duracion_ms=ms))
+
+
+# ----------------------------
+# Worker en segundo plano: EXPLAIN + guardado fuera del request
+# ----------------------------
+_cola: queue.Queue[Lenta] = queue.Queue(maxsize=1_000)
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+
+def encolar(lentas: list[Lenta]) -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_procesar, name="consultas-lentas", daemon=True)
+            _worker.start()
+    for lenta in lentas:
+        logger.warning(
+            "SQL lento (%.0fms) en %s: %s", lenta.duracion_ms, lenta.vista or "-", redactar(lenta.sql)[:500]
+        )
+        try:
+            _cola.put_nowait(lenta)
+        except queue.Full:
+            # Nunca frenar requests por el log: si el worker no da abasto, se pierde la muestra
+            pass
+
+
+def _explain(lenta: Lenta) -> str:
+    """EXPLAIN (ANALYZE, BUFFERS) en transacción de solo lectura y con statement_timeout."""
+    timeout_ms = int(getattr(settings, "CONSULTAS_LENTAS_EXPLAIN_TIMEOUT_MS", 10_000))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET TRANSACTION READ ONLY")
+        cursor.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {lenta.sql}", lenta.params)
+        return "\n".join(fila[0] for fila in cursor.fetchall())
+
+
+def _procesar() -> None:
+    from core.models import ConsultaLenta  # import local (OK): el worker arranca ya con apps listas
+
+    muestreo = getattr(settings, "CONSULTAS_LENTAS_MUESTREO_PLAN", 0.1)
+    while True:
+        lenta = _cola.get()
+        try:
+            plan = ""
+            if _SOLO_LECTURA.match(lenta.sql) and random.random() < muestreo:
+                try:
+                    plan = _explain(lenta)
+                except Exception as e:
+                    # Sin el mensaje: puede traer valores de los parámetros
+                    plan = f"(EXPLAIN falló: {type(e).__name__})"
+                    connection.close()
+            ConsultaLenta.objects.create(
+                vista=lenta.vista[:200],
+                metodo=lenta.metodo,
+                usuario_id=lenta.usuario_id,
+                duracion_ms=round(lenta.duracion_ms, 2),
+                sql=redactar(lenta.sql),
+                huella=huella(lenta.sql),
+                plan=plan,
+            )
+        except Exception:
+            logger.exception("No se pudo registrar la consulta lenta")
+            connection.close()
+        finally:
+            _cola.task_done()
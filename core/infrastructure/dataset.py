@@ -0,0 +1,441 @@
+from __future__ import annotations
+
+import io
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from inventario.infrastructure.codigo import reservar_codigos
+from inventario.models import (
+    Articulo,
+    ArticuloEstado,
+    ArticuloFoto,
+    Categoria,
+    InventarioItem,
+    MotivoBaja,
+    Producto,
+    Ubicacion,
+)
+from ventas.infrastructure.folio import format_folio, next_folio_nums
+from ventas.models import Cliente, MetodoPago, Pago, Venta, VentaDetalle, VentaEstado
+
+# Sesgo "realista" por estado (pesos relativos, no porcentajes exactos)
+PESOS_ITEM = {
+    InventarioItem.Estado.EN_USO: 55,
+    InventarioItem.Estado.ALMACEN: 25,
+    InventarioItem.Estado.BAJA: 15,
+    InventarioItem.Estado.DESECHO: 5,
+}
+PESOS_VENTA = {
+    VentaEstado.ENTREGADA: 60,
+    VentaEstado.PAGADA: 15,
+    VentaEstado.BORRADOR: 15,
+    VentaEstado.CANCELADA: 10,
+}
+# Artículos que NO están en una venta
+PESOS_ARTICULO_LIBRE = {
+    ArticuloEstado.DISPONIBLE: 75,
+    ArticuloEstado.REPARACION: 12,
+    ArticuloEstado.BAJA: 9,
+    ArticuloEstado.DESECHO: 4,
+}
+PESOS_METODO = {
+    MetodoPago.EFECTIVO: 50,
+    MetodoPago.TARJETA: 30,
+    MetodoPago.TRANSFERENCIA: 20,
+}
+# Detalles por venta: la mayoría compra 1 pieza
+PESOS_DETALLES = {1: 70, 2: 18, 3: 7, 4: 3, 5: 2}
+
+MARCAS = ("Dell", "HP", "Lenovo", "Apple", "Acer", "Asus", "Samsung", "Cisco", "Epson", "APC")
+GRADOS = ("A", "A", "A", "B", "B", "C")
+CONDICIONES = ("Usado", "Usado", "Refurb", "Nuevo", "Partes")
+
+
+@dataclass
+class Volumenes:
+    items: int = 100_000
+    productos: int = 2_000
+    articulos: int = 200_000
+    clientes: int = 10_000
+    ventas: int = 50_000
+    ubicaciones: int = 50
+    con_foto: float = 0.3  # fracción de items/artículos con foto
+    fotos_distintas: int = 64  # archivos placeholder en MEDIA_ROOT (se reutilizan)
+    dias: int = 730  # historia: fechas repartidas en los últimos N días
+
+
+class _Elector:
+    """random.choices precalculado (cum_weights) para no rehacerlo por fila."""
+
+    def __init__(self, rnd: random.Random, pesos: dict):
+        self.rnd = rnd
+        self.valores = list(pesos)
+        self.acumulados = []
+        total = 0
+        for p in pesos.values():
+            total += p
+            self.acumulados.append(total)
+
+    def __call__(self):
+        return self.rnd.choices(self.valores, cum_weights=self.acumulados)[0]
+
+
+def _reservar_ids(cursor, model, n: int) -> list[int]:
+    """Mismo patrón que los allocators de codigo/folio: n ids en un round trip."""
+    if n <= 0:
+        return []
+    cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+        [model._meta.db_table, n],
+    )
+    return sorted(int(v) for (v,) in cursor.fetchall())
+
+
+def _copy(cursor, model, campos: tuple[str, ...], filas) -> int:
+    columnas = ", ".join(model._meta.get_field(c).column for c in campos)
+    n = 0
+    with cursor.copy(f"COPY {model._meta.db_table} ({columnas}) FROM STDIN") as copy:
+        for fila in filas:
+            copy.write_row(fila)
+            n += 1
+    return n
+
+
+def _png_placeholder(rnd: random.Random) -> bytes:
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), tuple(rnd.randrange(256) for _ in range(3))).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class GeneradorDataset:
+    """
+    Datos sintéticos de volumen "producción" para benchmarks y planes de consulta.
+    Determinista: misma semilla + mismos volúmenes = mismos datos (los ids/códigos
+    salen de las secuencias). Todo entra por COPY, en transacciones por lote.
+    `prefijo` separa corridas: SKU, series y nombres lo llevan.
+    """
+
+    def __init__(
+        self,
+        volumenes: Volumenes,
+        vendedor,
+        semilla: int = 1,
+        prefijo: str = "GEN",
+        lote: int = 50_000,
+        progreso: Callable[[str, int], None] | None = None,
+    ):
+        self.vol = volumenes
+        self.vendedor_id = vendedor.pk
+        self.rnd = random.Random(semilla)
+        self.prefijo = prefijo
+        self.lote = lote
+        self.avisar = progreso or (lambda etapa, n: None)
+        self.ahora = timezone.now()
+
+    # ----------------------------
+    # Helpers
+    # ----------------------------
+    def _fecha(self) -> datetime:
+        # Sesgo hacia lo reciente: más movimiento en los últimos meses
+        dias = self.vol.dias * (1 - self.rnd.random() ** 0.5)
+        return self.ahora - timedelta(days=dias, seconds=self.rnd.randrange(86_400))
+
+    def _bloques(self, total: int):
+        hecho = 0
+        while hecho < total:
+            n = min(self.lote, total - hecho)
+            yield hecho, n
+            hecho += n
+
+    def _fotos(self, carpeta: str) -> list[str]:
+        # Colores con su propio Random (por archivo): si el placeholder ya existe no se
+        # genera, y self.rnd no debe depender de lo que haya en MEDIA_ROOT.
+        nombres = []
+        for k in range(self.vol.fotos_distintas):
+            ruta = f"{carpeta}/{self.prefijo.lower()}/placeholder_{k:03d}.png"
+            if not default_storage.exists(ruta):
+                ruta = default_storage.save(ruta, ContentFile(_png_placeholder(random.Random(ruta))))
+            nombres.append(ruta)
+        return nombres
+
+    # ----------------------------
+    # Catálogos
+    # ----------------------------
+    def catalogos(self) -> None:
+        if Producto.objects.filter(sku__startswith=f"{self.prefijo}-").exists():
+            raise ValueError(f"Ya hay datos con prefijo {self.prefijo!r}: usa otro --prefijo.")
+
+        self.categorias = list(Categoria.objects.values_list("id", flat=True))
+        self.motivos = list(MotivoBaja.objects.values_list("id", flat=True))
+        if not self.categorias or not self.motivos:
+            raise ValueError("Faltan catálogos base: corre seed_inventario primero.")
+
+        nombres = [f"{self.prefijo} Sucursal {n:03d}" for n in range(1, self.vol.ubicaciones + 1)]
+        existentes = set(Ubicacion.objects.filter(nombre__in=nombres).values_list("nombre", flat=True))
+        Ubicacion.objects.bulk_create([Ubicacion(nombre=n) for n in nombres if n not in existentes])
+        self.ubicaciones = list(Ubicacion.objects.values_list("id", flat=True).order_by("id"))
+
+    # ----------------------------
+    # Inventario interno
+    # ----------------------------
+    def items(self) -> int:
+        estado = _Elector(self.rnd, PESOS_ITEM)
+        fotos = self._fotos("inventario/items") if self.vol.con_foto else []
+        campos = (
+            "codigo", "foto", "categoria", "ubicacion", "estado", "marca", "modelo", "serie",
+            "etiqueta_interna", "responsable", "observaciones", "precio_sugerido_venta",
+            "fecha_alta", "fecha_baja", "motivo_baja", "activo",
+        )
+        total = 0
+        for inicio, n in self._bloques(self.vol.items):
+            filas = []
+            for i, codigo in enumerate(reservar_codigos(n), start=inicio):
+                e = estado()
+                alta = self._fecha().date()
+                baja = e in (InventarioItem.Estado.BAJA, InventarioItem.Estado.DESECHO)
+                marca = self.rnd.choice(MARCAS)
+                filas.append(
+                    (
+                        codigo,
+                        self.rnd.choice(fotos) if fotos and self.rnd.random() < self.vol.con_foto else "",
+                        self.rnd.choice(self.categorias),
+                        self.rnd.choice(self.ubicaciones),
+                        e,
+                        marca,
+                        f"{marca[:3].upper()}-{self.rnd.randrange(100, 9999)}",
+                        f"{self.prefijo}-I{i:09d}",
+                        f"ET-{i:07d}" if self.rnd.random() < 0.6 else "",
+                        "",
+                        "",
+                        Decimal(self.rnd.randrange(500, 50_000)) if self.rnd.random() < 0.3 else None,
+                        alta,
+                        min(alta + timedelta(days=self.rnd.randrange(30, 900)), self.ahora.date()) if baja else None,
+                        self.rnd.choice(self.motivos) if baja else None,
+                        not baja,
+                    )
+                )
+            with transaction.atomic(), connection.cursor() as cursor:
+                total += _copy(cursor, InventarioItem, campos, filas)
+            self.avisar("items", total)
+        return total
+
+    # ----------------------------
+    # Venta: productos, clientes, artículos, ventas
+    # ----------------------------
+    def productos(self) -> None:
+        nuevos = []
+        for i in range(1, self.vol.productos + 1):
+            marca = self.rnd.choice(MARCAS)
+            precio = Decimal(self.rnd.randrange(800, 40_000))
+            nuevos.append(
+                Producto(
+                    sku=f"{self.prefijo}-{i:06d}",
+                    nombre=f"{marca} modelo {i}",
+                    categoria_id=self.rnd.choice(self.categorias),
+                    marca=marca,
+                    costo=(precio * Decimal("0.6")).quantize(Decimal("0.01")),
+                    precio_venta=precio,
+                    precio_minimo=(precio * Decimal("0.85")).quantize(Decimal("0.01")),
+                )
+            )
+        creados = Producto.objects.bulk_create(nuevos, batch_size=self.lote)
+        # Popularidad tipo Zipf: pocos SKUs concentran la mayoría de las unidades
+        self._producto = _Elector(self.rnd, {(p.pk, p.precio_venta): 1 / k for k, p in enumerate(creados, start=1)})
+        self.avisar("productos", len(creados))
+
+    def clientes(self) -> None:
+        with transaction.atomic(), connection.cursor() as cursor:
+            ids = _reservar_ids(cursor, Cliente, self.vol.clientes)
+            _copy(
+                cursor,
+                Cliente,
+                ("id", "nombre", "telefono", "email", "rfc", "direccion"),
+                (
+                    (pk, f"{self.prefijo} Cliente {k:07d}", f"55{self.rnd.randrange(10**8):08d}", "", "", "")
+                    for k, pk in enumerate(ids, start=1)
+                ),
+            )
+        self._clientes = ids
+        self.avisar("clientes", len(ids))
+
+    def _fila_articulo(self, pk, producto_id, serie_n, estado, creado, reservado_hasta=None):
+        return (
+            pk,
+            producto_id,
+            f"{self.prefijo}-A{serie_n:09d}",
+            "",
+            self.rnd.choice(CONDICIONES),
+            self.rnd.choice(GRADOS),
+            "",
+            self.rnd.choice(self.ubicaciones),
+            estado,
+            reservado_hasta,
+            0,
+            "",
+            self.vendedor_id,
+            creado,
+        )
+
+    CAMPOS_ARTICULO = (
+        "id", "producto", "serie", "etiqueta_interna", "condicion", "grado", "accesorios",
+        "ubicacion", "estado", "reservado_hasta", "version", "observaciones", "created_by", "created_at",
+    )
+
+    def ventas(self) -> int:
+        """
+        Ventas con detalles y pagos. Cada detalle trae su Articulo (VENDIDO, RESERVADO o,
+        en canceladas, DISPONIBLE), así los estados cuadran como si hubieran pasado por
+        los servicios. Regresa cuántos artículos se usaron.
+        """
+        estado_venta = _Elector(self.rnd, PESOS_VENTA)
+        metodo = _Elector(self.rnd, PESOS_METODO)
+        detalles_por_venta = _Elector(self.rnd, PESOS_DETALLES)
+        campos_venta = (
+            "id", "folio", "cliente", "estado", "subtotal", "descuento", "impuestos", "total",
+            "vendedor", "creada_en", "pagada_en", "entregada_en", "version",
+        )
+        usados = 0
+        hechas = 0
+
+        for _, n in self._bloques(self.vol.ventas):
+            plan = [(estado_venta(), detalles_por_venta()) for _ in range(n)]
+            n_articulos = sum(k for _, k in plan)
+            if usados + n_articulos > self.vol.articulos:
+                raise ValueError("No alcanzan los artículos para las ventas: sube --articulos o baja --ventas.")
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                venta_ids = _reservar_ids(cursor, Venta, n)
+                articulo_ids = iter(_reservar_ids(cursor, Articulo, n_articulos))
+                folio_nums = next_folio_nums(n)
+
+                ventas, articulos, detalles, pagos = [], [], [], []
+                for venta_id, folio_num, (estado, k) in zip(venta_ids, folio_nums, plan):
+                    creada = self._fecha()
+                    subtotal = descuento = Decimal("0.00")
+                    for _ in range(k):
+                        producto_id, precio = self._producto()
+                        desc = Decimal(self.rnd.choice((0, 0, 0, 100, 250)))
+                        subtotal += precio
+                        descuento += desc
+
+                        if estado in (VentaEstado.PAGADA, VentaEstado.ENTREGADA):
+                            a_estado, vence = ArticuloEstado.VENDIDO, None
+                        elif estado == VentaEstado.BORRADOR:
+                            # Algunas reservas ya vencidas: trabajo para liberar_reservas
+                            a_estado = ArticuloEstado.RESERVADO
+                            vence = self.ahora + timedelta(minutes=self.rnd.randrange(-600, 30))
+                        else:
+                            a_estado, vence = ArticuloEstado.DISPONIBLE, None
+
+                        articulo_id = next(articulo_ids)
+                        creado = creada - timedelta(days=3)
+                        articulos.append(self._fila_articulo(articulo_id, producto_id, usados, a_estado, creado, vence))
+                        detalles.append((venta_id, articulo_id, precio, desc))
+                        usados += 1
+
+                    totales = Venta.calcular_totales(subtotal, descuento)
+                    pagada = creada + timedelta(minutes=self.rnd.randrange(5, 600))
+                    pagada_en = None
+                    if estado in (VentaEstado.PAGADA, VentaEstado.ENTREGADA):
+                        pagada_en = pagada
+                        pagos.append((venta_id, metodo(), totales["total"], "", pagada))
+                    entregada_en = None
+                    if estado == VentaEstado.ENTREGADA:
+                        entregada_en = pagada + timedelta(days=self.rnd.randrange(0, 5))
+                    ventas.append(
+                        (
+                            venta_id,
+                            format_folio(folio_num, timezone.localdate(creada)),
+                            self.rnd.choice(self._clientes),
+                            estado,
+                            totales["subtotal"],
+                            totales["descuento"],
+                            totales["impuestos"],
+                            totales["total"],
+                            self.vendedor_id,
+                            creada,
+                            pagada_en,
+                            entregada_en,
+                            0,
+                        )
+                    )
+
+                _copy(cursor, Articulo, self.CAMPOS_ARTICULO, articulos)
+                _copy(cursor, Venta, campos_venta, ventas)
+                _copy(cursor, VentaDetalle, ("venta", "articulo", "precio", "descuento"), detalles)
+                _copy(cursor, Pago, ("venta", "metodo", "monto", "referencia", "fecha"), pagos)
+
+            hechas += n
+            self.avisar("ventas", hechas)
+        return usados
+
+    def articulos_libres(self, desde: int) -> int:
+        """El resto de los artículos: en stock, reparación o baja (sin venta)."""
+        estado = _Elector(self.rnd, PESOS_ARTICULO_LIBRE)
+        total = 0
+        for inicio, n in self._bloques(self.vol.articulos - desde):
+            with transaction.atomic(), connection.cursor() as cursor:
+                ids = _reservar_ids(cursor, Articulo, n)
+                total += _copy(
+                    cursor,
+                    Articulo,
+                    self.CAMPOS_ARTICULO,
+                    (
+                        self._fila_articulo(pk, self._producto()[0], desde + inicio + j, estado(), self._fecha())
+                        for j, pk in enumerate(ids)
+                    ),
+                )
+            self.avisar("articulos", desde + total)
+        return total
+
+    def fotos_articulos(self) -> int:
+        if not self.vol.con_foto:
+            return 0
+        fotos = self._fotos("inventario/articulos")
+        total = 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM {Articulo._meta.db_table} WHERE serie LIKE %s ORDER BY id",
+                [f"{self.prefijo}-A%"],
+            )
+            ids = [pk for (pk,) in cursor.fetchall()]
+        elegidos = [pk for pk in ids if self.rnd.random() < self.vol.con_foto]
+        for inicio, n in self._bloques(len(elegidos)):
+            with transaction.atomic(), connection.cursor() as cursor:
+                total += _copy(
+                    cursor,
+                    ArticuloFoto,
+                    ("articulo", "imagen", "orden"),
+                    ((pk, self.rnd.choice(fotos), 0) for pk in elegidos[inicio : inicio + n]),
+                )
+        self.avisar("fotos", total)
+        return total
+
+    # ----------------------------
+    # Todo
+    # ----------------------------
+    def generar(self) -> dict[str, int]:
+        self.catalogos()
+        resumen = {"items": self.items()}
+        self.productos()
+        self.clientes()
+        usados = self.ventas()
+        resumen["ventas"] = self.vol.ventas
+        resumen["articulos"] = usados + self.articulos_libres(usados)
+        resumen["fotos_articulos"] = self.fotos_articulos()
+
+        # Estadísticas frescas: sin esto los planes se calculan con tablas "vacías"
+        with connection.cursor() as cursor:
+            for model in (InventarioItem, Producto, Articulo, ArticuloFoto, Cliente, Venta, VentaDetalle, Pago):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+        return resumen
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import IntegrityError, connection, models, transaction
+
+from core.infrastructure.metricas import REINTENTOS
+
+logger = logging.getLogger(__name__)
+
+
+class DbReturningCharField(models.CharField):
+    """
+    CharField que llena la BD al insertar (trigger BEFORE INSERT: codigo, folio).
+    Con db_returning, Django lo pide en el INSERT ... RETURNING (save y bulk_create)
+    y lo asigna al objeto: no hace falta refresh_from_db() para conocerlo.
+    """
+
+    db_returning = True
+
+
+# SQLSTATE de PostgreSQL que se resuelven reintentando la transacción completa:
+# 40001 = serialization_failure, 40P01 = deadlock_detected
+SQLSTATE_REINTENTABLES = frozenset({"40001", "40P01"})
+
+
+class ConflictoConcurrencia(Exception):
+    """
+    Escritura compare-and-swap que no encontró la versión leída: otra transacción
+    modificó la fila. Se resuelve releyendo y reintentando.
+    """
+
+
+def es_error_reintentable(exc: BaseException) -> bool:
+    """
+    Conflictos optimistas propios, o errores de la BD por deadlock/serialización.
+    Django envuelve el error de psycopg; el SQLSTATE viene en __cause__.
+    """
+    if isinstance(exc, ConflictoConcurrencia):
+        return True
+    causa = getattr(exc, "__cause__", None)
+    sqlstate = getattr(causa, "sqlstate", None) or getattr(exc, "sqlstate", None)
+    return sqlstate in SQLSTATE_REINTENTABLES
+
+
+def reintentar_en_conflicto(
+    func=None,
+    *,
+    intentos: int = 4,
+    espera_base: float = 0.05,
+    espera_max: float = 1.0,
+    excepciones: tuple[type[BaseException], ...] = (),
+):
+    """
+    Reintenta la función si la BD aborta la transacción por deadlock o serialización,
+    o si una escritura optimista detecta un conflicto de versión.
+    Backoff exponencial con jitter completo.
+
+    Solo reintenta en la transacción más externa: si ya estamos dentro de un
+    atomic(), la transacción quedó abortada y el reintento le toca al llamador.
+    Por eso va ENCIMA de @transaction.atomic:
+
+        @reintentar_en_conflicto
+        @transaction.atomic
+        def mi_servicio(...): ...
+
+    `excepciones` permite marcar errores propios como reintentables.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if connection.in_atomic_block:
+                return fn(*args, **kwargs)
+
+            for intento in range(1, intentos + 1):
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    reintentable = isinstance(e, excepciones) or es_error_reintentable(e)
+                    if not reintentable or intento == intentos:
+                        raise
+
+                    REINTENTOS.labels(fn.__qualname__).inc()
+                    espera = random.uniform(0, min(espera_max, espera_base * 2 ** (intento - 1)))
+                    logger.warning(
+                        "Conflicto de concurrencia en %s (intento %s/%s): %s. Reintentando en %.3fs",
+                        fn.__qualname__,
+                        intento,
+                        intentos,
+                        e,
+                        espera,
+                    )
+                    time.sleep(espera)
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+# ----------------------------
+# Versión optimista en save()
+# ----------------------------
+class VersionadoMixin:
+    """
+    save() de un objeto existente incrementa `version` en la BD (version = version + 1),
+    igual que los servicios: así el compare-and-swap de VENTAS_CONCURRENCIA=optimista
+    también ve las ediciones por admin/forms. Con update_fields, `version` se agrega.
+    Django 6 relee en el UPDATE ... RETURNING los campos asignados con una expresión;
+    en versiones anteriores `version` queda diferido y se carga si alguien lo pide.
+    """
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version"}
+        self.version = models.F("version") + 1
+        try:
+            return super().save(*args, **kwargs)
+        finally:
+            if isinstance(self.__dict__.get("version"), models.expressions.Combinable):
+                del self.__dict__["version"]
+
+
+# ----------------------------
+# Validación respaldada por constraints
+# ----------------------------
+# SQLSTATE: 23505 = unique_violation, 23514 = check_violation
+_SQLSTATE_CONSTRAINTS = frozenset({"23505", "23514"})
+
+
+class ValidacionEnBDMixin:
+    """
+    save() sin queries de validación: en Python solo clean_fields() + clean()
+    (tipos, choices, reglas de negocio). UNIQUE y CHECK los garantiza la BD; su
+    IntegrityError se traduce al mismo ValidationError que daría full_clean()
+    (con savepoint dentro de un atomic(); sin nada que traducir, save() va directo).
+    Las FK cuyo objeto ya viene leído de la BD (p. ej. de un ModelChoiceField) no
+    se vuelven a consultar. Con VALIDACION_EN_BD=False, save() usa full_clean() completo.
+
+        class MiModelo(ValidacionEnBDMixin, models.Model): ...
+    """
+
+    def validar(self) -> None:
+        if not getattr(settings, "VALIDACION_EN_BD", True):
+            self.full_clean()
+            return
+        self.full_clean(exclude=self._fks_cargadas(), validate_unique=False, validate_constraints=False)
+
+    def _fks_cargadas(self) -> list[str]:
+        excluir = []
+        for field in self._meta.concrete_fields:
+            if not field.is_relation or not field.is_cached(self):
+                continue
+            obj = field.get_cached_value(self)
+            if obj is not None and not obj._state.adding and obj.pk == getattr(self, field.attname):
+                excluir.append(field.name)
+        return excluir
+
+    @classmethod
+    @functools.cache
+    def unicos(cls) -> tuple[tuple[str, ...], ...]:
+        """
+        UNIQUE simples que el usuario puede violar: unique=True y unique_together.
+        Los campos que llena la BD (db_returning: codigo, folio) no cuentan.
+        """
+        meta = cls._meta
+        unicos = [(f.name,) for f in meta.concrete_fields if f.unique and not f.primary_key and not f.db_returning]
+        return tuple(unicos + [tuple(campos) for campos in meta.unique_together])
+
+    @classmethod
+    def hay_que_traducir(cls) -> bool:
+        """Sin constraints de Meta ni UNIQUE simples, save() no necesita savepoint."""
+        return bool(cls._meta.constraints or cls.unicos())
+
+    @classmethod
+    @functools.cache
+    def unicos_en_bd(cls) -> dict[str, tuple[str, ...]]:
+        """
+        {nombre en la BD: campos} de unicos(). Django no guarda esos nombres (depende de
+        cómo se creó: <tabla>_<col>_key al crear la tabla, ..._uniq si se agregó después),
+        así que salen de la introspección de la tabla: un query por modelo y proceso, la
+        primera vez que hay que traducir un error.
+        """
+        meta = cls._meta
+        por_columnas = {frozenset(meta.get_field(c).column for c in campos): campos for campos in cls.unicos()}
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, meta.db_table)
+        return {
+            nombre: por_columnas[frozenset(info["columns"])]
+            for nombre, info in constraints.items()
+            if info["unique"] and not info["primary_key"] and frozenset(info["columns"]) in por_columnas
+        }
+
+    def save(self, *args, **kwargs):
+        self.validar()
+        if not self.hay_que_traducir():
+            # Nada que traducir: sin savepoint (un statement por save)
+            return super().save(*args, **kwargs)
+        try:
+            if connection.in_atomic_block:
+                # Savepoint: el IntegrityError no deja abortada la transacción del llamador
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            return super().save(*args, **kwargs)
+        except IntegrityError as e:
+            error = self._error_de_constraint(e)
+            if error is None:
+                raise
+            raise error from e
+
+    def _error_de_constraint(self, e: IntegrityError) -> ValidationError | None:
+        """El ValidationError que habría dado validate_unique()/validate_constraints(), o None."""
+        causa = e.__cause__
+        diag = getattr(causa, "diag", None)
+        if getattr(causa, "sqlstate", None) not in _SQLSTATE_CONSTRAINTS or diag is None:
+            return None
+        nombre = diag.constraint_name
+        constraint = next((c for c in self._meta.constraints if c.name == nombre), None)
+        if constraint is None:
+            constraint = self.unicos_en_bd().get(nombre)
+        if constraint is None:
+            return None
+
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields and not constraint.condition:
+            constraint = tuple(constraint.fields)
+        if isinstance(constraint, tuple):
+            error = ValidationError(self.unique_error_message(type(self), constraint))
+            return ValidationError({constraint[0] if len(constraint) == 1 else NON_FIELD_ERRORS: [error]})
+        error = ValidationError(constraint.get_violation_error_message(), code=constraint.violation_error_code)
+        return ValidationError({NON_FIELD_ERRORS: [error]})
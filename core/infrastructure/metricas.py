@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import functools
+import os
+import time
+
+from django.db import transaction
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+
+# Con varios workers (gunicorn/uwsgi) cada proceso escribe sus métricas en
+# PROMETHEUS_MULTIPROC_DIR y /metrics las agrega. La variable debe existir (y el
+# directorio vaciarse) ANTES de arrancar los workers.
+
+_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_LATENCIA = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de requests por nombre de URL.",
+    ["vista", "metodo", "status"],
+    buckets=_LATENCIA,
+)
+DB_QUERIES = Counter(
+    "db_queries",
+    "Queries a la BD por nombre de URL.",
+    ["vista"],
+)
+DB_SEGUNDOS = Counter(
+    "db_query_duration_seconds",
+    "Tiempo en BD por nombre de URL.",
+    ["vista"],
+)
+EXPORT_LATENCIA = Histogram(
+    "export_duration_seconds",
+    "Duración de exports (XLSX/PDF).",
+    ["formato"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+EXPORT_BYTES = Histogram(
+    "export_size_bytes",
+    "Tamaño de exports (XLSX/PDF).",
+    ["formato"],
+    buckets=(10_000, 100_000, 1_000_000, 10_000_000, 50_000_000, 200_000_000),
+)
+VENTAS_TRANSICIONES = Counter(
+    "ventas_transiciones",
+    "Cambios de estado confirmados (venta o artículos).",
+    ["transicion"],
+)
+REINTENTOS = Counter(
+    "db_reintentos_conflicto",
+    "Reintentos por deadlock/serialización/conflicto de versión.",
+    ["funcion"],
+)
+
+
+def exportar() -> bytes:
+    """Texto Prometheus: agregado de todos los procesos si hay PROMETHEUS_MULTIPROC_DIR."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def contar_transicion(transicion: str, n: int = 1) -> None:
+    """Solo cuenta si la transacción confirma (los reintentos/rollbacks no suman)."""
+    if n:
+        transaction.on_commit(lambda: VENTAS_TRANSICIONES.labels(transicion).inc(n))
+
+
+def medir_export(formato: str):
+    """Decorador para vistas de export: duración y tamaño de la respuesta."""
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            response = view(*args, **kwargs)
+            if response.status_code == 200 and not getattr(response, "streaming", False):
+                EXPORT_LATENCIA.labels(formato).observe(time.perf_counter() - t0)
+                EXPORT_BYTES.labels(formato).observe(len(response.content))
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import marshal
+import pstats
+import time
+
+from django.conf import settings
+
+from core.infrastructure.consultas_lentas import redactar
+
+HEADER = "HTTP_X_PERFILAR"
+PARAM = "_perfilar"
+
+
+def solicitado(request) -> bool:
+    return request.META.get(HEADER) == "1" or request.GET.get(PARAM) == "1"
+
+
+class LineaDeTiempo:
+    """execute_wrapper: cada query con su inicio relativo al request, duración y SQL (sin parámetros)."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.queries: list[dict] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "inicio_ms": round((t0 - self.inicio) * 1000, 2),
+                    "ms": round((time.perf_counter() - t0) * 1000, 2),
+                    "sql": redactar(sql),
+                }
+            )
+
+    @property
+    def db_ms(self) -> float:
+        return round(sum(q["ms"] for q in self.queries), 2)
+
+
+def texto(profiler: cProfile.Profile, lineas: int | None = None) -> str:
+    """Top por tiempo acumulado y por tiempo propio."""
+    lineas = lineas or getattr(settings, "PERFILADO_LINEAS", 60)
+    salida = io.StringIO()
+    stats = pstats.Stats(profiler, stream=salida).strip_dirs()
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(lineas)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(lineas // 2)
+    return salida.getvalue()
+
+
+def crudo(profiler: cProfile.Profile) -> bytes:
+    # Mismo contenido que Profile.dump_stats(): se abre con pstats.Stats(archivo) o snakeviz
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
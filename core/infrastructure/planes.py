@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.infrastructure.consultas_lentas import forma, redactar
+
+
+@dataclass
+class Captura:
+    """SQL ejecutado por `fn` (ya con parámetros: así lo deja CaptureQueriesContext)."""
+
+    sqls: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.sqls)
+
+    def repetidas(self, minimo: int) -> list[tuple[str, int]]:
+        """Formas de SQL repetidas >= minimo veces: señal de N+1."""
+        formas = Counter(forma(redactar(s)) for s in self.sqls)
+        return [(sql, n) for sql, n in formas.most_common() if n >= minimo]
+
+
+def capturar(fn: Callable[[], Any]) -> Captura:
+    with CaptureQueriesContext(connection) as ctx:
+        fn()
+    return Captura([q["sql"] for q in ctx.captured_queries])
+
+
+def explicar(sql: str) -> dict:
+    """Plan estimado (EXPLAIN sin ANALYZE: no ejecuta ni toma locks)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _nodos(plan: dict, ancestros: tuple[str, ...] = ()):
+    yield plan, ancestros
+    for hijo in plan.get("Plans", ()):
+        yield from _nodos(hijo, (*ancestros, plan["Node Type"]))
+
+
+def seq_scans(plan: dict, tablas: Iterable[str]) -> list[str]:
+    """
+    Seq Scan sobre `tablas` que delata un índice faltante:
+    - con Filter (recorre la tabla para quedarse con una parte), o
+    - debajo de un Limit (una página no debería leer la tabla entera).
+    Un COUNT(*) sin filtro recorre todo por definición: ese no cuenta.
+    """
+    tablas = set(tablas)
+    hallazgos = []
+    for nodo, ancestros in _nodos(plan):
+        if nodo["Node Type"] != "Seq Scan" or nodo.get("Relation Name") not in tablas:
+            continue
+        if "Filter" in nodo or "Limit" in ancestros:
+            hallazgos.append(f"Seq Scan on {nodo['Relation Name']} (filtro: {nodo.get('Filter', '-')})")
+    return hallazgos
+
+
+def revisar(captura: Captura, tablas: Iterable[str]) -> list[str]:
+    """Seq scans "malos" de todos los SELECT capturados, con su SQL."""
+    tablas = list(tablas)
+    problemas = []
+    for sql in captura.sqls:
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        for hallazgo in seq_scans(explicar(sql), tablas):
+            problemas.append(f"{hallazgo}\n    {sql[:400]}")
+    return problemas
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from inventario.infrastructure.codigo import SEQ_NAME as SEQ_CODIGO
+from ventas.infrastructure.folio import SEQ_NAME as SEQ_FOLIO
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Prueba:
+    ok: bool
+    ms: float
+    detalle: str = ""  # público (/health/ready/ sin auth): nunca el texto de la excepción
+
+
+@dataclass
+class Estado:
+    ok: bool
+    pruebas: dict[str, Prueba] = field(default_factory=dict)
+    generado: float = 0.0  # time.monotonic()
+
+    def as_dict(self) -> dict:
+        return {
+            "status": "ok" if self.ok else "fail",
+            "edad_s": round(time.monotonic() - self.generado, 2),
+            "checks": {k: asdict(v) for k, v in self.pruebas.items()},
+        }
+
+
+def _medir(nombre: str, fn) -> Prueba:
+    t0 = time.perf_counter()
+    try:
+        detalle = fn() or ""
+        ok = True
+    except Exception as e:
+        # El mensaje puede traer host/puerto/usuario de la BD o rutas: solo al log
+        logger.warning("Readiness: falló la prueba %s", nombre, exc_info=True)
+        detalle, ok = type(e).__name__, False
+    return Prueba(ok=ok, ms=round((time.perf_counter() - t0) * 1000, 2), detalle=detalle)
+
+
+def _db():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+def _secuencias():
+    # last_value: no consume valores (nextval sí)
+    with connection.cursor() as cursor:
+        for seq in (SEQ_CODIGO, SEQ_FOLIO):
+            cursor.execute(f"SELECT last_value FROM {seq}")
+            cursor.fetchone()
+
+
+def _media():
+    with tempfile.NamedTemporaryFile(dir=settings.MEDIA_ROOT, prefix=".ready-"):
+        pass
+
+
+def _cache():
+    cache.set("health:ready", "1", timeout=10)
+    if cache.get("health:ready") != "1":
+        raise RuntimeError("set/get no coincide")
+
+
+PRUEBAS = {
+    "db": _db,
+    "secuencias": _secuencias,
+    "media_root": _media,
+    "cache": _cache,
+}
+
+_ultimo: Estado | None = None
+_lock = threading.Lock()
+
+
+def readiness() -> Estado:
+    """
+    Corre las pruebas a lo más una vez cada HEALTH_CACHE_SEGUNDOS por proceso
+    (caché en memoria: no depende del cache que se está probando). Requests
+    concurrentes esperan el resultado en curso en lugar de repetir las pruebas.
+    """
+    global _ultimo
+    ttl = getattr(settings, "HEALTH_CACHE_SEGUNDOS", 5)
+    with _lock:
+        if _ultimo is not None and time.monotonic() - _ultimo.generado < ttl:
+            return _ultimo
+
+        pruebas = {nombre: _medir(nombre, fn) for nombre, fn in PRUEBAS.items()}
+        db_max = getattr(settings, "HEALTH_DB_MAX_MS", 250)
+        if pruebas["db"].ok and pruebas["db"].ms > db_max:
+            pruebas["db"].ok = False
+            pruebas["db"].detalle = f"round trip > {db_max}ms"
+        try:
+            # Si la conexión quedó rota (pool agotado, BD reiniciada), que el siguiente intento abra otra
+            connection.close_if_unusable_or_obsolete()
+        except Exception:
+            pass
+
+        _ultimo = Estado(ok=all(p.ok for p in pruebas.values()), pruebas=pruebas, generado=time.monotonic())
+        return _ultimo
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.infrastructure.benchmark import comparar, correr_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks de rutas calientes (item_list, /api/items/, exports, venta_detail, "
+        "reservar/pagar/cancelar): wall time, queries y memoria pico a JSON. "
+        "Con --baseline falla si hay regresiones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--salida", default="benchmark.json", help="JSON de resultados.")
+        parser.add_argument("--baseline", default="", help="JSON de una corrida anterior para comparar.")
+        parser.add_argument("--tolerancia", type=float, default=0.25, help="Margen de wall/memoria (0.25 = +25%%).")
+        parser.add_argument("--repeticiones", type=int, default=5)
+        parser.add_argument("--detalles", type=int, default=3, help="Artículos por venta en reservar/pagar/cancelar.")
+        parser.add_argument("--busqueda", default="dell", help="Término para item_list con búsqueda.")
+        parser.add_argument("--solo", nargs="*", default=None, help="Nombres de escenarios a correr.")
+        parser.add_argument("--usuario", default="", help="username (default: primer superuser).")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if options["usuario"]:
+            usuario = User.objects.filter(username=options["usuario"]).first()
+        else:
+            usuario = User.objects.filter(is_superuser=True).order_by("id").first()
+        if usuario is None:
+            raise CommandError("Se necesita un usuario staff (--usuario o un superuser).")
+
+        baseline = None
+        if options["baseline"]:
+            ruta = Path(options["baseline"])
+            if not ruta.exists():
+                raise CommandError(f"No existe: {ruta}")
+            baseline = json.loads(ruta.read_text(encoding="utf-8"))
+
+        try:
+            reporte = correr_benchmarks(
+                usuario,
+                repeticiones=options["repeticiones"],
+                solo=options["solo"],
+                detalles=options["detalles"],
+                busqueda=options["busqueda"],
+            )
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        datos = reporte.as_dict()
+        Path(options["salida"]).write_text(json.dumps(datos, indent=2, ensure_ascii=False), encoding="utf-8")
+
+        self.stdout.write(f"{'escenario':<24} {'p50 ms':>10} {'queries':>8} {'db ms':>10} {'pico KB':>10}")
+        for m in reporte.resultados.values():
+            self.stdout.write(f"{m.nombre:<24} {m.wall_ms_p50:>10} {m.queries:>8} {m.db_ms:>10} {m.peak_kb:>10}")
+        self.stdout.write(self.style.SUCCESS(f"Resultados -> {options['salida']}"))
+
+        if baseline is not None:
+            regresiones = comparar(datos, baseline, options["tolerancia"])
+            if regresiones:
+                for r in regresiones:
+                    self.stderr.write(self.style.ERROR(f"REGRESIÓN {r}"))
+                raise CommandError(f"{len(regresiones)} regresiones contra {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS("Sin regresiones contra baseline ✅"))
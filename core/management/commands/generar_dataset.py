@@ -0,0 +1,75 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from core.infrastructure.dataset import GeneradorDataset, Volumenes
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos de volumen producción (items, artículos, ventas con detalles y pagos, "
+        "fotos placeholder) vía COPY, para benchmarks y planes de consulta. Determinista por --semilla."
+    )
+
+    def add_arguments(self, parser):
+        defaults = Volumenes()
+        parser.add_argument("--items", type=int, default=defaults.items)
+        parser.add_argument("--productos", type=int, default=defaults.productos)
+        parser.add_argument("--articulos", type=int, default=defaults.articulos)
+        parser.add_argument("--clientes", type=int, default=defaults.clientes)
+        parser.add_argument("--ventas", type=int, default=defaults.ventas)
+        parser.add_argument("--ubicaciones", type=int, default=defaults.ubicaciones)
+        parser.add_argument("--con-foto", type=float, default=defaults.con_foto, help="Fracción con foto (0-1).")
+        parser.add_argument("--fotos-distintas", type=int, default=defaults.fotos_distintas)
+        parser.add_argument("--dias", type=int, default=defaults.dias, help="Días de historia.")
+        parser.add_argument("--semilla", type=int, default=1)
+        parser.add_argument("--prefijo", default="GEN", help="Marca SKUs/series/nombres de esta corrida.")
+        parser.add_argument("--lote", type=int, default=50_000, help="Filas por COPY/transacción.")
+        parser.add_argument("--usuario", default="", help="username vendedor/created_by (default: primer superuser).")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if options["usuario"]:
+            vendedor = User.objects.filter(username=options["usuario"]).first()
+        else:
+            vendedor = User.objects.filter(is_superuser=True).order_by("id").first()
+        if vendedor is None:
+            raise CommandError("Se necesita un usuario (--usuario o un superuser) como vendedor/created_by.")
+
+        call_command("seed_inventario", stdout=self.stdout)
+
+        volumenes = Volumenes(
+            items=options["items"],
+            productos=options["productos"],
+            articulos=options["articulos"],
+            clientes=options["clientes"],
+            ventas=options["ventas"],
+            ubicaciones=options["ubicaciones"],
+            con_foto=options["con_foto"],
+            fotos_distintas=options["fotos_distintas"],
+            dias=options["dias"],
+        )
+
+        inicio = time.monotonic()
+
+        def progreso(etapa: str, n: int):
+            self.stdout.write(f"  {etapa}: {n} ({time.monotonic() - inicio:.1f}s)")
+
+        generador = GeneradorDataset(
+            volumenes,
+            vendedor,
+            semilla=options["semilla"],
+            prefijo=options["prefijo"],
+            lote=options["lote"],
+            progreso=progreso,
+        )
+        try:
+            resumen = generador.generar()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Dataset listo en {time.monotonic() - inicio:.1f}s ✅"))
+        for etapa, n in resumen.items():
+            self.stdout.write(f"{etapa}: {n}")
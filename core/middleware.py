@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.middleware.gzip import GZipMiddleware
+
+from core.infrastructure import consultas_lentas, metricas, perfilado
+
+logger = logging.getLogger(__name__)
+
+
+class PresupuestoExcedido(Exception):
+    """La vista hizo más queries que su presupuesto (solo con PRESUPUESTO_QUERIES_ESTRICTO)."""
+
+
+def presupuesto_queries(maximo: int):
+    """
+    Declara cuántas queries puede hacer una vista por request.
+    Sirve para funciones y para clases (APIView/ViewSet/CBV):
+
+        @presupuesto_queries(8)
+        def item_list(request): ...
+
+    En un ViewSet también por acción (@action o list/retrieve/...), encima de la clase.
+    """
+
+    def decorator(view):
+        view.presupuesto_queries = maximo
+        return view
+
+    return decorator
+
+
+def presupuesto_de(view_func, metodo: str | None = None) -> int | None:
+    # DRF as_view() deja la clase en .cls (y en ViewSets, .actions: método HTTP -> acción);
+    # las CBV de Django en .view_class. Manda el más específico: acción, vista, clase.
+    cls = getattr(view_func, "cls", None)
+    accion = (getattr(view_func, "actions", None) or {}).get((metodo or "").lower())
+    metodo_accion = getattr(cls, accion, None) if accion else None
+    for obj in (metodo_accion, view_func, cls, getattr(view_func, "view_class", None)):
+        maximo = getattr(obj, "presupuesto_queries", None)
+        if maximo is not None:
+            return maximo
+    return getattr(settings, "PRESUPUESTO_QUERIES_DEFAULT", None)
+
+
+class _Registro:
+    """execute_wrapper: cuenta queries, tiempo de BD y formas de SQL repetidas."""
+
+    def __init__(self, formas: bool = True):
+        self.total = 0
+        self.db_ms = 0.0
+        self.formas: Counter[str] | None = Counter() if formas else None
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - t0) * 1000
+            self.total += 1
+            if self.formas is not None:
+                self.formas[consultas_lentas.forma(sql)] += 1
+
+
+class PresupuestoQueriesMiddleware:
+    """
+    Queries y tiempo de BD por request (connection.execute_wrapper).
+    - Marca N+1: la misma forma de SQL repetida >= PRESUPUESTO_QUERIES_REPETIDAS veces.
+    - Compara contra el presupuesto de la vista (@presupuesto_queries) o el default;
+      lo registra en log o, con PRESUPUESTO_QUERIES_ESTRICTO, lanza PresupuestoExcedido.
+    Activo con PRESUPUESTO_QUERIES_ACTIVO (default: DEBUG) sobre una fracción
+    PRESUPUESTO_QUERIES_MUESTREO de requests (para producción, p. ej. 0.01).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activo = getattr(settings, "PRESUPUESTO_QUERIES_ACTIVO", settings.DEBUG)
+        self.muestreo = getattr(settings, "PRESUPUESTO_QUERIES_MUESTREO", 1.0)
+        self.repetidas = getattr(settings, "PRESUPUESTO_QUERIES_REPETIDAS", 5)
+        self.estricto = getattr(settings, "PRESUPUESTO_QUERIES_ESTRICTO", False)
+
+    def __call__(self, request):
+        if not self.activo or random.random() >= self.muestreo:
+            return self.get_response(request)
+
+        registro = _Registro()
+        request._presupuesto_queries = None
+        with connection.execute_wrapper(registro):
+            response = self.get_response(request)
+
+        self._revisar(request, registro)
+        if settings.DEBUG:
+            response["Server-Timing"] = f'db;dur={registro.db_ms:.1f};desc="{registro.total} queries"'
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, "_presupuesto_queries"):
+            request._presupuesto_queries = presupuesto_de(view_func, request.method)
+        return None
+
+    def _revisar(self, request, registro: _Registro) -> None:
+        ruta = f"{request.method} {request.path}"
+
+        for sql, veces in registro.formas.most_common():
+            if veces < self.repetidas:
+                break
+            logger.warning("Posible N+1 en %s: %sx %s", ruta, veces, sql[:300])
+
+        maximo = request._presupuesto_queries
+        if maximo is not None and registro.total > maximo:
+            mensaje = f"{ruta}: {registro.total} queries (presupuesto {maximo}), {registro.db_ms:.1f}ms en BD"
+            if self.estricto:
+                raise PresupuestoExcedido(mensaje)
+            logger.warning("Presupuesto de queries excedido en %s", mensaje)
+        else:
+            logger.debug("%s: %s queries, %.1fms en BD", ruta, registro.total, registro.db_ms)
+
+
+class MetricasMiddleware:
+    """
+    Métricas Prometheus por nombre de URL (no por path: cardinalidad acotada):
+    latencia, queries y tiempo de BD. Se exponen en /metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        registro = _Registro(formas=False)
+        t0 = time.perf_counter()
+        with connection.execute_wrapper(registro):
+            response = self.get_response(request)
+        duracion = time.perf_counter() - t0
+
+        match = getattr(request, "resolver_match", None)
+        vista = (match.view_name if match else "") or "sin_ruta"
+        metricas.HTTP_LATENCIA.labels(vista, request.method, str(response.status_code)).observe(duracion)
+        metricas.DB_QUERIES.labels(vista).inc(registro.total)
+        metricas.DB_SEGUNDOS.labels(vista).inc(registro.db_ms / 1000)
+        return response
+
+
+class ConsultasLentasMiddleware:
+    """
+    Registra las sentencias arriba de CONSULTAS_LENTAS_UMBRAL_MS con vista y usuario
+    (sin parámetros). El EXPLAIN de la muestra y el guardado van en un hilo aparte.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activo = getattr(settings, "CONSULTAS_LENTAS_ACTIVO", True)
+        self.umbral_ms = getattr(settings, "CONSULTAS_LENTAS_UMBRAL_MS", 500)
+
+    def __call__(self, request):
+        if not self.activo:
+            return self.get_response(request)
+
+        registro = consultas_lentas.Registro(self.umbral_ms)
+        with connection.execute_wrapper(registro):
+            response = self.get_response(request)
+
+        if registro.lentas:
+            match = getattr(request, "resolver_match", None)
+            user = getattr(request, "user", None)
+            usuario_id = user.pk if user is not None and user.is_authenticated else None
+            for lenta in registro.lentas:
+                lenta.vista = (match.view_name if match else "") or request.path
+                lenta.metodo = request.method
+                lenta.usuario_id = usuario_id
+            consultas_lentas.encolar(registro.lentas)
+        return response
+
+
+# cProfile es del proceso, no del hilo (en 3.12+ sobre sys.monitoring: un segundo enable()
+# lanza ValueError) y además juntaría el trabajo de otros hilos: un perfil a la vez.
+_perfilando = threading.Lock()
+
+
+class PerfiladoMiddleware:
+    """
+    Perfil cProfile de un request puntual: staff con `X-Perfilar: 1` o `?_perfilar=1`.
+    Guarda pstats + línea de tiempo de SQL en PerfilCapturado (admin "Perfiles
+    capturados") y devuelve el id en `X-Perfil-Id`.
+
+    Va después de AuthenticationMiddleware. Siempre se autentica antes de perfilar:
+    con sesión, request.user; con credenciales en Authorization (la API), los
+    autenticadores de DRF (DEFAULT_AUTHENTICATION_CLASSES) se corren aquí. Sin staff,
+    el request sigue normal y sin perfilador. Un perfil a la vez por proceso: si ya
+    hay otro en curso, el request se atiende sin perfilar.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.activo = getattr(settings, "PERFILADO_ACTIVO", True)
+
+    def __call__(self, request):
+        if not self.activo or not perfilado.solicitado(request):
+            return self.get_response(request)
+        usuario = self._staff(request)
+        if usuario is None:
+            return self.get_response(request)
+
+        if not _perfilando.acquire(blocking=False):
+            logger.info("Perfil de %s omitido: hay otro en curso en este proceso", request.path)
+            return self.get_response(request)
+        try:
+            return self._perfilar(request, usuario)
+        finally:
+            _perfilando.release()
+
+    def _perfilar(self, request, usuario):
+        linea = perfilado.LineaDeTiempo()
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Otro profiler activo fuera de este middleware (p. ej. un cProfile del proceso)
+            logger.info("Perfil de %s omitido: ya hay un profiler activo", request.path)
+            return self.get_response(request)
+        t0 = time.perf_counter()
+        try:
+            with connection.execute_wrapper(linea):
+                response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duracion_ms = (time.perf_counter() - t0) * 1000
+
+        if getattr(response, "streaming", False):
+            # El cuerpo se genera después de salir de aquí: el perfil no lo incluiría
+            logger.info("Perfil de %s sin el cuerpo (respuesta streaming)", request.path)
+
+        perfil = self._guardar(request, response, usuario, profiler, linea, duracion_ms)
+        response["X-Perfil-Id"] = str(perfil.pk)
+        return response
+
+    def _staff(self, request):
+        """El usuario staff que pide el perfil, o None."""
+        user = getattr(request, "user", None)
+        if (user is None or not user.is_authenticated) and "HTTP_AUTHORIZATION" in request.META:
+            user = self._usuario_api(request)
+        return user if user is not None and user.is_authenticated and user.is_staff else None
+
+    @staticmethod
+    def _usuario_api(request):
+        """
+        Usuario de las credenciales en Authorization, con los autenticadores de la API.
+        Solo lo regresa: request.user no se toca (la vista de DRF vuelve a autenticar).
+        """
+        from rest_framework.exceptions import APIException
+        from rest_framework.request import Request
+        from rest_framework.settings import api_settings
+
+        drf_request = Request(request)
+        for autenticador in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            try:
+                resultado = autenticador().authenticate(drf_request)
+            except APIException:
+                return None
+            if resultado is not None:
+                return resultado[0]
+        return None
+
+    def _guardar(self, request, response, usuario, profiler, linea, duracion_ms):
+        from core.models import PerfilCapturado
+
+        match = getattr(request, "resolver_match", None)
+        return PerfilCapturado.objects.create(
+            vista=(match.view_name if match else "") or request.path,
+            metodo=request.method,
+            ruta=request.get_full_path()[:500],
+            status=response.status_code,
+            usuario=usuario,
+            duracion_ms=round(duracion_ms, 2),
+            queries=len(linea.queries),
+            db_ms=linea.db_ms,
+            perfil=perfilado.texto(profiler),
+            crudo=perfilado.crudo(profiler),
+            sql=linea.queries,
+        )
+
+
+class ApiGZipMiddleware(GZipMiddleware):
+    """
+    gzip (según Accept-Encoding) solo para respuestas de texto/JSON bajo API_GZIP_PREFIJO
+    y de al menos API_GZIP_MIN_BYTES. Fuera de la API no se comprime (las páginas HTML
+    llevan el token CSRF: BREACH); XLSX/PDF/imágenes ya vienen comprimidos.
+    """
+
+    TIPOS = ("application/json", "text/")
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.prefijo = getattr(settings, "API_GZIP_PREFIJO", "/api/")
+        self.min_bytes = getattr(settings, "API_GZIP_MIN_BYTES", 1024)
+
+    def process_response(self, request, response):
+        if not request.path.startswith(self.prefijo):
+            return response
+        if not response.get("Content-Type", "").startswith(self.TIPOS):
+            return response
+        if not response.streaming and len(response.content) < self.min_bytes:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-18 23:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsultaLenta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creada_en', models.DateTimeField(auto_now_add=True)),
+                ('vista', models.CharField(blank=True, db_index=True, max_length=200)),
+                ('metodo', models.CharField(blank=True, max_length=10)),
+                ('duracion_ms', models.FloatField()),
+                ('sql', models.TextField()),
+                ('huella', models.CharField(db_index=True, max_length=32)),
+                ('plan', models.TextField(blank=True)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Consulta lenta',
+                'verbose_name_plural': 'Consultas lentas',
+                'ordering': ('-creada_en', '-id'),
+                'indexes': [models.Index(fields=['-duracion_ms'], name='consultalenta_duracion_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-18 23:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerfilCapturado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('vista', models.CharField(blank=True, db_index=True, max_length=200)),
+                ('metodo', models.CharField(blank=True, max_length=10)),
+                ('ruta', models.CharField(blank=True, max_length=500)),
+                ('status', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('duracion_ms', models.FloatField()),
+                ('queries', models.PositiveIntegerField(default=0)),
+                ('db_ms', models.FloatField(default=0)),
+                ('perfil', models.TextField(blank=True)),
+                ('crudo', models.BinaryField(blank=True)),
+                ('sql', models.JSONField(blank=True, default=list)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Perfil capturado',
+                'verbose_name_plural': 'Perfiles capturados',
+                'ordering': ('-creado_en', '-id'),
+            },
+        ),
+    ]
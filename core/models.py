@@ -1,3 +1 @@
-from django.db import models
-
-# Create your models here.
+from .domain.models import *  # noqa
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # opcional: sin orjson se usa el JSONRenderer de DRF tal cual
+    orjson = None
+
+# Compacto y UTF-8 como DRF (COMPACT_JSON/UNICODE_JSON). Los datetime pasan al
+# encoder de DRF (formato "Z" y milisegundos), igual que con el renderer de stdlib.
+OPCIONES = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+class JSONRapidoRenderer(JSONRenderer):
+    """
+    JSONRenderer con orjson: misma salida que el de DRF, bastante menos CPU en
+    listados grandes. `; indent=N` en el Accept (o sin orjson) usa el de DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=OPCIONES)
+        # Como DRF: U+2028/U+2029 escapados (válidos en JSON, no en JavaScript)
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from django.test.runner import DiscoverRunner
+
+# Pruebas pesadas (dataset generado): solo con --tag explícito
+TAGS_OPCIONALES = {"planes"}
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner que excluye TAGS_OPCIONALES cuando no se pide ningún --tag:
+    `manage.py test` queda rápido; `manage.py test --tag planes` corre los planes.
+    """
+
+    def __init__(self, *args, tags=None, exclude_tags=None, **kwargs):
+        if not tags:
+            exclude_tags = {*(exclude_tags or ()), *TAGS_OPCIONALES}
+        super().__init__(*args, tags=tags, exclude_tags=exclude_tags, **kwargs)
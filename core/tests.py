@@ -1,3 +1,69 @@
-from django.test import TestCase
+from __future__ import annotations
 
-# Create your tests here.
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from core import middleware
+from core.models import PerfilCapturado
+
+
+@override_settings(PERFILADO_ACTIVO=True)
+class PerfiladoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user("perfil", password="x", is_staff=True)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def _get(self):
+        return self.client.get("/health/?_perfilar=1", secure=True)
+
+    def test_staff_perfilado(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(PerfilCapturado.objects.filter(pk=response["X-Perfil-Id"]).exists())
+
+    def test_otro_perfil_en_curso_atiende_sin_perfilar(self):
+        with middleware._perfilando:
+            response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Perfil-Id", response)
+        self.assertFalse(PerfilCapturado.objects.exists())
+
+    def test_profiler_activo_fuera_del_middleware(self):
+        # Python 3.12+: enable() con otro profiler activo lanza ValueError
+        with mock.patch("cProfile.Profile.enable", side_effect=ValueError("Another profiling tool is already active")):
+            response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Perfil-Id", response)
+        self.assertFalse(middleware._perfilando.locked())
+
+    def test_anonimo_no_perfila(self):
+        self.client.logout()
+        response = self.client.get("/health/?_perfilar=1", secure=True, HTTP_AUTHORIZATION="Bearer x")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Perfil-Id", response)
+
+
+class MetricasTests(TestCase):
+    def _get(self, **headers):
+        return self.client.get("/metrics", secure=True, **headers)
+
+    @override_settings(METRICAS_TOKEN="", DEBUG=False)
+    def test_sin_token_en_produccion_se_niega(self):
+        self.assertEqual(self._get().status_code, 403)
+
+    @override_settings(METRICAS_TOKEN="", DEBUG=True)
+    def test_sin_token_en_desarrollo_queda_abierto(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"db_reintentos_conflicto", response.content)
+
+    @override_settings(METRICAS_TOKEN="s3creto", DEBUG=False)
+    def test_con_token_exige_bearer(self):
+        self.assertEqual(self._get().status_code, 401)
+        self.assertEqual(self._get(HTTP_AUTHORIZATION="Bearer otro").status_code, 401)
+        self.assertEqual(self._get(HTTP_AUTHORIZATION="Bearer s3creto").status_code, 200)
@@ -1,7 +1,10 @@
 # core/urls.py
 from django.urls import path
-from .views import health
+from .views import health, health_ready
 
+# Montado en /health/ (config/urls.py)
 urlpatterns = [
-    path('health/', health, name='health'),  # Define la ruta para el health check
+    path("", health, name="health"),  # liveness
+    path("ready/", health_ready, name="health_ready"),  # readiness
+    path("health/", health),  # ruta vieja (/health/health/), por compatibilidad
 ]
@@ -63,9 +63,43 @@ def logout_view(request):
     return redirect("/login/")  # Redirige a la página de login después de cerrar sesión
 
 
-# Vista para el health check, que responde con un OK
-from django.http import HttpResponse
+# Health checks
+from django.http import HttpResponse, JsonResponse
+
+from core.infrastructure.salud import readiness
+
 
 def health(request):
-    """Vista para el health check"""
+    """Liveness: el proceso responde. No toca BD ni nada externo."""
     return HttpResponse("OK", status=200)
+
+
+def health_ready(request):
+    """
+    Readiness: BD (round trip), secuencias de codigo/folio, MEDIA_ROOT escribible y cache.
+    503 si algo falla, para que el balanceador saque al worker.
+    """
+    estado = readiness()
+    return JsonResponse(estado.as_dict(), status=200 if estado.ok else 503)
+
+
+# Métricas Prometheus (texto); agrega todos los workers en modo multiproceso
+import hmac
+
+from django.conf import settings
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from core.infrastructure.metricas import exportar
+
+
+@require_GET
+def metrics(request):
+    token = settings.METRICAS_TOKEN
+    if not token:
+        # Sin token solo en desarrollo: en producción /metrics no queda público por omisión
+        if not settings.DEBUG:
+            return HttpResponse("METRICAS_TOKEN no configurado.", status=403)
+    elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse("Unauthorized", status=401)
+    return HttpResponse(exportar(), content_type=CONTENT_TYPE_LATEST)
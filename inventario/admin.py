@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from django.contrib import admin
+from django.db.models import F
 from django.utils.html import format_html
 
 from .models import (
@@ -91,11 +92,6 @@ class InventarioItemAdmin(admin.ModelAdmin):
         ("Control", {"fields": ("activo", "fecha_alta", "fecha_baja", "motivo_baja")}),
     )
 
-    def save_model(self, request, obj, form, change):
-        # Si tu modelo ya hace full_clean() en save(), esto es redundante pero seguro.
-        obj.full_clean()
-        super().save_model(request, obj, form, change)
-
 
 # ----------------------------
 # Venta: catálogo / unidades
@@ -135,7 +131,18 @@ class ProductoAdmin(admin.ModelAdmin):
 
 @admin.register(Articulo)
 class ArticuloAdmin(admin.ModelAdmin):
-    list_display = ("id", "producto", "serie", "etiqueta_interna", "estado", "ubicacion", "created_at", "created_by")
+    list_display = (
+        "id",
+        "producto",
+        "serie",
+        "etiqueta_interna",
+        "estado",
+        "reservado_hasta",
+        "ubicacion",
+        "created_at",
+        "created_by",
+    )
+    list_select_related = ("producto", "ubicacion", "created_by")
     search_fields = ("producto__sku", "producto__nombre", "serie", "etiqueta_interna")
     list_filter = ("estado", "ubicacion", "producto__categoria")
     ordering = ("-created_at", "-id")
@@ -143,32 +150,38 @@ class ArticuloAdmin(admin.ModelAdmin):
     autocomplete_fields = ("producto", "ubicacion")
     inlines = (ArticuloFotoInline,)
 
+    def get_queryset(self, request):
+        # También lo usa el autocomplete de VentaDetalle/ArticuloFoto: str() lee producto.sku
+        return super().get_queryset(request).select_related("producto")
+
     actions = ("accion_disponible", "accion_reservado", "accion_vendido", "accion_baja", "accion_desecho")
 
     @admin.action(description="Estado -> DISPONIBLE")
     def accion_disponible(self, request, queryset):
-        queryset.update(estado=ArticuloEstado.DISPONIBLE)
+        queryset.update(estado=ArticuloEstado.DISPONIBLE, reservado_hasta=None, version=F("version") + 1)
 
+    # Reserva manual: sin vencimiento (el barrido de reservas no la toca)
     @admin.action(description="Estado -> RESERVADO")
     def accion_reservado(self, request, queryset):
-        queryset.update(estado=ArticuloEstado.RESERVADO)
+        queryset.update(estado=ArticuloEstado.RESERVADO, reservado_hasta=None, version=F("version") + 1)
 
     @admin.action(description="Estado -> VENDIDO")
     def accion_vendido(self, request, queryset):
-        queryset.update(estado=ArticuloEstado.VENDIDO)
+        queryset.update(estado=ArticuloEstado.VENDIDO, reservado_hasta=None, version=F("version") + 1)
 
     @admin.action(description="Estado -> BAJA")
     def accion_baja(self, request, queryset):
-        queryset.update(estado=ArticuloEstado.BAJA)
+        queryset.update(estado=ArticuloEstado.BAJA, reservado_hasta=None, version=F("version") + 1)
 
     @admin.action(description="Estado -> DESECHO")
     def accion_desecho(self, request, queryset):
-        queryset.update(estado=ArticuloEstado.DESECHO)
+        queryset.update(estado=ArticuloEstado.DESECHO, reservado_hasta=None, version=F("version") + 1)
 
 
 @admin.register(ArticuloFoto)
 class ArticuloFotoAdmin(admin.ModelAdmin):
     list_display = ("articulo", "orden", "imagen")
+    list_select_related = ("articulo__producto",)
     ordering = ("articulo_id", "orden", "id")
     list_filter = ("articulo__producto",)
     search_fields = ("articulo__serie", "articulo__producto__sku")
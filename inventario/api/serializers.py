@@ -1,5 +1,9 @@
+from functools import cached_property
+from operator import itemgetter
+
 from rest_framework import serializers
-from inventario.models import Categoria, Ubicacion, MotivoBaja, InventarioItem
+from inventario.application.recepcion import parsear_series
+from inventario.models import Categoria, Ubicacion, MotivoBaja, InventarioItem, Producto
 
 
 class CategoriaSerializer(serializers.ModelSerializer):
@@ -25,3 +29,136 @@ class InventarioItemSerializer(serializers.ModelSerializer):
         model = InventarioItem
         fields = "__all__"
         read_only_fields = ("codigo", "fecha_alta")
+
+
+class ListadoRapido:
+    """
+    Lecturas sin instanciar modelos: values() con las columnas que usa el serializer
+    (sin joins: las FK salen como *_id) y un lector por campo resuelto una vez.
+    Mismo JSON que `serializer_class(qs, many=True).data`.
+
+    Sparse fieldsets / expand: `seleccion(campos, expandir)` valida y ordena lo pedido;
+    las FK en `expandibles` salen como objeto ({"id", "nombre", ...}) vía join.
+    """
+
+    # Campos cuyo to_representation no cambia el valor que ya trae values()
+    IDENTIDAD = (
+        serializers.CharField,
+        serializers.IntegerField,
+        serializers.BooleanField,
+        serializers.ChoiceField,
+        serializers.PrimaryKeyRelatedField,
+    )
+
+    def __init__(self, serializer_class, expandibles: dict[str, tuple[str, ...]] | None = None):
+        self.serializer_class = serializer_class
+        self.expandibles = expandibles or {}  # FK -> columnas del catálogo (además de id)
+
+    @cached_property
+    def campos(self) -> dict[str, tuple[str, object]]:
+        """{nombre en el JSON: (columna de values(), conversor o None)} en el orden del serializer."""
+        model = self.serializer_class.Meta.model
+        campos = {}
+        for nombre, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                campos[nombre] = (model._meta.get_field(field.source).attname, None)
+            elif isinstance(field, serializers.FileField):
+                campos[nombre] = (field.source, model._meta.get_field(field.source).storage)
+            elif isinstance(field, self.IDENTIDAD):
+                campos[nombre] = (field.source, None)
+            else:
+                campos[nombre] = (field.source, field.to_representation)
+        return campos
+
+    def seleccion(self, campos=None, expandir=()) -> list[str]:
+        """
+        Nombres a devolver, en el orden del serializer. `campos=None` = todos; lo
+        expandido se incluye aunque no venga en `campos`.
+        """
+        errores = {}
+        if campos is not None:
+            desconocidos = sorted(set(campos) - set(self.campos))
+            if desconocidos:
+                errores["fields"] = f"Campos desconocidos: {', '.join(desconocidos)}."
+        desconocidos = sorted(set(expandir) - set(self.expandibles))
+        if desconocidos:
+            errores["expand"] = (
+                f"No expandibles: {', '.join(desconocidos)}. Opciones: {', '.join(self.expandibles)}."
+            )
+        if errores:
+            raise serializers.ValidationError(errores)
+
+        pedidos = set(self.campos if campos is None else campos) | set(expandir)
+        return [nombre for nombre in self.campos if nombre in pedidos]
+
+    def values(self, queryset, seleccion=None, expandir=()):
+        columnas = []
+        for nombre in seleccion or self.campos:
+            columnas.append(self.campos[nombre][0])
+            if nombre in expandir:
+                columnas += [f"{nombre}__{c}" for c in self.expandibles[nombre]]
+        return queryset.values(*columnas)
+
+    def serializar(self, filas, request=None, seleccion=None, expandir=()) -> list[dict]:
+        lectores = [(nombre, self._lector(nombre, request, expandir)) for nombre in seleccion or self.campos]
+        return [{nombre: leer(fila) for nombre, leer in lectores} for fila in filas]
+
+    def _lector(self, nombre, request, expandir):
+        columna, conversor = self.campos[nombre]
+        if nombre in expandir:
+            extra = [(c, f"{nombre}__{c}") for c in self.expandibles[nombre]]
+
+            def expandido(fila):
+                pk = fila[columna]
+                return None if pk is None else {"id": pk, **{c: fila[col] for c, col in extra}}
+
+            return expandido
+        if conversor is None:
+            return itemgetter(columna)
+        if not callable(conversor):
+            conversor = self._url_archivo(conversor, request)
+
+        def convertido(fila):
+            valor = fila[columna]
+            return None if valor is None else conversor(valor)
+
+        return convertido
+
+    @staticmethod
+    def _url_archivo(storage, request):
+        # Igual que FileField.to_representation: None si vacío; URL absoluta si hay request
+        def url(nombre):
+            if not nombre:
+                return None
+            relativa = storage.url(nombre)
+            return request.build_absolute_uri(relativa) if request is not None else relativa
+
+        return url
+
+
+ITEMS_LISTADO = ListadoRapido(
+    InventarioItemSerializer,
+    expandibles={"categoria": ("nombre",), "ubicacion": ("nombre",), "motivo_baja": ("nombre",)},
+)
+
+
+class RecepcionArticulosSerializer(serializers.Serializer):
+    """
+    Entrada de la recepción por escaneo: `series` como lista o como texto (una por línea).
+    """
+
+    producto = serializers.PrimaryKeyRelatedField(queryset=Producto.objects.filter(activo=True))
+    ubicacion = serializers.PrimaryKeyRelatedField(queryset=Ubicacion.objects.all(), required=False, allow_null=True)
+    grado = serializers.CharField(max_length=10, required=False, allow_blank=True, default="")
+    condicion = serializers.CharField(max_length=50, required=False, allow_blank=True, default="")
+    series = serializers.JSONField()
+    omitir_duplicadas = serializers.BooleanField(required=False, default=False)
+
+    def validate_series(self, value):
+        if isinstance(value, str):
+            return parsear_series(value)
+        if isinstance(value, list) and all(isinstance(s, str) for s in value):
+            return [s.strip() for s in value if s.strip()]
+        raise serializers.ValidationError("Lista de series (strings) o texto con una serie por línea.")
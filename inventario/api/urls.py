@@ -9,6 +9,7 @@ from .viewsets import (
     InventarioItemViewSet,
     MotivoBajaViewSet,
     UbicacionViewSet,
+    recepcion_articulos,
 )
 
 router = DefaultRouter()
@@ -26,11 +27,13 @@ def api_root(request, format=None):
             "ubicaciones": reverse("ubicaciones-list", request=request, format=format),
             "motivos_baja": reverse("motivos-baja-list", request=request, format=format),
             "items": reverse("items-list", request=request, format=format),
+            "recepcion_articulos": reverse("articulos-recepcion", request=request, format=format),
         }
     )
 
 
 urlpatterns = [
     path("", api_root, name="api-root"),
+    path("articulos/recepcion/", recepcion_articulos, name="articulos-recepcion"),
     path("", include(router.urls)),
 ]
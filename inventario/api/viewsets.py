@@ -17,17 +17,25 @@ from reportlab.platypus import (
     Table,
     TableStyle,
 )
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import viewsets
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view
 from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
+from core.infrastructure.metricas import medir_export
+from core.middleware import presupuesto_queries
+from inventario.application.lote import MAX_FILAS, actualizar_items_lote, crear_items_lote
+from inventario.application.recepcion import recibir_articulos
 from inventario.models import Categoria, InventarioItem, MotivoBaja, Ubicacion
 from .serializers import (
     CategoriaSerializer,
+    ITEMS_LISTADO,
     InventarioItemSerializer,
     MotivoBajaSerializer,
+    RecepcionArticulosSerializer,
     UbicacionSerializer,
 )
 
@@ -46,6 +54,12 @@ def _is_staff(user) -> bool:
     return bool(user and user.is_authenticated and user.is_staff)
 
 
+def _param_lista(request, nombre: str) -> list[str] | None:
+    """`?nombre=a,b` -> ["a", "b"]; ausente o vacío -> None."""
+    valores = [v.strip() for v in request.query_params.get(nombre, "").split(",") if v.strip()]
+    return valores or None
+
+
 class CategoriaViewSet(viewsets.ModelViewSet):
     queryset = Categoria.objects.all().order_by("nombre")
     serializer_class = CategoriaSerializer
@@ -73,6 +87,7 @@ class MotivoBajaViewSet(viewsets.ModelViewSet):
     ordering_fields = ["nombre"]
 
 
+@presupuesto_queries(6)
 class InventarioItemViewSet(viewsets.ModelViewSet):
     serializer_class = InventarioItemSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -104,10 +119,65 @@ class InventarioItemViewSet(viewsets.ModelViewSet):
             .order_by("-fecha_alta", "codigo")
         )
 
+    # ----------------------------
+    # Lecturas: values() + lectores precalculados (mismo JSON que InventarioItemSerializer)
+    # ?fields=codigo,marca  -> solo esas columnas (SELECT incluido)
+    # ?expand=categoria,... -> {"id", "nombre"} en lugar del id, con join
+    # ----------------------------
+    def _seleccion(self):
+        expandir = _param_lista(self.request, "expand") or []
+        return ITEMS_LISTADO.seleccion(_param_lista(self.request, "fields"), expandir), expandir
+
+    def list(self, request, *args, **kwargs):
+        seleccion, expandir = self._seleccion()
+        filas = ITEMS_LISTADO.values(self.filter_queryset(self.get_queryset()), seleccion, expandir)
+        page = self.paginate_queryset(filas)
+        if page is not None:
+            return self.get_paginated_response(ITEMS_LISTADO.serializar(page, request, seleccion, expandir))
+        return Response(ITEMS_LISTADO.serializar(filas, request, seleccion, expandir))
+
+    def retrieve(self, request, *args, **kwargs):
+        if "fields" not in request.query_params and "expand" not in request.query_params:
+            return super().retrieve(request, *args, **kwargs)
+
+        seleccion, expandir = self._seleccion()
+        filas = ITEMS_LISTADO.values(self.filter_queryset(self.get_queryset()), seleccion, expandir)
+        fila = get_object_or_404(filas, pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        return Response(ITEMS_LISTADO.serializar([fila], request, seleccion, expandir)[0])
+
+    # ----------------------------
+    # Alta / edición en lote (app de captura)
+    # POST  [{...}, ...]           -> crea (como POST /api/items/, sin foto)
+    # PATCH [{"id": 1, ...}, ...]  -> edición parcial
+    # ----------------------------
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    @presupuesto_queries(10)
+    def bulk(self, request):
+        filas = request.data
+        if not isinstance(filas, list) or not filas:
+            return Response({"detail": "Se espera un arreglo de items."}, status=400)
+        if len(filas) > MAX_FILAS:
+            return Response({"detail": f"Máximo {MAX_FILAS} items por petición."}, status=400)
+
+        if request.method == "POST":
+            resultado, status_ok = crear_items_lote(filas), 201
+        else:
+            resultado, status_ok = actualizar_items_lote(filas), 200
+
+        # Todas bien: 201/200; ninguna: 400; mezcla: 207 (revisar "resultados" por fila)
+        if not resultado.fallidas:
+            status = status_ok
+        elif not resultado.ok:
+            status = 400
+        else:
+            status = 207
+        return Response(resultado.as_dict(), status=status)
+
     # ----------------------------
     # Export XLSX (SOLO STAFF)
     # ----------------------------
     @action(detail=False, methods=["get"], url_path="export/xlsx")
+    @medir_export("xlsx")
     def export_xlsx(self, request):
         if not _is_staff(request.user):
             return Response({"detail": "Solo staff."}, status=403)
@@ -172,6 +242,7 @@ class InventarioItemViewSet(viewsets.ModelViewSet):
     # Export PDF listado (SOLO STAFF)
     # ----------------------------
     @action(detail=False, methods=["get"], url_path="export/pdf")
+    @medir_export("pdf")
     def export_pdf(self, request):
         if not _is_staff(request.user):
             return Response({"detail": "Solo staff."}, status=403)
@@ -266,6 +337,7 @@ class InventarioItemViewSet(viewsets.ModelViewSet):
     # /api/items/{id}/ficha/pdf/
     # ----------------------------
     @action(detail=True, methods=["get"], url_path="ficha/pdf")
+    @medir_export("ficha_pdf")
     def ficha_pdf(self, request, pk=None):
         if not _is_staff(request.user):
             return Response({"detail": "Solo staff."}, status=403)
@@ -337,3 +409,39 @@ class InventarioItemViewSet(viewsets.ModelViewSet):
         response = HttpResponse(pdf, content_type="application/pdf")
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
         return response
+
+
+@api_view(["POST"])
+def recepcion_articulos(request):
+    """
+    Recepción por escaneo: crea N Articulo de un producto a partir de sus series.
+    400 con las series duplicadas (salvo omitir_duplicadas=true).
+    """
+    if not _is_staff(request.user):
+        return Response({"detail": "Solo staff."}, status=403)
+
+    ser = RecepcionArticulosSerializer(data=request.data)
+    ser.is_valid(raise_exception=True)
+    datos = ser.validated_data
+    try:
+        resultado = recibir_articulos(
+            datos["producto"],
+            datos["series"],
+            ubicacion=datos.get("ubicacion"),
+            grado=datos["grado"],
+            condicion=datos["condicion"],
+            created_by=request.user,
+            omitir_duplicadas=datos["omitir_duplicadas"],
+        )
+    except DjangoValidationError as e:
+        return Response(e.message_dict, status=400)
+
+    return Response(
+        {
+            "creados": len(resultado.creados),
+            "ids": [a.pk for a in resultado.creados],
+            "repetidas": resultado.repetidas,
+            "existentes": resultado.existentes,
+        },
+        status=201,
+    )
@@ -0,0 +1,81 @@
+# inventario/application/baja.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from inventario.models import InventarioItem, MotivoBaja
+
+ESTADOS_BAJA = (InventarioItem.Estado.BAJA, InventarioItem.Estado.DESECHO)
+
+
+@dataclass
+class Rechazo:
+    id: int
+    codigo: str
+    motivo: str
+
+
+@dataclass
+class ResultadoBaja:
+    actualizados: int = 0
+    rechazados: list[Rechazo] = field(default_factory=list)
+    no_encontrados: list[str] = field(default_factory=list)  # solo al seleccionar por códigos
+
+
+def items_por_codigos(codigos: list[str]) -> tuple[QuerySet, list[str]]:
+    """Selección por lista de códigos + los que no existen (un query)."""
+    items = InventarioItem.objects.filter(codigo__in=codigos)
+    encontrados = set(items.values_list("codigo", flat=True))
+    return items, [c for c in dict.fromkeys(codigos) if c not in encontrados]
+
+
+@transaction.atomic
+def dar_de_baja_lote(
+    items: QuerySet,
+    *,
+    estado: str,
+    motivo_baja: MotivoBaja | None,
+    fecha_baja: date | None = None,
+) -> ResultadoBaja:
+    """
+    Baja/desecho de una selección con un solo UPDATE. Las reglas de
+    InventarioItem.clean() se aplican al conjunto:
+    - estado BAJA/DESECHO => activo=False, con fecha_baja (default hoy) y motivo_baja
+    - por fila: fecha_baja >= fecha_alta; los que ya están en ese estado no se tocan
+    Las filas que no cumplen quedan en `rechazados` con su motivo.
+    """
+    errors = {}
+    if estado not in ESTADOS_BAJA:
+        errors["estado"] = "Solo BAJA o DESECHO."
+    if motivo_baja is None:
+        errors["motivo_baja"] = "Requerido cuando el equipo está dado de baja."
+    if errors:
+        raise ValidationError(errors)
+
+    fecha_baja = fecha_baja or timezone.localdate()
+    items = items.order_by()
+    no_aplica = Q(fecha_alta__gt=fecha_baja) | Q(estado=estado)
+
+    resultado = ResultadoBaja()
+    for pk, codigo, alta, actual in (
+        items.filter(no_aplica).order_by("codigo").values_list("id", "codigo", "fecha_alta", "estado")
+    ):
+        if actual == estado:
+            motivo = f"Ya está en {InventarioItem.Estado(actual).label}."
+        else:
+            motivo = f"Fecha de baja anterior al alta ({alta:%Y-%m-%d})."
+        resultado.rechazados.append(Rechazo(pk, codigo, motivo))
+
+    resultado.actualizados = items.exclude(no_aplica).update(
+        estado=estado,
+        activo=False,
+        fecha_baja=fecha_baja,
+        motivo_baja=motivo_baja,
+    )
+    return resultado
@@ -0,0 +1,284 @@
+# inventario/application/importacion.py
+from __future__ import annotations
+
+import csv
+import io
+import zipfile
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from inventario.models import Categoria, InventarioItem, Ubicacion
+
+# Columnas que entiende el importador (encabezado de la primera fila, sin importar mayúsculas).
+COLUMNAS = (
+    "categoria",
+    "ubicacion",
+    "estado",
+    "marca",
+    "modelo",
+    "serie",
+    "etiqueta_interna",
+    "responsable",
+    "observaciones",
+    "precio_sugerido_venta",
+)
+REQUERIDAS = ("categoria", "ubicacion")
+
+# CSV: UTF-8 primero (con BOM de Excel o sin él); Excel en es-MX guarda cp1252.
+# latin-1 al final: decodifica cualquier byte.
+CODIFICACIONES = ("utf-8-sig", "cp1252", "latin-1")
+DELIMITADORES = (",", ";", "\t")
+
+# Alta/Importación: igual que InventarioItemForm, aquí NO hay bajas.
+ESTADOS_ALTA = (InventarioItem.Estado.EN_USO, InventarioItem.Estado.ALMACEN)
+
+# clean_fields() sin consultas: FKs se resuelven con los mapas en memoria,
+# codigo lo asigna el allocator y fecha_alta/foto no vienen en el archivo.
+_EXCLUIR_CLEAN_FIELDS = ["codigo", "categoria", "ubicacion", "motivo_baja", "foto", "fecha_alta", "fecha_baja"]
+
+
+class ArchivoInvalido(ValueError):
+    """El archivo no se puede leer (formato, codificación o CSV mal formado)."""
+
+
+@dataclass
+class ErrorFila:
+    fila: int
+    datos: dict[str, str]
+    error: str
+
+
+@dataclass
+class ResultadoImportacion:
+    creados: int = 0
+    errores: list[ErrorFila] = field(default_factory=list)
+    codigos: list[str] = field(default_factory=list)
+
+
+# ----------------------------
+# Lectura en streaming
+# ----------------------------
+def _normaliza_encabezado(valor) -> str:
+    return str(valor or "").strip().lower().replace(" ", "_")
+
+
+def _celda(valor) -> str:
+    if valor is None:
+        return ""
+    return str(valor).strip()
+
+
+def leer_filas(archivo, nombre: str) -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    Itera (número de fila, {columna: valor}) sin cargar el archivo completo.
+    - .xlsx: openpyxl en modo read_only
+    - otro: CSV en UTF-8 (con o sin BOM) o, si no decodifica, cp1252/latin-1 (Excel es-MX);
+      separador `,`, `;` o tabulador según el encabezado
+    `archivo` es binario (UploadedFile o open(..., "rb")).
+
+    Formato, codificación y CSV mal formado se revisan aquí, antes de regresar el
+    iterador (el CSV se recorre una vez completo): ArchivoInvalido sale antes de que
+    importar_items guarde el primer lote.
+    """
+    if nombre.lower().endswith(".xlsx"):
+        return _filas_xlsx(_abrir_xlsx(archivo))
+
+    codificacion, delimitador = _formato_csv(archivo)
+    return _filas_csv(archivo, codificacion, delimitador)
+
+
+def _abrir_xlsx(archivo):
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        return load_workbook(archivo, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError, OSError) as e:
+        raise ArchivoInvalido("No es un archivo .xlsx válido.") from e
+
+
+def _filas_xlsx(wb) -> Iterator[tuple[int, dict[str, str]]]:
+    try:
+        filas = wb.active.iter_rows(values_only=True)
+        encabezado = [_normaliza_encabezado(c) for c in next(filas, ())]
+        for n, valores in enumerate(filas, start=2):
+            if not any(v not in (None, "") for v in valores):
+                continue
+            yield n, {col: _celda(v) for col, v in zip(encabezado, valores) if col}
+    finally:
+        wb.close()
+
+
+def _texto(archivo, codificacion: str) -> io.TextIOWrapper:
+    archivo.seek(0)
+    return io.TextIOWrapper(archivo, encoding=codificacion, newline="")
+
+
+def _delimitador(encabezado: str) -> str:
+    return max(DELIMITADORES, key=encabezado.count) if any(d in encabezado for d in DELIMITADORES) else ","
+
+
+def _formato_csv(archivo) -> tuple[str, str]:
+    """(codificación, separador) con los que el archivo completo se lee sin error."""
+    for codificacion in CODIFICACIONES:
+        texto = _texto(archivo, codificacion)
+        try:
+            delimitador = _delimitador(texto.readline())
+            texto.seek(0)
+            for _ in csv.reader(texto, delimiter=delimitador):
+                pass
+        except UnicodeDecodeError:
+            continue
+        except csv.Error as e:
+            raise ArchivoInvalido(f"CSV mal formado: {e}.") from e
+        finally:
+            texto.detach()  # que cerrar el wrapper no cierre el archivo
+        return codificacion, delimitador
+    raise ArchivoInvalido("Codificación no reconocida.")  # no pasa: latin-1 decodifica cualquier byte
+
+
+def _filas_csv(archivo, codificacion: str, delimitador: str) -> Iterator[tuple[int, dict[str, str]]]:
+    texto = _texto(archivo, codificacion)
+    try:
+        reader = csv.reader(texto, delimiter=delimitador)
+        encabezado = [_normaliza_encabezado(c) for c in next(reader, [])]
+        for n, valores in enumerate(reader, start=2):
+            if not any(v.strip() for v in valores):
+                continue
+            yield n, {col: _celda(v) for col, v in zip(encabezado, valores) if col}
+    finally:
+        texto.detach()
+
+
+# ----------------------------
+# Validación por lote (sin queries por fila)
+# ----------------------------
+class CatalogosEnMemoria:
+    """
+    Nombre (case-insensitive) -> id, un query por catálogo para todo el archivo.
+    """
+
+    def __init__(self):
+        self.categorias = {n.casefold(): pk for pk, n in Categoria.objects.values_list("id", "nombre")}
+        self.ubicaciones = {n.casefold(): pk for pk, n in Ubicacion.objects.values_list("id", "nombre")}
+        self.estados = {}
+        for value, label in InventarioItem.Estado.choices:
+            self.estados[value.casefold()] = value
+            self.estados[str(label).casefold()] = value
+
+
+def construir_item(datos: dict[str, str], catalogos: CatalogosEnMemoria) -> InventarioItem:
+    """
+    Arma el InventarioItem y aplica las reglas del modelo (clean_fields + clean)
+    sin tocar la BD. Lanza ValidationError con el mismo formato que full_clean().
+    """
+    errors: dict[str, list[str]] = {}
+
+    for col in REQUERIDAS:
+        if not datos.get(col):
+            errors.setdefault(col, []).append("Requerido.")
+
+    categoria_id = catalogos.categorias.get(datos.get("categoria", "").casefold())
+    if datos.get("categoria") and categoria_id is None:
+        errors.setdefault("categoria", []).append(f"Categoría desconocida: {datos['categoria']}.")
+
+    ubicacion_id = catalogos.ubicaciones.get(datos.get("ubicacion", "").casefold())
+    if datos.get("ubicacion") and ubicacion_id is None:
+        errors.setdefault("ubicacion", []).append(f"Ubicación desconocida: {datos['ubicacion']}.")
+
+    estado = InventarioItem.Estado.ALMACEN
+    if datos.get("estado"):
+        estado = catalogos.estados.get(datos["estado"].casefold())
+        if estado not in ESTADOS_ALTA:
+            errors.setdefault("estado", []).append(
+                "Estado inválido para alta (usa EN_USO o ALMACEN; la baja va en su pantalla)."
+            )
+            estado = InventarioItem.Estado.ALMACEN
+
+    precio = None
+    if datos.get("precio_sugerido_venta"):
+        try:
+            precio = Decimal(datos["precio_sugerido_venta"].replace(",", ""))
+        except InvalidOperation:
+            errors.setdefault("precio_sugerido_venta", []).append("Número inválido.")
+
+    item = InventarioItem(
+        categoria_id=categoria_id,
+        ubicacion_id=ubicacion_id,
+        estado=estado,
+        marca=datos.get("marca", ""),
+        modelo=datos.get("modelo", ""),
+        serie=datos.get("serie", ""),
+        etiqueta_interna=datos.get("etiqueta_interna", ""),
+        responsable=datos.get("responsable", ""),
+        observaciones=datos.get("observaciones", ""),
+        precio_sugerido_venta=precio,
+    )
+
+    try:
+        item.clean_fields(exclude=_EXCLUIR_CLEAN_FIELDS + list(errors))
+    except ValidationError as e:
+        for campo, msgs in e.message_dict.items():
+            errors.setdefault(campo, []).extend(msgs)
+
+    if errors:
+        raise ValidationError(errors)
+
+    item.clean()
+    return item
+
+
+def _mensaje(e: ValidationError) -> str:
+    if hasattr(e, "error_dict"):
+        return "; ".join(f"{campo}: {' '.join(msgs)}" for campo, msgs in e.message_dict.items())
+    return " ".join(e.messages)
+
+
+# ----------------------------
+# Importación
+# ----------------------------
+def importar_items(
+    filas: Iterable[tuple[int, dict[str, str]]],
+    lote: int = 2000,
+    catalogos: CatalogosEnMemoria | None = None,
+) -> ResultadoImportacion:
+    """
+    Valida en memoria y guarda con bulk_create por lotes (una transacción por lote;
+    códigos asignados en un round trip por lote). Las filas con error no detienen
+    la importación: se regresan en ResultadoImportacion.errores.
+    """
+    catalogos = catalogos or CatalogosEnMemoria()
+    resultado = ResultadoImportacion()
+    pendientes: list[InventarioItem] = []
+
+    def guardar():
+        with transaction.atomic():
+            creados = InventarioItem.objects.bulk_create(pendientes)
+        resultado.creados += len(creados)
+        resultado.codigos.extend(it.codigo for it in creados)
+        pendientes.clear()
+
+    for n, datos in filas:
+        try:
+            pendientes.append(construir_item(datos, catalogos))
+        except ValidationError as e:
+            resultado.errores.append(ErrorFila(fila=n, datos=datos, error=_mensaje(e)))
+            continue
+        if len(pendientes) >= lote:
+            guardar()
+
+    if pendientes:
+        guardar()
+    return resultado
+
+
+def escribir_reporte_errores(errores: list[ErrorFila], destino) -> None:
+    """CSV con la fila original + número de fila + error (destino: archivo de texto o HttpResponse)."""
+    writer = csv.writer(destino)
+    writer.writerow(["fila", *COLUMNAS, "error"])
+    for e in errores:
+        writer.writerow([e.fila, *(e.datos.get(c, "") for c in COLUMNAS), e.error])
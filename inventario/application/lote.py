@@ -0,0 +1,214 @@
+# inventario/application/lote.py
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from core.infrastructure.db import reintentar_en_conflicto
+from inventario.models import Categoria, InventarioItem, MotivoBaja, Ubicacion
+
+# Lo que escribe la API de items (InventarioItemSerializer) menos la foto: va por multipart, uno a uno.
+CAMPOS = (
+    "categoria",
+    "ubicacion",
+    "estado",
+    "marca",
+    "modelo",
+    "serie",
+    "etiqueta_interna",
+    "responsable",
+    "observaciones",
+    "precio_sugerido_venta",
+    "fecha_baja",
+    "motivo_baja",
+    "activo",
+)
+FKS = {"categoria": Categoria, "ubicacion": Ubicacion, "motivo_baja": MotivoBaja}
+REQUERIDAS = ("categoria", "ubicacion")
+
+# clean() reescribe estos según estado/activo: si la fila toca uno, se guardan todos
+CAMPOS_BAJA = ("estado", "activo", "fecha_baja", "motivo_baja")
+
+# clean_fields() sin consultas: las FK ya se validaron contra los ids existentes
+_EXCLUIR_CLEAN_FIELDS = ["codigo", "foto", "fecha_alta", *FKS]
+
+MAX_FILAS = 1000
+
+
+@dataclass
+class ResultadoFila:
+    indice: int  # posición en el arreglo recibido
+    ok: bool
+    id: int | None = None
+    codigo: str = ""
+    errores: dict[str, list[str]] = field(default_factory=dict)
+
+
+@dataclass
+class ResultadoLoteItems:
+    filas: list[ResultadoFila] = field(default_factory=list)
+
+    @property
+    def ok(self) -> int:
+        return sum(1 for f in self.filas if f.ok)
+
+    @property
+    def fallidas(self) -> int:
+        return len(self.filas) - self.ok
+
+    def as_dict(self) -> dict:
+        return {"ok": self.ok, "fallidas": self.fallidas, "resultados": [asdict(f) for f in self.filas]}
+
+
+# ----------------------------
+# Validación por lote (sin queries por fila)
+# ----------------------------
+def _ids_existentes(filas: list) -> dict[str, set[int]]:
+    """Un query por catálogo, solo con los ids que vienen en el lote."""
+    existentes = {}
+    for campo, model in FKS.items():
+        pedidos = set()
+        for datos in filas:
+            try:
+                pedidos.add(int(datos[campo]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        existentes[campo] = set(model.objects.filter(pk__in=pedidos).values_list("id", flat=True)) if pedidos else set()
+    return existentes
+
+
+def _errores(e: ValidationError) -> dict[str, list[str]]:
+    if hasattr(e, "error_dict"):
+        return e.message_dict
+    return {"non_field_errors": e.messages}
+
+
+def _aplicar(item: InventarioItem, datos, existentes: dict[str, set[int]]) -> set[str]:
+    """
+    Copia `datos` al item y aplica las reglas del modelo (clean_fields + clean) sin
+    tocar la BD. Regresa los campos que cambió; lanza ValidationError como full_clean().
+    Claves desconocidas o de solo lectura se ignoran (igual que DRF).
+    """
+    if not isinstance(datos, dict):
+        raise ValidationError("Se esperaba un objeto.")
+
+    errors: dict[str, list[str]] = {}
+    cambiados = set()
+    for campo in CAMPOS:
+        if campo not in datos:
+            continue
+        valor = datos[campo]
+        if campo in FKS:
+            if valor in (None, ""):
+                valor = None
+            else:
+                try:
+                    valor = int(valor)
+                except (TypeError, ValueError):
+                    errors[campo] = ["Id inválido."]
+                    continue
+                if valor not in existentes[campo]:
+                    errors[campo] = [f"No existe el id {valor}."]
+                    continue
+            setattr(item, f"{campo}_id", valor)
+        else:
+            setattr(item, campo, valor)
+        cambiados.add(campo)
+
+    for campo in REQUERIDAS:
+        if getattr(item, f"{campo}_id") is None and campo not in errors:
+            errors[campo] = ["Este campo es requerido."]
+
+    try:
+        item.clean_fields(exclude=_EXCLUIR_CLEAN_FIELDS + list(errors))
+    except ValidationError as e:
+        for campo, msgs in e.message_dict.items():
+            errors.setdefault(campo, []).extend(msgs)
+    if errors:
+        raise ValidationError(errors)
+
+    item.clean()
+    if cambiados & set(CAMPOS_BAJA):
+        cambiados |= set(CAMPOS_BAJA)
+    return cambiados
+
+
+# ----------------------------
+# Alta y edición en lote
+# ----------------------------
+@transaction.atomic
+def crear_items_lote(filas: list) -> ResultadoLoteItems:
+    """
+    Alta de muchos items: validación en memoria y un bulk_create (códigos en un
+    solo nextval). Las filas con error se reportan y no impiden guardar las demás.
+    """
+    resultado = ResultadoLoteItems()
+    existentes = _ids_existentes([d for d in filas if isinstance(d, dict)])
+    validos: list[tuple[ResultadoFila, InventarioItem]] = []
+
+    for indice, datos in enumerate(filas):
+        item = InventarioItem()
+        try:
+            _aplicar(item, datos, existentes)
+        except ValidationError as e:
+            resultado.filas.append(ResultadoFila(indice, ok=False, errores=_errores(e)))
+            continue
+        fila = ResultadoFila(indice, ok=True)
+        resultado.filas.append(fila)
+        validos.append((fila, item))
+
+    creados = InventarioItem.objects.bulk_create([item for _, item in validos])
+    for (fila, _), item in zip(validos, creados):
+        fila.id, fila.codigo = item.pk, item.codigo
+    return resultado
+
+
+@reintentar_en_conflicto
+@transaction.atomic
+def actualizar_items_lote(filas: list) -> ResultadoLoteItems:
+    """
+    Edición parcial de muchos items (cada fila con su `id`): un SELECT ... FOR UPDATE
+    (orden por id) y un bulk_update con la unión de los campos tocados.
+    """
+    resultado = ResultadoLoteItems()
+    existentes = _ids_existentes([d for d in filas if isinstance(d, dict)])
+
+    pks = []
+    for datos in filas:
+        try:
+            pks.append(int(datos["id"]))
+        except (KeyError, TypeError, ValueError):
+            pks.append(None)
+    items = InventarioItem.objects.select_for_update().filter(pk__in=[pk for pk in pks if pk]).order_by("pk")
+    items = {item.pk: item for item in items}
+
+    vistos: set[int] = set()
+    cambiar: list[InventarioItem] = []
+    campos: set[str] = set()
+    for indice, (pk, datos) in enumerate(zip(pks, filas)):
+        error = None
+        if pk is None:
+            error = {"id": ["Requerido (entero)."]}
+        elif pk in vistos:
+            error = {"id": ["Repetido en el lote."]}
+        elif pk not in items:
+            error = {"id": ["No existe."]}
+        if error:
+            resultado.filas.append(ResultadoFila(indice, ok=False, id=pk, errores=error))
+            continue
+
+        vistos.add(pk)
+        item = items[pk]
+        try:
+            campos |= _aplicar(item, datos, existentes)
+        except ValidationError as e:
+            resultado.filas.append(ResultadoFila(indice, ok=False, id=pk, codigo=item.codigo, errores=_errores(e)))
+            continue
+        cambiar.append(item)
+        resultado.filas.append(ResultadoFila(indice, ok=True, id=pk, codigo=item.codigo))
+
+    if cambiar and campos:
+        InventarioItem.objects.bulk_update(cambiar, sorted(campos), batch_size=500)
+    return resultado
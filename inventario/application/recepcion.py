@@ -0,0 +1,95 @@
+# inventario/application/recepcion.py
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from inventario.models import Articulo, ArticuloEstado, Producto, Ubicacion
+
+# Lector de códigos: una serie por línea; también aceptamos coma/;/tab al pegar de Excel.
+_SEPARADORES = re.compile(r"[\r\n,;\t]+")
+
+
+@dataclass
+class ResultadoRecepcion:
+    creados: list[Articulo] = field(default_factory=list)
+    repetidas: list[str] = field(default_factory=list)  # repetidas dentro de la lista
+    existentes: list[str] = field(default_factory=list)  # ya registradas en inventario
+
+
+def parsear_series(texto: str) -> list[str]:
+    return [s.strip() for s in _SEPARADORES.split(texto or "") if s.strip()]
+
+
+@transaction.atomic
+def recibir_articulos(
+    producto: Producto,
+    series: list[str],
+    *,
+    ubicacion: Ubicacion | None = None,
+    grado: str = "",
+    condicion: str = "",
+    created_by=None,
+    omitir_duplicadas: bool = False,
+    lote: int = 1000,
+) -> ResultadoRecepcion:
+    """
+    Recepción de un pallet: N unidades del mismo producto a partir de sus series.
+    - Duplicados (en la lista y contra inventario) en UN query indexado (serie__in).
+    - Alta con bulk_create (created_by incluido).
+    Por default es todo o nada; con omitir_duplicadas=True se dan de alta las demás
+    y las duplicadas se reportan.
+    """
+    resultado = ResultadoRecepcion()
+
+    max_len = Articulo._meta.get_field("serie").max_length
+    largas = [s for s in series if len(s) > max_len]
+    if largas:
+        raise ValidationError({"series": f"Máximo {max_len} caracteres: {', '.join(largas[:10])}"})
+
+    unicas: list[str] = []
+    vistas: set[str] = set()
+    for s in series:
+        if s in vistas:
+            resultado.repetidas.append(s)
+        else:
+            vistas.add(s)
+            unicas.append(s)
+
+    if not unicas:
+        raise ValidationError({"series": "No hay series para recibir."})
+
+    existentes = set(Articulo.objects.filter(serie__in=unicas).values_list("serie", flat=True))
+    resultado.existentes = [s for s in unicas if s in existentes]
+
+    if (resultado.repetidas or resultado.existentes) and not omitir_duplicadas:
+        errors = []
+        if resultado.repetidas:
+            errors.append(f"Repetidas en la lista: {', '.join(resultado.repetidas[:20])}")
+        if resultado.existentes:
+            errors.append(f"Ya existen en inventario: {', '.join(resultado.existentes[:20])}")
+        raise ValidationError({"series": errors})
+
+    nuevos = [
+        Articulo(
+            producto=producto,
+            serie=s,
+            ubicacion=ubicacion,
+            grado=grado,
+            condicion=condicion,
+            estado=ArticuloEstado.DISPONIBLE,
+            created_by=created_by,
+        )
+        for s in unicas
+        if s not in existentes
+    ]
+
+    try:
+        resultado.creados = Articulo.objects.bulk_create(nuevos, batch_size=lote)
+    except IntegrityError:
+        # Carrera con otra recepción que metió la misma serie entre el query y el INSERT
+        raise ValidationError({"series": "Otra captura registró alguna de estas series al mismo tiempo. Reintenta."})
+    return resultado
@@ -7,6 +7,8 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
 
+from core.infrastructure.db import DbReturningCharField, ValidacionEnBDMixin, VersionadoMixin
+
 
 # ----------------------------
 # Catálogos
@@ -50,16 +52,30 @@ class MotivoBaja(models.Model):
 # ----------------------------
 # Inventario (interno)
 # ----------------------------
-class InventarioItem(models.Model):
+class InventarioItemQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Asigna codigo a todo el lote con un solo nextval(generate_series) antes del INSERT,
+        así los objetos ya traen su código sin re-consultar.
+        """
+        from inventario.infrastructure.codigo import asignar_codigos  # import local (OK)
+
+        objs = list(objs)
+        asignar_codigos(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class InventarioItem(ValidacionEnBDMixin, models.Model):
     class Estado(models.TextChoices):
         EN_USO = "EN_USO", "En uso"
         ALMACEN = "ALMACEN", "Almacén"
         BAJA = "BAJA", "Baja"
         DESECHO = "DESECHO", "Desecho"
 
-    # Si lo generas en BD con trigger/sequence: déjalo blank=True y editable=False.
-    # OJO: Django insertará '' (cadena vacía), así que tu trigger debe considerar '' como "sin código".
-    codigo = models.CharField(max_length=20, unique=True, editable=False, db_index=True, blank=True)
+    # Lo genera la BD con trigger/sequence: blank=True y editable=False.
+    # OJO: Django insertará '' (cadena vacía), así que el trigger considera '' como "sin código".
+    # DbReturningCharField: el valor final regresa en el INSERT ... RETURNING.
+    codigo = DbReturningCharField(max_length=20, unique=True, editable=False, db_index=True, blank=True)
 
     foto = models.ImageField(upload_to="inventario/items/", null=True, blank=True)
 
@@ -97,6 +113,8 @@ class InventarioItem(models.Model):
 
     activo = models.BooleanField(default=True)
 
+    objects = InventarioItemQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Item de inventario"
         verbose_name_plural = "Items de inventario"
@@ -105,6 +123,8 @@ class InventarioItem(models.Model):
             models.Index(fields=["codigo"]),
             models.Index(fields=["serie"]),
             models.Index(fields=["etiqueta_interna"]),
+            # Orden de item_list y de la API: la página sale del índice, sin ordenar la tabla
+            models.Index(fields=["-fecha_alta", "codigo"], name="item_fecha_alta_codigo_idx"),
         ]
 
     def __str__(self) -> str:
@@ -138,11 +158,6 @@ class InventarioItem(models.Model):
         if self.fecha_baja and self.fecha_alta and self.fecha_baja < self.fecha_alta:
             raise ValidationError({"fecha_baja": "No puede ser menor a la fecha de alta."})
 
-    def save(self, *args, **kwargs):
-        # Para que reglas apliquen siempre (no solo en admin/forms)
-        self.full_clean()
-        return super().save(*args, **kwargs)
-
 
 # ----------------------------
 # Venta (catálogo vs unidades)
@@ -194,7 +209,7 @@ class ArticuloEstado(models.TextChoices):
     DESECHO = "DESECHO", "Desecho"
 
 
-class Articulo(models.Model):
+class Articulo(VersionadoMixin, models.Model):
     """
     Artículo = unidad física (normalmente con serie)
     """
@@ -216,6 +231,10 @@ class Articulo(models.Model):
         related_name="articulos",
     )
     estado = models.CharField(max_length=20, choices=ArticuloEstado.choices, default=ArticuloEstado.DISPONIBLE)
+    # Solo aplica en RESERVADO: al vencer, el barrido (liberar_reservas) lo regresa a DISPONIBLE.
+    reservado_hasta = models.DateTimeField(null=True, blank=True)
+    # Concurrencia optimista: todo cambio la incrementa (servicios con F(); save() vía VersionadoMixin).
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     observaciones = models.TextField(blank=True)
 
@@ -226,8 +245,16 @@ class Articulo(models.Model):
         ordering = ("-created_at", "-id")
         indexes = [
             models.Index(fields=["estado"]),
+            # POS: "una unidad disponible de este SKU"
+            models.Index(fields=["producto", "estado"], name="articulo_producto_estado_idx"),
             models.Index(fields=["serie"]),
             models.Index(fields=["etiqueta_interna"]),
+            # Parcial: el barrido de reservas vencidas solo recorre las RESERVADO
+            models.Index(
+                fields=["reservado_hasta"],
+                name="articulo_reserva_vence_idx",
+                condition=models.Q(estado=ArticuloEstado.RESERVADO),
+            ),
         ]
         # Permite múltiples NULL y múltiples '' (vacíos). Solo restringe series reales.
         constraints = [
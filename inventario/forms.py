@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from django import forms
-from .models import InventarioItem
+from .models import InventarioItem, MotivoBaja, Producto, Ubicacion
 
 
-class BootstrapModelForm(forms.ModelForm):
+class BootstrapFormMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -24,6 +24,14 @@ class BootstrapModelForm(forms.ModelForm):
                 w.attrs.setdefault("class", "form-control")
 
 
+class BootstrapModelForm(BootstrapFormMixin, forms.ModelForm):
+    pass
+
+
+class BootstrapForm(BootstrapFormMixin, forms.Form):
+    pass
+
+
 def _model_has_field(model, field_name: str) -> bool:
     try:
         model._meta.get_field(field_name)
@@ -138,3 +146,59 @@ class InventarioBajaForm(BootstrapModelForm):
                 self.add_error("motivo_baja", "Requerido cuando el equipo está dado de baja.")
 
         return cleaned
+
+
+class BajaMasivaForm(BootstrapForm):
+    """
+    Baja/Desecho de muchos items: por lista de códigos o, si viene vacía,
+    la selección filtrada del listado (los filtros viajan en la URL).
+    """
+
+    estado = forms.ChoiceField(
+        choices=[
+            (InventarioItem.Estado.BAJA, InventarioItem.Estado.BAJA.label),
+            (InventarioItem.Estado.DESECHO, InventarioItem.Estado.DESECHO.label),
+        ]
+    )
+    fecha_baja = forms.DateField(
+        required=False,
+        help_text="Vacío = hoy.",
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+    motivo_baja = forms.ModelChoiceField(queryset=MotivoBaja.objects.all(), label="Motivo de baja")
+    codigos = forms.CharField(
+        label="Códigos",
+        required=False,
+        help_text="Uno por línea (lector o pegado desde Excel). Vacío = los items del filtro.",
+        widget=forms.Textarea(attrs={"rows": 8}),
+    )
+    # Cuántos items mostraba la vista previa del filtro: si cambió, no se aplica
+    esperados = forms.IntegerField(required=False, widget=forms.HiddenInput)
+
+
+class InventarioImportForm(BootstrapForm):
+    archivo = forms.FileField(
+        label="Archivo (.xlsx o .csv)",
+        help_text="Primera fila = encabezados: categoria, ubicacion, estado, marca, modelo, serie, "
+        "etiqueta_interna, responsable, observaciones, precio_sugerido_venta.",
+        widget=forms.ClearableFileInput(attrs={"accept": ".xlsx,.csv"}),
+    )
+
+
+class RecepcionArticulosForm(BootstrapForm):
+    """
+    Recepción por escaneo: un producto + N series (una por línea).
+    """
+
+    producto = forms.ModelChoiceField(queryset=Producto.objects.filter(activo=True).order_by("sku"))
+    ubicacion = forms.ModelChoiceField(queryset=Ubicacion.objects.order_by("nombre"), required=False)
+    grado = forms.CharField(max_length=10, required=False)
+    condicion = forms.CharField(max_length=50, required=False)
+    series = forms.CharField(
+        widget=forms.Textarea(attrs={"rows": 12, "autofocus": True}),
+        help_text="Escanea o pega las series, una por línea.",
+    )
+    omitir_duplicadas = forms.BooleanField(
+        required=False,
+        label="Omitir duplicadas (registrar las demás)",
+    )
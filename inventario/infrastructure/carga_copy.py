@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from django.db import connection, transaction
+
+from inventario.models import Articulo, ArticuloEstado, Producto, Ubicacion
+
+# Columnas del archivo / staging (todas texto; la validación es en SQL, por conjunto)
+COLUMNAS_ARTICULO = (
+    "sku",
+    "serie",
+    "etiqueta_interna",
+    "condicion",
+    "grado",
+    "accesorios",
+    "ubicacion",
+    "estado",
+    "observaciones",
+)
+
+STAGING = "stg_carga_articulo"
+
+
+@dataclass
+class ResultadoCarga:
+    leidas: int = 0
+    insertadas: int = 0
+    rechazadas: list[tuple[int, str, str, str]] = field(default_factory=list)  # (linea, sku, serie, error)
+
+
+def _max_length(campo: str) -> int:
+    return Articulo._meta.get_field(campo).max_length
+
+
+def _validaciones() -> list[tuple[str, str]]:
+    """
+    (mensaje, condición SQL sobre `s`) en orden; la primera que aplica gana.
+    Cada una es un solo UPDATE sobre staging.
+    """
+    articulo = Articulo._meta.db_table
+    producto = Producto._meta.db_table
+    ubicacion = Ubicacion._meta.db_table
+    estados = ", ".join(f"'{e}'" for e in ArticuloEstado.values)
+
+    reglas = [
+        ("SKU requerido.", "coalesce(btrim(s.sku), '') = ''"),
+        ("SKU desconocido.", f"NOT EXISTS (SELECT 1 FROM {producto} p WHERE p.sku = s.sku)"),
+        (
+            "Ubicación desconocida.",
+            f"coalesce(s.ubicacion, '') <> '' AND NOT EXISTS (SELECT 1 FROM {ubicacion} u WHERE u.nombre = s.ubicacion)",
+        ),
+        ("Estado inválido.", f"coalesce(s.estado, '') <> '' AND s.estado NOT IN ({estados})"),
+    ]
+    for campo in ("serie", "etiqueta_interna", "condicion", "grado", "accesorios"):
+        reglas.append((f"{campo}: máximo {_max_length(campo)} caracteres.", f"length(s.{campo}) > {_max_length(campo)}"))
+
+    # Mismo criterio que uniq_articulo_serie: solo series no nulas y no vacías
+    reglas.append(
+        (
+            "Serie ya existe en inventario.",
+            f"coalesce(s.serie, '') <> '' AND EXISTS (SELECT 1 FROM {articulo} a WHERE a.serie = s.serie)",
+        )
+    )
+    return reglas
+
+
+def cargar_articulos(
+    filas: Iterable[tuple[int, dict[str, str]]],
+    created_by_id: int | None = None,
+    progreso: Callable[[str, int], None] | None = None,
+    cada: int = 50_000,
+) -> ResultadoCarga:
+    """
+    Carga masiva de Articulo para migraciones:
+      1) COPY ... FROM STDIN a una tabla temporal (psycopg3)
+      2) validación por conjunto (SKU, ubicación, estado, largos, series duplicadas
+         en el archivo y contra uniq_articulo_serie)
+      3) un solo INSERT ... SELECT de las filas válidas
+    Todo en una transacción: o entra la carga válida completa o nada.
+    `filas` son (número de línea, {columna: valor}), p. ej. importacion.leer_filas().
+    `progreso(etapa, n)` se llama cada `cada` filas copiadas y al terminar cada etapa.
+    """
+    resultado = ResultadoCarga()
+    avisar = progreso or (lambda etapa, n: None)
+    cols = ", ".join(COLUMNAS_ARTICULO)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {STAGING} (linea bigint, "
+            + ", ".join(f"{c} text" for c in COLUMNAS_ARTICULO)
+            + ", error text) ON COMMIT DROP"
+        )
+
+        # 1) COPY
+        with cursor.copy(f"COPY {STAGING} (linea, {cols}) FROM STDIN") as copy:
+            for linea, datos in filas:
+                copy.write_row([linea, *((datos.get(c) or "").strip() for c in COLUMNAS_ARTICULO)])
+                resultado.leidas += 1
+                if resultado.leidas % cada == 0:
+                    avisar("copiadas", resultado.leidas)
+        avisar("copiadas", resultado.leidas)
+        cursor.execute(f"ANALYZE {STAGING}")
+
+        # 2) Validación por conjunto
+        for mensaje, condicion in _validaciones():
+            cursor.execute(
+                f"UPDATE {STAGING} s SET error = %s WHERE s.error IS NULL AND ({condicion})",
+                [mensaje],
+            )
+
+        # Series repetidas dentro del archivo: se queda la primera aparición
+        cursor.execute(
+            f"""
+            WITH d AS (
+              SELECT linea, row_number() OVER (PARTITION BY serie ORDER BY linea) AS n
+              FROM {STAGING}
+              WHERE error IS NULL AND coalesce(serie, '') <> ''
+            )
+            UPDATE {STAGING} s SET error = %s FROM d WHERE d.linea = s.linea AND d.n > 1
+            """,
+            ["Serie duplicada en el archivo."],
+        )
+        avisar("validadas", resultado.leidas)
+
+        # 3) INSERT ... SELECT
+        cursor.execute(
+            f"""
+            INSERT INTO {Articulo._meta.db_table} (
+              producto_id, serie, etiqueta_interna, condicion, grado, accesorios,
+              ubicacion_id, estado, observaciones, created_by_id, created_at, version
+            )
+            SELECT p.id, nullif(s.serie, ''), s.etiqueta_interna, s.condicion, s.grado, s.accesorios,
+                   u.id, coalesce(nullif(s.estado, ''), %s), s.observaciones, %s, now(), 0
+            FROM {STAGING} s
+            JOIN {Producto._meta.db_table} p ON p.sku = s.sku
+            LEFT JOIN {Ubicacion._meta.db_table} u ON u.nombre = nullif(s.ubicacion, '')
+            WHERE s.error IS NULL
+            ORDER BY s.linea
+            """,
+            [ArticuloEstado.DISPONIBLE, created_by_id],
+        )
+        resultado.insertadas = cursor.rowcount
+        avisar("insertadas", resultado.insertadas)
+
+        cursor.execute(f"SELECT linea, sku, serie, error FROM {STAGING} WHERE error IS NOT NULL ORDER BY linea")
+        resultado.rechazadas = [tuple(r) for r in cursor.fetchall()]
+
+    return resultado
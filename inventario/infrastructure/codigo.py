@@ -8,6 +8,29 @@ def next_codigo_num() -> int:
         (val,) = cursor.fetchone()
         return int(val)
 
+def next_codigo_nums(n: int) -> list[int]:
+    """
+    Reserva n valores de la secuencia en un solo round trip.
+    Únicos siempre; contiguos mientras nadie más inserte al mismo tiempo.
+    """
+    if n <= 0:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT nextval('{SEQ_NAME}') FROM generate_series(1, %s)", [n])
+        return sorted(int(val) for (val,) in cursor.fetchall())
+
 def format_codigo(n: int) -> str:
     # SIS001, SIS002... cuando crezca será SIS1000 etc.
     return f"SIS{str(n).zfill(3)}"
+
+def reservar_codigos(n: int) -> list[str]:
+    return [format_codigo(v) for v in next_codigo_nums(n)]
+
+def asignar_codigos(items) -> None:
+    """
+    Llena codigo en los items que no lo traen (igual criterio que el trigger: vacío = sin código).
+    Pensado para bulk_create: el trigger ya no tiene nada que hacer en esas filas.
+    """
+    pendientes = [it for it in items if not (it.codigo or "").strip()]
+    for it, codigo in zip(pendientes, reservar_codigos(len(pendientes))):
+        it.codigo = codigo
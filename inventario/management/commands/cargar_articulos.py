@@ -0,0 +1,60 @@
+import csv
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.application.importacion import ArchivoInvalido, leer_filas
+from inventario.infrastructure.carga_copy import cargar_articulos
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga masiva de artículos (migración de sistema legado) vía COPY a staging, "
+        "validación por conjunto e INSERT ... SELECT."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "archivo",
+            help="CSV o XLSX con encabezados: sku, serie, etiqueta_interna, condicion, grado, "
+            "accesorios, ubicacion, estado, observaciones.",
+        )
+        parser.add_argument("--usuario", default="", help="username para created_by (opcional).")
+        parser.add_argument(
+            "--rechazos",
+            default="",
+            help="Ruta del CSV de rechazos (default: <archivo>.rechazos.csv si hay rechazos).",
+        )
+
+    def handle(self, *args, **options):
+        ruta = Path(options["archivo"])
+        if not ruta.exists():
+            raise CommandError(f"No existe: {ruta}")
+
+        created_by_id = None
+        if options["usuario"]:
+            try:
+                created_by_id = get_user_model().objects.get(username=options["usuario"]).pk
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"Usuario no encontrado: {options['usuario']}")
+
+        def progreso(etapa: str, n: int):
+            self.stdout.write(f"  {etapa}: {n}")
+
+        with ruta.open("rb") as f:
+            try:
+                filas = leer_filas(f, ruta.name)
+            except ArchivoInvalido as e:
+                raise CommandError(f"{ruta}: {e}")
+            resultado = cargar_articulos(filas, created_by_id=created_by_id, progreso=progreso)
+
+        self.stdout.write(self.style.SUCCESS(f"Leídas: {resultado.leidas} · Insertadas: {resultado.insertadas}"))
+
+        if resultado.rechazadas:
+            destino = Path(options["rechazos"] or f"{ruta}.rechazos.csv")
+            with destino.open("w", encoding="utf-8", newline="") as out:
+                writer = csv.writer(out)
+                writer.writerow(["linea", "sku", "serie", "error"])
+                writer.writerows(resultado.rechazadas)
+            self.stdout.write(self.style.WARNING(f"Rechazadas: {len(resultado.rechazadas)} -> {destino}"))
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.application.importacion import (
+    ArchivoInvalido,
+    escribir_reporte_errores,
+    importar_items,
+    leer_filas,
+)
+
+
+class Command(BaseCommand):
+    help = "Importa items de inventario desde XLSX o CSV (streaming + bulk_create por lotes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta al .xlsx o .csv (primera fila = encabezados).")
+        parser.add_argument(
+            "--errores",
+            default="",
+            help="Ruta del CSV de errores (default: <archivo>.errores.csv si hay errores).",
+        )
+        parser.add_argument("--lote", type=int, default=2000, help="Filas por bulk_create (default: 2000).")
+
+    def handle(self, *args, **options):
+        ruta = Path(options["archivo"])
+        if not ruta.exists():
+            raise CommandError(f"No existe: {ruta}")
+
+        with ruta.open("rb") as f:
+            try:
+                filas = leer_filas(f, ruta.name)
+            except ArchivoInvalido as e:
+                raise CommandError(f"{ruta}: {e}")
+            resultado = importar_items(filas, lote=options["lote"])
+
+        self.stdout.write(self.style.SUCCESS(f"Items creados: {resultado.creados}"))
+
+        if resultado.errores:
+            destino = Path(options["errores"] or f"{ruta}.errores.csv")
+            with destino.open("w", encoding="utf-8", newline="") as out:
+                escribir_reporte_errores(resultado.errores, out)
+            self.stdout.write(self.style.WARNING(f"Filas con error: {len(resultado.errores)} -> {destino}"))
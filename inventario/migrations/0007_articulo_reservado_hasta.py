@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-18 23:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0006_remove_articulo_uniq_articulo_serie_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articulo',
+            name='reservado_hasta',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(condition=models.Q(('estado', 'RESERVADO')), fields=['reservado_hasta'], name='articulo_reserva_vence_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 23:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0007_articulo_reservado_hasta'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articulo',
+            index=models.Index(fields=['producto', 'estado'], name='articulo_producto_estado_idx'),
+        ),
+    ]
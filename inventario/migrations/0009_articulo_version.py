@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0008_articulo_producto_estado_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articulo',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# lpad() TRUNCA si el texto es más largo que el ancho: nextval=1000 daba 'SIS100'
+# (choca con el 100). Se alinea con format_codigo(): mínimo 3 dígitos, sin truncar.
+SQL = """
+CREATE OR REPLACE FUNCTION inventario_set_codigo_sis()
+RETURNS trigger AS $$
+DECLARE
+  n text;
+BEGIN
+  IF NEW.codigo IS NULL OR btrim(NEW.codigo) = '' THEN
+    n := nextval('inventario_item_codigo_seq')::text;
+    NEW.codigo := 'SIS' || CASE WHEN length(n) < 3 THEN lpad(n, 3, '0') ELSE n END;
+  END IF;
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+REVERSE_SQL = """
+CREATE OR REPLACE FUNCTION inventario_set_codigo_sis()
+RETURNS trigger AS $$
+BEGIN
+  IF NEW.codigo IS NULL OR btrim(NEW.codigo) = '' THEN
+    NEW.codigo := 'SIS' || lpad(nextval('inventario_item_codigo_seq')::text, 3, '0');
+  END IF;
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventario", "0009_articulo_version"),
+    ]
+
+    operations = [
+        migrations.RunSQL(SQL, reverse_sql=REVERSE_SQL),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0011_alter_inventarioitem_codigo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventarioitem',
+            index=models.Index(fields=['-fecha_alta', 'codigo'], name='item_fecha_alta_codigo_idx'),
+        ),
+    ]
@@ -1,3 +1,592 @@
-from django.test import TestCase
+from __future__ import annotations
 
-# Create your tests here.
+import json
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from rest_framework.renderers import JSONRenderer
+
+from core.infrastructure import planes
+from core.infrastructure.dataset import GeneradorDataset, Volumenes
+from core.middleware import presupuesto_de
+from inventario.models import Articulo, ArticuloEstado, Categoria, InventarioItem, MotivoBaja, Producto, Ubicacion
+from inventario.api.serializers import InventarioItemSerializer
+from inventario.application.baja import dar_de_baja_lote, items_por_codigos
+from inventario.application.importacion import ArchivoInvalido, importar_items, leer_filas
+from inventario.application.recepcion import parsear_series, recibir_articulos
+from inventario.infrastructure import codigo
+from inventario.web_views import GROUP_EDITOR, GROUP_VIEWER
+from ventas.application.services import asignar_unidades, liberar_reservas_vencidas
+from ventas.models import Cliente, Venta, VentaDetalle
+
+# Tablas donde un Seq Scan con filtro (o bajo un LIMIT) es regresión
+TABLAS_GRANDES = (
+    InventarioItem._meta.db_table,
+    Articulo._meta.db_table,
+    Venta._meta.db_table,
+    VentaDetalle._meta.db_table,
+)
+
+# Suficiente para que el planner prefiera índices (con tablas chicas todo es Seq Scan)
+VOLUMENES = Volumenes(
+    items=30_000,
+    productos=200,
+    articulos=30_000,
+    clientes=500,
+    ventas=3_000,
+    ubicaciones=50,
+    con_foto=0.0,
+)
+
+
+@tag("planes")
+@override_settings(
+    CONSULTAS_LENTAS_ACTIVO=False,
+    PERFILADO_ACTIVO=False,
+    PRESUPUESTO_QUERIES_ACTIVO=False,
+)
+class PlanesConsultaTests(TestCase):
+    """
+    Endpoints calientes sobre un dataset generado (con ANALYZE):
+    - queries <= presupuesto de la vista (@presupuesto_queries)
+    - sin formas de SQL repetidas (N+1)
+    - EXPLAIN de cada SELECT sin Seq Scan "malo" en tablas grandes (ver planes.seq_scans)
+
+    Filtros de baja selectividad (estado, activo), la búsqueda por icontains y las
+    páginas profundas (OFFSET grande) quedan fuera del chequeo de planes: ahí el plan
+    depende de estimaciones de costo y recorrer la tabla puede ser lo correcto.
+    Generan ~60k filas: `manage.py test` no los corre (core.test_runner); se piden con
+    `manage.py test --tag planes`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = get_user_model().objects.create_user("planes", password="x", is_staff=True)
+        cls.usuario.groups.add(Group.objects.get_or_create(name=GROUP_VIEWER)[0])
+
+        # Catálogos con suficientes valores para que cada filtro sea selectivo (~2-3%)
+        Categoria.objects.bulk_create([Categoria(nombre=f"Categoría {n:02d}") for n in range(40)])
+        MotivoBaja.objects.bulk_create([MotivoBaja(nombre=f"Motivo {n:02d}") for n in range(10)])
+        GeneradorDataset(VOLUMENES, cls.usuario, prefijo="PLAN").generar()
+
+        cls.categoria = Categoria.objects.order_by("id").values_list("id", flat=True).first()
+        cls.ubicacion = Ubicacion.objects.order_by("id").values_list("id", flat=True).first()
+        cls.motivo = MotivoBaja.objects.order_by("id").values_list("id", flat=True).first()
+
+    def setUp(self):
+        self.client.force_login(self.usuario)
+
+    # ----------------------------
+    # Helpers
+    # ----------------------------
+    def assertSinSeqScans(self, captura: planes.Captura):
+        problemas = planes.revisar(captura, TABLAS_GRANDES)
+        self.assertEqual(problemas, [], "\n".join(problemas))
+
+    def assertEndpoint(self, url: str, *, plan: bool = True):
+        captura = planes.capturar(lambda: self.assertEqual(self.client.get(url, secure=True).status_code, 200, url))
+
+        maximo = presupuesto_de(resolve(url.split("?")[0]).func)
+        self.assertIsNotNone(maximo, f"{url}: la vista no declara @presupuesto_queries")
+        self.assertLessEqual(captura.total, maximo, f"{url}: {captura.total} queries, presupuesto {maximo}")
+
+        repetidas = captura.repetidas(settings.PRESUPUESTO_QUERIES_REPETIDAS)
+        self.assertEqual(repetidas, [], f"{url}: posible N+1")
+
+        if plan:
+            self.assertSinSeqScans(captura)
+
+    # ----------------------------
+    # Endpoints
+    # ----------------------------
+    def test_api_items(self):
+        for url in (
+            "/api/items/",
+            f"/api/items/?categoria={self.categoria}",
+            f"/api/items/?ubicacion={self.ubicacion}",
+            f"/api/items/?categoria={self.categoria}&ubicacion={self.ubicacion}",
+            f"/api/items/?motivo_baja={self.motivo}",
+            "/api/items/?ordering=codigo",
+        ):
+            with self.subTest(url=url):
+                self.assertEndpoint(url)
+
+    def test_item_list(self):
+        for url in (
+            "/inventario/",
+            "/inventario/?page=3",
+            f"/inventario/?categoria={self.categoria}",
+            f"/inventario/?ubicacion={self.ubicacion}",
+        ):
+            with self.subTest(url=url):
+                self.assertEndpoint(url)
+
+    def test_busqueda_y_filtros_poco_selectivos(self):
+        pagina_media = VOLUMENES.items // settings.REST_FRAMEWORK.get("PAGE_SIZE", 20) // 2
+        for url in (
+            "/api/items/?search=dell",
+            "/inventario/?q=dell",
+            "/inventario/?estado=BAJA",
+            f"/api/items/?page={pagina_media}",
+        ):
+            with self.subTest(url=url):
+                # Solo presupuesto y N+1: recorrer la tabla puede ser lo correcto (o el plan depende del costo)
+                self.assertEndpoint(url, plan=False)
+
+    # ----------------------------
+    # Artículos (POS y barrido de reservas)
+    # ----------------------------
+    def test_asignar_unidades(self):
+        producto = Producto.objects.filter(articulos__estado=ArticuloEstado.DISPONIBLE).order_by("id").first()
+        venta = Venta.objects.create(cliente=Cliente.objects.order_by("id").first(), vendedor=self.usuario)
+
+        captura = planes.capturar(lambda: asignar_unidades(venta, producto, 2))
+        self.assertSinSeqScans(captura)
+
+    def test_liberar_reservas_vencidas(self):
+        captura = planes.capturar(lambda: liberar_reservas_vencidas(ahora=timezone.now() + timedelta(days=1)))
+        self.assertSinSeqScans(captura)
+
+
+# ----------------------------
+# Importación (CSV/XLSX)
+# ----------------------------
+class ImportacionTests(TestCase):
+    ENCABEZADO = "categoria;ubicacion;marca;modelo;observaciones\r\n"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = get_user_model().objects.create_user("importa", password="x")
+        cls.usuario.groups.add(Group.objects.get_or_create(name=GROUP_EDITOR)[0])
+        Categoria.objects.create(nombre="Cómputo")
+        Ubicacion.objects.create(nombre="Almacén")
+
+    def _archivo(self, texto: str, codificacion: str, nombre: str = "items.csv") -> SimpleUploadedFile:
+        return SimpleUploadedFile(nombre, texto.encode(codificacion), content_type="text/csv")
+
+    def test_csv_cp1252_con_punto_y_coma(self):
+        # Así lo guarda Excel en es-MX: cp1252 y separador ';'
+        texto = self.ENCABEZADO + "Cómputo;Almacén;Dell;Latitude;Año 2020, señal débil\r\n"
+        resultado = importar_items(leer_filas(self._archivo(texto, "cp1252"), "items.csv"))
+
+        self.assertEqual((resultado.creados, resultado.errores), (1, []))
+        item = InventarioItem.objects.get()
+        self.assertEqual(item.categoria.nombre, "Cómputo")
+        self.assertEqual(item.observaciones, "Año 2020, señal débil")
+
+    def test_csv_utf8_con_bom_y_comas(self):
+        texto = "﻿categoria,ubicacion,marca\r\nCómputo,Almacén,HP\r\n"
+        filas = list(leer_filas(self._archivo(texto, "utf-8"), "items.csv"))
+        self.assertEqual(filas, [(2, {"categoria": "Cómputo", "ubicacion": "Almacén", "marca": "HP"})])
+
+    def test_archivo_invalido_antes_de_guardar(self):
+        for archivo, nombre in (
+            (SimpleUploadedFile("items.xlsx", b"no es un zip"), "items.xlsx"),
+            # csv.Error: campo más grande que csv.field_size_limit()
+            (self._archivo(self.ENCABEZADO + "Cómputo;Almacén;" + "x" * 200_000 + "\r\n", "utf-8"), "items.csv"),
+        ):
+            with self.subTest(nombre=nombre), self.assertRaises(ArchivoInvalido):
+                leer_filas(archivo, nombre)
+
+    def test_vista_archivo_invalido_es_error_del_form(self):
+        self.client.force_login(self.usuario)
+        response = self.client.post(
+            reverse("inventario_ui:item_import"),
+            {"archivo": SimpleUploadedFile("items.xlsx", b"no es un zip")},
+            secure=True,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("archivo", response.context["form"].errors)
+        self.assertFalse(InventarioItem.objects.exists())
+
+    def test_vista_con_errores_muestra_resumen_y_reporte(self):
+        self.client.force_login(self.usuario)
+        texto = self.ENCABEZADO + "Cómputo;Almacén;Dell;X\r\nNo existe;Almacén;HP;Y\r\n"
+        response = self.client.post(
+            reverse("inventario_ui:item_import"), {"archivo": self._archivo(texto, "cp1252")}, secure=True
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["resultado"].creados, 1)
+        self.assertEqual([e.fila for e in response.context["errores_muestra"]], [3])
+        self.assertContains(response, reverse("inventario_ui:item_import_errores"))
+        self.assertEqual(list(messages.get_messages(response.wsgi_request)), [])
+
+        reporte = self.client.get(reverse("inventario_ui:item_import_errores"), secure=True)
+        self.assertEqual(reporte["Content-Type"], "text/csv; charset=utf-8")
+        lineas = reporte.content.decode().splitlines()
+        self.assertEqual(lineas[0].split(",")[0], "fila")
+        self.assertTrue(lineas[1].startswith("3,No existe,"))
+
+
+# ----------------------------
+# API de items: lecturas por values() (ListadoRapido)
+# ----------------------------
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix="inventario-tests-"))
+class ListadoRapidoTests(TestCase):
+    """El camino rápido (list/retrieve con fields/expand) da el mismo JSON que InventarioItemSerializer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        categoria = Categoria.objects.create(nombre="Laptops")
+        ubicacion = Ubicacion.objects.create(nombre="Bodega")
+        motivo = MotivoBaja.objects.create(nombre="Obsoleto")
+        cls.completo = InventarioItem.objects.create(
+            categoria=categoria,
+            ubicacion=ubicacion,
+            marca="Dell",
+            foto=SimpleUploadedFile("foto.png", b"png"),
+            precio_sugerido_venta=Decimal("1234.50"),
+            estado=InventarioItem.Estado.BAJA,
+            fecha_baja=timezone.localdate(),
+            motivo_baja=motivo,
+        )
+        # Sin foto, sin precio, sin motivo_baja (FK en NULL)
+        cls.vacio = InventarioItem.objects.create(categoria=categoria, ubicacion=ubicacion)
+
+    def _esperado(self, response, item=None) -> list[dict] | dict:
+        """InventarioItemSerializer, con el mismo request y ya como JSON."""
+        qs = InventarioItem.objects.order_by("-fecha_alta", "codigo")
+        data = InventarioItemSerializer(
+            item if item is not None else qs, many=item is None, context={"request": response.wsgi_request}
+        ).data
+        return json.loads(JSONRenderer().render(data))
+
+    @staticmethod
+    def _recortar(fila: dict, campos, expandir) -> dict:
+        modelos = {"categoria": Categoria, "ubicacion": Ubicacion, "motivo_baja": MotivoBaja}
+        pedidos = set(fila if campos is None else campos) | set(expandir)
+        fila = {k: v for k, v in fila.items() if k in pedidos}
+        for nombre in expandir:
+            pk = fila[nombre]
+            fila[nombre] = None if pk is None else {"id": pk, "nombre": modelos[nombre].objects.get(pk=pk).nombre}
+        return fila
+
+    def test_list_igual_al_serializer(self):
+        response = self.client.get("/api/items/", secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], self._esperado(response))
+        self.assertIsNotNone(response.json()["results"][0]["foto"])
+
+    def test_fields_y_expand(self):
+        combinaciones = [
+            (campos, expandir)
+            for campos in (None, ["codigo"], ["codigo", "foto", "precio_sugerido_venta", "motivo_baja"])
+            for expandir in ([], ["categoria"], ["motivo_baja"], ["categoria", "ubicacion", "motivo_baja"])
+        ]
+        for campos, expandir in combinaciones:
+            params = {}
+            if campos is not None:
+                params["fields"] = ",".join(campos)
+            if expandir:
+                params["expand"] = ",".join(expandir)
+            with self.subTest(fields=campos, expand=expandir):
+                response = self.client.get("/api/items/", params, secure=True)
+                self.assertEqual(response.status_code, 200)
+                esperado = [self._recortar(f, campos, expandir) for f in self._esperado(response)]
+                self.assertEqual(response.json()["results"], esperado)
+
+                for item in (self.completo, self.vacio):
+                    response = self.client.get(f"/api/items/{item.pk}/", params, secure=True)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.json(), self._recortar(self._esperado(response, item), campos, expandir))
+
+    def test_campos_desconocidos(self):
+        response = self.client.get("/api/items/", {"fields": "codigo,nope", "expand": "marca"}, secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"fields", "expand"})
+
+
+# ----------------------------
+# API de items: alta/edición en lote (POST/PATCH /api/items/bulk/)
+# ----------------------------
+class BulkItemsTests(TestCase):
+    URL = "/api/items/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = get_user_model().objects.create_user("bulk", password="x")
+        cls.categoria = Categoria.objects.create(nombre="Monitores")
+        cls.ubicacion = Ubicacion.objects.create(nombre="Piso 1")
+        cls.motivo = MotivoBaja.objects.create(nombre="Dañado")
+
+    def setUp(self):
+        self.client.force_login(self.usuario)
+
+    def _enviar(self, metodo: str, filas):
+        return getattr(self.client, metodo)(self.URL, filas, content_type="application/json", secure=True)
+
+    def _item(self, **kwargs) -> InventarioItem:
+        return InventarioItem.objects.create(categoria=self.categoria, ubicacion=self.ubicacion, **kwargs)
+
+    def test_post_todas_validas(self):
+        base = {"categoria": self.categoria.pk, "ubicacion": self.ubicacion.pk}
+        response = self._enviar("post", [{**base, "marca": "LG"}, {**base, "marca": "Samsung"}])
+        self.assertEqual(response.status_code, 201)
+        resultados = response.json()["resultados"]
+        self.assertEqual([r["ok"] for r in resultados], [True, True])
+        creados = dict(InventarioItem.objects.values_list("codigo", "marca"))
+        self.assertEqual({creados[r["codigo"]] for r in resultados}, {"LG", "Samsung"})
+
+    def test_post_mezcla_207(self):
+        filas = [
+            {"categoria": self.categoria.pk, "ubicacion": self.ubicacion.pk, "marca": "LG"},
+            "no soy un objeto",
+            {"categoria": 999_999, "ubicacion": self.ubicacion.pk},
+            {"ubicacion": self.ubicacion.pk, "estado": "NOPE"},
+        ]
+        response = self._enviar("post", filas)
+        self.assertEqual(response.status_code, 207)
+        cuerpo = response.json()
+        self.assertEqual((cuerpo["ok"], cuerpo["fallidas"]), (1, 3))
+
+        ok, no_objeto, fk, varios = cuerpo["resultados"]
+        self.assertEqual(InventarioItem.objects.get(pk=ok["id"]).codigo, ok["codigo"])
+        self.assertEqual(no_objeto["errores"], {"non_field_errors": ["Se esperaba un objeto."]})
+        self.assertEqual(fk["errores"], {"categoria": ["No existe el id 999999."]})
+        self.assertEqual(set(varios["errores"]), {"categoria", "estado"})
+        self.assertEqual([r["indice"] for r in cuerpo["resultados"]], [0, 1, 2, 3])
+        self.assertEqual(InventarioItem.objects.count(), 1)
+
+    def test_post_ninguna_valida_400(self):
+        response = self._enviar("post", [{"marca": "sin catálogos"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(InventarioItem.objects.exists())
+
+    def test_cuerpo_invalido_y_max_filas(self):
+        for cuerpo in ({}, [], "x"):
+            with self.subTest(cuerpo=cuerpo):
+                self.assertEqual(self._enviar("post", cuerpo).status_code, 400)
+        with mock.patch("inventario.api.viewsets.MAX_FILAS", 2):
+            response = self._enviar("post", [{}, {}, {}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("2", response.json()["detail"])
+
+    def test_patch_mezcla_207(self):
+        a, b = self._item(marca="A"), self._item(marca="B")
+        filas = [
+            # Baja: clean() pone activo=False y el lote amplía el bulk_update a CAMPOS_BAJA
+            {"id": a.pk, "estado": "BAJA", "motivo_baja": self.motivo.pk, "fecha_baja": str(timezone.localdate())},
+            {"id": b.pk, "marca": "B2"},
+            {"id": a.pk, "marca": "repetido"},
+            {"id": 999_999, "marca": "no existe"},
+            {"marca": "sin id"},
+            {"id": b.pk, "motivo_baja": 999_999},
+        ]
+        response = self._enviar("patch", filas)
+        self.assertEqual(response.status_code, 207)
+        errores = [r["errores"] for r in response.json()["resultados"]]
+        self.assertEqual(
+            errores,
+            [
+                {},
+                {},
+                {"id": ["Repetido en el lote."]},
+                {"id": ["No existe."]},
+                {"id": ["Requerido (entero)."]},
+                {"id": ["Repetido en el lote."]},
+            ],
+        )
+
+        a.refresh_from_db()
+        b.refresh_from_db()
+        self.assertEqual(
+            (a.estado, a.activo, a.motivo_baja_id, a.fecha_baja, a.marca),
+            (InventarioItem.Estado.BAJA, False, self.motivo.pk, timezone.localdate(), "A"),
+        )
+        self.assertEqual((b.marca, b.activo, b.motivo_baja_id), ("B2", True, None))
+
+    def test_patch_fk_desconocida(self):
+        item = self._item()
+        response = self._enviar("patch", [{"id": item.pk, "ubicacion": 999_999}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["resultados"][0]["errores"], {"ubicacion": ["No existe el id 999999."]})
+        item.refresh_from_db()
+        self.assertEqual(item.ubicacion_id, self.ubicacion.pk)
+
+
+class BajaMasivaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categoria = Categoria.objects.create(nombre="Laptops")
+        cls.ubicacion = Ubicacion.objects.create(nombre="Bodega")
+        cls.motivo = MotivoBaja.objects.create(nombre="Obsoleto")
+        cls.hoy = timezone.localdate()
+
+    def _item(self, **kwargs) -> InventarioItem:
+        return InventarioItem.objects.create(categoria=self.categoria, ubicacion=self.ubicacion, **kwargs)
+
+    def test_escribe_estado_activo_fecha_y_motivo(self):
+        items = [self._item(marca="A"), self._item(marca="B")]
+        resultado = dar_de_baja_lote(
+            InventarioItem.objects.filter(pk__in=[i.pk for i in items]),
+            estado=InventarioItem.Estado.DESECHO,
+            motivo_baja=self.motivo,
+        )
+        self.assertEqual((resultado.actualizados, resultado.rechazados), (2, []))
+        self.assertEqual(
+            set(InventarioItem.objects.values_list("estado", "activo", "fecha_baja", "motivo_baja")),
+            {(InventarioItem.Estado.DESECHO, False, self.hoy, self.motivo.pk)},
+        )
+
+    def test_rechaza_alta_posterior_y_ya_en_el_estado(self):
+        valido = self._item(marca="ok")
+        posterior = self._item(marca="alta futura")
+        InventarioItem.objects.filter(pk=posterior.pk).update(fecha_alta=self.hoy + timedelta(days=3))
+        ya_baja = self._item(marca="ya en baja")
+        InventarioItem.objects.filter(pk=ya_baja.pk).update(
+            estado=InventarioItem.Estado.BAJA, activo=False, fecha_baja=self.hoy - timedelta(days=10)
+        )
+
+        resultado = dar_de_baja_lote(
+            InventarioItem.objects.all(),
+            estado=InventarioItem.Estado.BAJA,
+            motivo_baja=self.motivo,
+            fecha_baja=self.hoy + timedelta(days=1),
+        )
+
+        self.assertEqual(resultado.actualizados, 1)
+        motivos = {r.id: r.motivo for r in resultado.rechazados}
+        self.assertEqual(set(motivos), {posterior.pk, ya_baja.pk})
+        self.assertIn("anterior al alta", motivos[posterior.pk])
+        self.assertIn("Ya está en", motivos[ya_baja.pk])
+        self.assertEqual([r.codigo for r in resultado.rechazados], sorted(r.codigo for r in resultado.rechazados))
+
+        filas = {
+            pk: fila
+            for pk, *fila in InventarioItem.objects.values_list("pk", "estado", "activo", "fecha_baja", "motivo_baja")
+        }
+        manana = self.hoy + timedelta(days=1)
+        self.assertEqual(filas[valido.pk], [InventarioItem.Estado.BAJA, False, manana, self.motivo.pk])
+        self.assertEqual(filas[posterior.pk], [InventarioItem.Estado.ALMACEN, True, None, None])
+        # El que ya estaba en BAJA conserva su fecha y motivo originales
+        self.assertEqual(filas[ya_baja.pk], [InventarioItem.Estado.BAJA, False, self.hoy - timedelta(days=10), None])
+
+    def test_estado_y_motivo_obligatorios(self):
+        item = self._item()
+        with self.assertRaises(ValidationError) as ctx:
+            dar_de_baja_lote(InventarioItem.objects.all(), estado=InventarioItem.Estado.ALMACEN, motivo_baja=None)
+        self.assertEqual(set(ctx.exception.message_dict), {"estado", "motivo_baja"})
+        item.refresh_from_db()
+        self.assertTrue(item.activo)
+
+    def test_por_codigos_reporta_no_encontrados(self):
+        item = self._item()
+        items, faltantes = items_por_codigos([item.codigo, "NO-EXISTE", item.codigo, "NO-EXISTE"])
+        self.assertEqual(list(items), [item])
+        self.assertEqual(faltantes, ["NO-EXISTE"])
+
+
+class CodigoEnBloqueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categoria = Categoria.objects.create(nombre="Impresoras")
+        cls.ubicacion = Ubicacion.objects.create(nombre="Almacén")
+
+    def _nuevo(self, **kwargs) -> InventarioItem:
+        return InventarioItem(categoria=self.categoria, ubicacion=self.ubicacion, **kwargs)
+
+    def test_bulk_create_asigna_el_bloque_en_un_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            items = InventarioItem.objects.bulk_create([self._nuevo(), self._nuevo(codigo="MANUAL-1"), self._nuevo()])
+        # nextval(generate_series) + INSERT
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+        self.assertEqual(items[1].codigo, "MANUAL-1")
+        numeros = [int(i.codigo.removeprefix("SIS")) for i in (items[0], items[2])]
+        self.assertEqual(numeros[1], numeros[0] + 1)
+        en_bd = dict(InventarioItem.objects.values_list("pk", "codigo"))
+        self.assertEqual([en_bd[i.pk] for i in items], [i.codigo for i in items])
+
+    def test_trigger_no_trunca_desde_mil(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT setval('{codigo.SEQ_NAME}', 999)")
+        item = self._nuevo()
+        item.save()
+        # Antes lpad(n, 3) daba SIS100 y chocaba con el 100
+        self.assertEqual(item.codigo, "SIS1000")
+        self.assertEqual(item.codigo, codigo.format_codigo(1000))
+        self.assertEqual(codigo.reservar_codigos(0), [])
+
+
+class RecepcionArticulosTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = get_user_model().objects.create_user("recepcion", password="x")
+        cls.usuario.groups.add(Group.objects.get_or_create(name=GROUP_EDITOR)[0])
+        cls.producto = Producto.objects.create(sku="REC-1", nombre="Recepción", precio_venta=Decimal("20.00"))
+        cls.ubicacion = Ubicacion.objects.create(nombre="Andén")
+        Articulo.objects.create(producto=cls.producto, serie="YA-1")
+
+    def _series(self) -> set[str]:
+        return set(Articulo.objects.filter(producto=self.producto).values_list("serie", flat=True))
+
+    def test_parsear_series(self):
+        self.assertEqual(parsear_series(" A1\r\nA2,A3;\tA4\n\n"), ["A1", "A2", "A3", "A4"])
+
+    def test_alta_con_omitir_duplicadas(self):
+        resultado = recibir_articulos(
+            self.producto,
+            ["N-1", "N-2", "N-1", "YA-1", "N-3"],
+            ubicacion=self.ubicacion,
+            grado="A",
+            created_by=self.usuario,
+            omitir_duplicadas=True,
+        )
+        self.assertEqual([a.serie for a in resultado.creados], ["N-1", "N-2", "N-3"])
+        self.assertEqual((resultado.repetidas, resultado.existentes), (["N-1"], ["YA-1"]))
+        self.assertEqual(self._series(), {"YA-1", "N-1", "N-2", "N-3"})
+        nuevos = Articulo.objects.filter(serie__startswith="N-")
+        self.assertEqual(
+            set(nuevos.values_list("estado", "grado", "ubicacion", "created_by")),
+            {(ArticuloEstado.DISPONIBLE, "A", self.ubicacion.pk, self.usuario.pk)},
+        )
+
+    def test_duplicadas_sin_omitir_no_da_de_alta_nada(self):
+        with self.assertRaises(ValidationError) as ctx:
+            recibir_articulos(self.producto, ["N-1", "N-1", "YA-1"])
+        errores = ctx.exception.message_dict["series"]
+        self.assertEqual(errores, ["Repetidas en la lista: N-1", "Ya existen en inventario: YA-1"])
+        self.assertEqual(self._series(), {"YA-1"})
+
+    def test_carrera_con_otra_captura(self):
+        # Otra recepción metió la serie entre el query de duplicados y el INSERT
+        with mock.patch.object(Articulo.objects, "bulk_create", side_effect=IntegrityError), self.assertRaises(
+            ValidationError
+        ) as ctx:
+            recibir_articulos(self.producto, ["N-1"])
+        self.assertIn("al mismo tiempo", ctx.exception.message_dict["series"][0])
+
+    def test_vista_reporta_conflictos_en_el_form(self):
+        self.client.force_login(self.usuario)
+        url = reverse("inventario_ui:articulo_recepcion")
+        datos = {"producto": self.producto.pk, "series": "N-1\nYA-1\nN-1"}
+
+        response = self.client.post(url, datos, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["form"].errors["series"],
+            ["Repetidas en la lista: N-1", "Ya existen en inventario: YA-1"],
+        )
+        self.assertEqual(self._series(), {"YA-1"})
+
+        response = self.client.post(url, {**datos, "omitir_duplicadas": "on"}, secure=True)
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        self.assertEqual(
+            [m.message for m in self.client.get(url, secure=True).context["messages"]],
+            ["✅ Recibidas 1 unidades de REC-1.", "⚠️ Omitidas 2 series duplicadas: N-1, YA-1"],
+        )
+        self.assertEqual(self._series(), {"YA-1", "N-1"})
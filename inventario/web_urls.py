@@ -6,7 +6,11 @@ app_name = "inventario_ui"
 urlpatterns = [
     path("", web_views.item_list, name="item_list"),
     path("items/nuevo/", web_views.item_create, name="item_create"),
+    path("items/importar/", web_views.item_import, name="item_import"),
+    path("items/importar/errores.csv", web_views.item_import_errores, name="item_import_errores"),
+    path("articulos/recepcion/", web_views.articulo_recepcion, name="articulo_recepcion"),
     path("items/<int:pk>/", web_views.item_detail, name="item_detail"),
     path("items/<int:pk>/editar/", web_views.item_update, name="item_update"),
     path("items/<int:pk>/baja/", web_views.item_baja, name="item_baja"),
+    path("items/baja-masiva/", web_views.item_baja_masiva, name="item_baja_masiva"),
 ]
@@ -1,12 +1,26 @@
+import io
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db.models import Q
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
-from .forms import InventarioBajaForm, InventarioItemForm
+from core.middleware import presupuesto_queries
+
+from .application.baja import dar_de_baja_lote, items_por_codigos
+from .application.importacion import ArchivoInvalido, escribir_reporte_errores, importar_items, leer_filas
+from .application.recepcion import parsear_series, recibir_articulos
+from .forms import (
+    BajaMasivaForm,
+    InventarioBajaForm,
+    InventarioImportForm,
+    InventarioItemForm,
+    RecepcionArticulosForm,
+)
 from .models import Categoria, InventarioItem, Ubicacion
 
 LOGIN_URL = "/login/"
@@ -16,6 +30,10 @@ GROUP_VIEWER = "INVENTARIO_VIEWER"
 GROUP_EDITOR = "INVENTARIO_EDITOR"
 GROUP_ADMIN = "INVENTARIO_ADMIN"
 
+# Importación con errores: reporte CSV en la sesión (descarga) y cuántas filas se muestran en la página
+SESSION_REPORTE_IMPORTACION = "inventario_importacion_errores"
+MUESTRA_ERRORES_IMPORTACION = 20
+
 
 def has_any_group(user, groups: tuple[str, ...]) -> bool:
     if not user.is_authenticated:
@@ -37,18 +55,15 @@ def require_any(*groups: str):
 
 
 # -----------------------------
-# Listado: VIEWER (o superior)
+# Filtros del listado (también los usa la baja masiva)
 # -----------------------------
-@require_any(GROUP_VIEWER, GROUP_EDITOR, GROUP_ADMIN)
-def item_list(request):
-    qs = InventarioItem.objects.select_related("categoria", "ubicacion", "motivo_baja").all()
-
-    # Filtros
-    search = request.GET.get("q", "").strip()
-    categoria_id = request.GET.get("categoria", "").strip()
-    ubicacion_id = request.GET.get("ubicacion", "").strip()
-    estado = request.GET.get("estado", "").strip()
-    activo = request.GET.get("activo", "").strip()
+def filtrar_items(qs, params) -> tuple:
+    """Aplica q/categoria/ubicacion/estado/activo de `params` (GET). Regresa (qs, filtros)."""
+    search = params.get("q", "").strip()
+    categoria_id = params.get("categoria", "").strip()
+    ubicacion_id = params.get("ubicacion", "").strip()
+    estado = params.get("estado", "").strip()
+    activo = params.get("activo", "").strip()
 
     if search:
         qs = qs.filter(
@@ -72,6 +87,24 @@ def item_list(request):
     if activo in ("true", "false"):
         qs = qs.filter(activo=(activo == "true"))
 
+    filtros = {
+        "q": search,
+        "categoria": categoria_id,
+        "ubicacion": ubicacion_id,
+        "estado": estado,
+        "activo": activo,
+    }
+    return qs, filtros
+
+
+# -----------------------------
+# Listado: VIEWER (o superior)
+# -----------------------------
+@require_any(GROUP_VIEWER, GROUP_EDITOR, GROUP_ADMIN)
+@presupuesto_queries(12)
+def item_list(request):
+    qs = InventarioItem.objects.select_related("categoria", "ubicacion", "motivo_baja").all()
+    qs, filtros = filtrar_items(qs, request.GET)
     qs = qs.order_by("-fecha_alta", "codigo")
 
     paginator = Paginator(qs, 20)
@@ -82,13 +115,7 @@ def item_list(request):
         "categorias": Categoria.objects.all().order_by("nombre"),
         "ubicaciones": Ubicacion.objects.all().order_by("nombre"),
         "estados": InventarioItem.Estado.choices,
-        "filters": {
-            "q": search,
-            "categoria": categoria_id,
-            "ubicacion": ubicacion_id,
-            "estado": estado,
-            "activo": activo,
-        },
+        "filters": filtros,
         # flags para la UI (botones)
         "can_edit": has_any_group(request.user, (GROUP_EDITOR, GROUP_ADMIN)),
         "can_admin": has_any_group(request.user, (GROUP_ADMIN,)),
@@ -126,9 +153,7 @@ def item_create(request):
         if form.is_valid():
             obj = form.save(commit=False)
             try:
-                obj.full_clean()
-                obj.save()
-                obj.refresh_from_db()
+                obj.save()  # codigo regresa en el INSERT ... RETURNING
 
                 action = request.POST.get("action", "save_view")
 
@@ -150,6 +175,94 @@ def item_create(request):
     return render(request, "inventario/item_form.html", {"form": form, "title": "Nuevo item"})
 
 
+# -----------------------------
+# Importar XLSX/CSV: EDITOR (o ADMIN)
+# -----------------------------
+@require_any(GROUP_EDITOR, GROUP_ADMIN)
+def item_import(request):
+    if request.method == "POST":
+        form = InventarioImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            archivo = form.cleaned_data["archivo"]
+            try:
+                # Formato/codificación se revisan aquí: si falla, no se guardó nada
+                filas = leer_filas(archivo, archivo.name)
+            except ArchivoInvalido as e:
+                form.add_error("archivo", str(e))
+            else:
+                resultado = importar_items(filas)
+                if not resultado.errores:
+                    messages.success(request, f"✅ Importados {resultado.creados} items.")
+                    return redirect("inventario_ui:item_list")
+
+                # Con errores: resumen en la página; el reporte completo se descarga aparte
+                # (lo válido ya quedó guardado)
+                reporte = io.StringIO()
+                escribir_reporte_errores(resultado.errores, reporte)
+                request.session[SESSION_REPORTE_IMPORTACION] = reporte.getvalue()
+                return render(
+                    request,
+                    "inventario/item_import.html",
+                    {
+                        "form": InventarioImportForm(),
+                        "resultado": resultado,
+                        "errores_muestra": resultado.errores[:MUESTRA_ERRORES_IMPORTACION],
+                    },
+                )
+    else:
+        form = InventarioImportForm()
+
+    return render(request, "inventario/item_import.html", {"form": form})
+
+
+@require_any(GROUP_EDITOR, GROUP_ADMIN)
+def item_import_errores(request):
+    """Reporte CSV de la última importación con errores (guardado en la sesión)."""
+    reporte = request.session.get(SESSION_REPORTE_IMPORTACION)
+    if reporte is None:
+        raise Http404("No hay reporte de errores.")
+    response = HttpResponse(reporte, content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = (
+        f'attachment; filename="importacion_errores_{timezone.localdate().isoformat()}.csv"'
+    )
+    return response
+
+
+# -----------------------------
+# Recepción por escaneo de series (Articulo): EDITOR (o ADMIN)
+# -----------------------------
+@require_any(GROUP_EDITOR, GROUP_ADMIN)
+def articulo_recepcion(request):
+    if request.method == "POST":
+        form = RecepcionArticulosForm(request.POST)
+        if form.is_valid():
+            cd = form.cleaned_data
+            try:
+                resultado = recibir_articulos(
+                    cd["producto"],
+                    parsear_series(cd["series"]),
+                    ubicacion=cd["ubicacion"],
+                    grado=cd["grado"],
+                    condicion=cd["condicion"],
+                    created_by=request.user,
+                    omitir_duplicadas=cd["omitir_duplicadas"],
+                )
+            except ValidationError as e:
+                form.add_error(None, e)
+            else:
+                messages.success(request, f"✅ Recibidas {len(resultado.creados)} unidades de {cd['producto'].sku}.")
+                omitidas = resultado.repetidas + resultado.existentes
+                if omitidas:
+                    messages.warning(
+                        request, f"⚠️ Omitidas {len(omitidas)} series duplicadas: {', '.join(omitidas[:20])}"
+                    )
+                return redirect("inventario_ui:articulo_recepcion")
+    else:
+        form = RecepcionArticulosForm()
+
+    return render(request, "inventario/articulo_recepcion.html", {"form": form})
+
+
 # -----------------------------
 # Editar: EDITOR (o ADMIN)
 # -----------------------------
@@ -165,9 +278,7 @@ def item_update(request, pk: int):
         if form.is_valid():
             obj = form.save(commit=False)
             try:
-                obj.full_clean()
                 obj.save()
-                obj.refresh_from_db()
 
                 messages.success(request, f"✅ Cambios guardados: {obj.codigo or obj.pk}")
                 return redirect("inventario_ui:item_detail", pk=obj.pk)
@@ -187,7 +298,7 @@ def item_update(request, pk: int):
 # -----------------------------
 # Baja: ADMIN
 # -----------------------------
-@require_any(GROUP_ADMIN,)
+@require_any(GROUP_ADMIN)
 def item_baja(request, pk: int):
     item = get_object_or_404(
         InventarioItem.objects.select_related("categoria", "ubicacion", "motivo_baja"),
@@ -207,9 +318,7 @@ def item_baja(request, pk: int):
                 obj.fecha_baja = timezone.localdate()
 
             try:
-                obj.full_clean()
                 obj.save()
-                obj.refresh_from_db()
 
                 messages.success(request, f"⚠️ Item marcado como baja/desecho: {obj.codigo or obj.pk}")
                 return redirect("inventario_ui:item_detail", pk=obj.pk)
@@ -223,3 +332,69 @@ def item_baja(request, pk: int):
         )
 
     return render(request, "inventario/item_baja.html", {"form": form, "item": item})
+
+
+# -----------------------------
+# Baja masiva: ADMIN
+# -----------------------------
+@require_any(GROUP_ADMIN)
+def item_baja_masiva(request):
+    """
+    Baja/Desecho de un lote: por códigos o por los filtros del listado (en la URL).
+    Con filtros, POST solo aplica si la selección sigue siendo del tamaño que se previsualizó.
+    """
+    seleccion, filtros = filtrar_items(InventarioItem.objects.all(), request.GET)
+    con_filtro = any(filtros.values())
+    previa = seleccion.count() if con_filtro else None
+    resultado = None
+
+    if request.method == "POST":
+        form = BajaMasivaForm(request.POST)
+        if form.is_valid():
+            cd = form.cleaned_data
+            codigos = parsear_series(cd["codigos"])
+            no_encontrados = []
+            if codigos:
+                items, no_encontrados = items_por_codigos(codigos)
+            elif not con_filtro:
+                form.add_error("codigos", "Captura códigos o entra desde el listado con algún filtro.")
+            elif cd["esperados"] != previa:
+                form.add_error(
+                    None, f"La selección cambió ({cd['esperados']} → {previa} items). Revisa y confirma de nuevo."
+                )
+            else:
+                items = seleccion
+
+            if not form.errors:
+                try:
+                    resultado = dar_de_baja_lote(
+                        items,
+                        estado=cd["estado"],
+                        motivo_baja=cd["motivo_baja"],
+                        fecha_baja=cd["fecha_baja"],
+                    )
+                except ValidationError as e:
+                    form.add_error(None, e)
+                else:
+                    resultado.no_encontrados = no_encontrados
+                    messages.success(request, f"⚠️ {resultado.actualizados} items marcados como {cd['estado']}.")
+                    if resultado.rechazados or no_encontrados:
+                        messages.warning(
+                            request,
+                            f"{len(resultado.rechazados)} rechazados, {len(no_encontrados)} códigos no encontrados.",
+                        )
+                    previa = seleccion.count() if con_filtro else None
+    else:
+        form = BajaMasivaForm(initial={"estado": InventarioItem.Estado.BAJA, "esperados": previa})
+
+    return render(
+        request,
+        "inventario/item_baja_masiva.html",
+        {
+            "form": form,
+            "filtros": filtros,
+            "con_filtro": con_filtro,
+            "previa": previa,
+            "resultado": resultado,
+        },
+    )
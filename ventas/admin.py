@@ -1,19 +1,17 @@
 # ventas/admin.py
 from __future__ import annotations
 
-from decimal import Decimal
-
 from django.contrib import admin, messages
 from django.core.exceptions import ValidationError
-from django.db import transaction
 
 from .models import Cliente, Venta, VentaDetalle, Pago, VentaEstado, MetodoPago
 from .application.services import (
-    recalcular_totales,
-    reservar_articulos,
-    marcar_pagada,
-    cancelar_venta,
+    ResultadoLote,
+    cancelar_ventas_lote,
     marcar_entregada,
+    marcar_pagadas_lote,
+    recalcular_totales_lote,
+    reservar_articulos_lote,
 )
 
 
@@ -37,6 +35,10 @@ class VentaDetalleInline(admin.TabularInline):
     fields = ("articulo", "precio", "descuento")
     show_change_link = True
 
+    def get_queryset(self, request):
+        # El widget muestra str(articulo) = producto.sku / serie
+        return super().get_queryset(request).select_related("articulo__producto")
+
 
 class PagoInline(admin.TabularInline):
     model = Pago
@@ -53,6 +55,7 @@ class VentaAdmin(admin.ModelAdmin):
     inlines = (VentaDetalleInline, PagoInline)
 
     list_display = ("folio", "cliente", "estado", "total", "creada_en", "pagada_en", "entregada_en", "vendedor")
+    list_select_related = ("cliente", "vendedor")
     list_filter = ("estado", "creada_en")
     search_fields = ("folio", "cliente__nombre", "cliente__telefono", "cliente__email")
     ordering = ("-creada_en", "-id")
@@ -82,60 +85,62 @@ class VentaAdmin(admin.ModelAdmin):
         obj.full_clean()
         super().save_model(request, obj, form, change)
 
+    def _reportar_lote(self, request, resultado: ResultadoLote, ok_msg: str, skip_msg: str, fail_msg: str):
+        if resultado.ok:
+            messages.success(request, f"{ok_msg}: {len(resultado.ok)}.")
+        if resultado.omitidas:
+            messages.warning(request, f"{skip_msg}: {len(resultado.omitidas)}.")
+        if resultado.fallidas:
+            # Detalle por venta (recortado para no saturar la pantalla)
+            detalle = "; ".join(f"#{vid}: {msg}" for vid, msg in list(resultado.fallidas.items())[:10])
+            if len(resultado.fallidas) > 10:
+                detalle += "; ..."
+            messages.error(request, f"{fail_msg}: {len(resultado.fallidas)} ({detalle})")
+
     @admin.action(description="Recalcular totales")
     def accion_recalcular(self, request, queryset):
-        ok, fail = 0, 0
-        for v in queryset:
-            try:
-                recalcular_totales(v)
-                ok += 1
-            except Exception:
-                fail += 1
-        if ok:
-            messages.success(request, f"Totales recalculados para {ok} venta(s).")
-        if fail:
-            messages.error(request, f"Fallaron {fail} venta(s) al recalcular (revisa detalles/reglas).")
+        try:
+            resultado = recalcular_totales_lote(queryset.values_list("pk", flat=True))
+        except Exception as e:
+            messages.error(request, f"Falló el recálculo de totales en lote: {e}")
+            return
+        self._reportar_lote(
+            request,
+            resultado,
+            "Totales recalculados",
+            "Omitidas",
+            "Fallaron al recalcular",
+        )
 
     @admin.action(description="Reservar artículos (solo BORRADOR)")
     def accion_reservar(self, request, queryset):
-        ok, skip, fail = 0, 0, 0
-        for v in queryset:
-            if v.estado != VentaEstado.BORRADOR:
-                skip += 1
-                continue
-            try:
-                reservar_articulos(v)
-                ok += 1
-            except ValidationError:
-                fail += 1
-            except Exception:
-                fail += 1
-
-        if ok:
-            messages.success(request, f"Reservadas: {ok}.")
-        if skip:
-            messages.warning(request, f"Omitidas (no BORRADOR): {skip}.")
-        if fail:
-            messages.error(request, f"Fallaron al reservar: {fail}.")
+        try:
+            resultado = reservar_articulos_lote(queryset.values_list("pk", flat=True))
+        except Exception as e:
+            messages.error(request, f"Falló la reserva en lote: {e}")
+            return
+        self._reportar_lote(
+            request,
+            resultado,
+            "Reservadas",
+            "Omitidas (no BORRADOR)",
+            "Fallaron al reservar",
+        )
 
     @admin.action(description="Marcar PAGADA (EFECTIVO = total)")
     def accion_marcar_pagada_efectivo(self, request, queryset):
-        ok, fail = 0, 0
-        for v in queryset:
-            try:
-                recalcular_totales(v)
-                total = v.total or Decimal("0.00")
-                marcar_pagada(v, metodo=MetodoPago.EFECTIVO, monto=total, referencia="")
-                ok += 1
-            except ValidationError:
-                fail += 1
-            except Exception:
-                fail += 1
-
-        if ok:
-            messages.success(request, f"Pagadas: {ok}.")
-        if fail:
-            messages.error(request, f"Fallaron: {fail} (pagos insuficientes, sin detalles, artículo no disponible, etc.).")
+        try:
+            resultado = marcar_pagadas_lote(queryset.values_list("pk", flat=True), metodo=MetodoPago.EFECTIVO)
+        except Exception as e:
+            messages.error(request, f"Falló el pago en lote: {e}")
+            return
+        self._reportar_lote(
+            request,
+            resultado,
+            "Pagadas",
+            "Omitidas (ya PAGADA)",
+            "Fallaron",
+        )
 
     @admin.action(description="Marcar ENTREGADA (solo PAGADA)")
     def accion_marcar_entregada(self, request, queryset):
@@ -161,26 +166,18 @@ class VentaAdmin(admin.ModelAdmin):
 
     @admin.action(description="Cancelar venta (solo BORRADOR)")
     def accion_cancelar(self, request, queryset):
-        ok, skip, fail = 0, 0, 0
-        with transaction.atomic():
-            for v in queryset.select_for_update():
-                if v.estado != VentaEstado.BORRADOR:
-                    skip += 1
-                    continue
-                try:
-                    cancelar_venta(v)
-                    ok += 1
-                except ValidationError:
-                    fail += 1
-                except Exception:
-                    fail += 1
-
-        if ok:
-            messages.success(request, f"Canceladas: {ok}.")
-        if skip:
-            messages.warning(request, f"Omitidas (no BORRADOR): {skip}.")
-        if fail:
-            messages.error(request, f"Fallaron: {fail}.")
+        try:
+            resultado = cancelar_ventas_lote(queryset.values_list("pk", flat=True))
+        except Exception as e:
+            messages.error(request, f"Falló la cancelación en lote: {e}")
+            return
+        self._reportar_lote(
+            request,
+            resultado,
+            "Canceladas",
+            "Omitidas (no BORRADOR)",
+            "Fallaron",
+        )
 
 
 # ----------------------------
@@ -189,6 +186,8 @@ class VentaAdmin(admin.ModelAdmin):
 @admin.register(VentaDetalle)
 class VentaDetalleAdmin(admin.ModelAdmin):
     list_display = ("venta", "articulo", "precio", "descuento")
+    # str(articulo) usa producto.sku: sin esto es una query por fila
+    list_select_related = ("venta", "articulo__producto")
     search_fields = ("venta__folio", "articulo__serie", "articulo__etiqueta_interna", "articulo__producto__sku")
     autocomplete_fields = ("venta", "articulo")
 
@@ -196,6 +195,7 @@ class VentaDetalleAdmin(admin.ModelAdmin):
 @admin.register(Pago)
 class PagoAdmin(admin.ModelAdmin):
     list_display = ("venta", "metodo", "monto", "referencia", "fecha")
+    list_select_related = ("venta",)
     list_filter = ("metodo", "fecha")
     search_fields = ("venta__folio", "referencia")
     autocomplete_fields = ("venta",)
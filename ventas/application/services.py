@@ -1,58 +1,197 @@
 # ventas/application/services.py
 from __future__ import annotations
 
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from decimal import Decimal
+from functools import reduce
+from operator import or_
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Sum
+from django.db.models import Exists, F, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from inventario.models import Articulo, ArticuloEstado
-from ventas.models import Venta, VentaEstado, Pago
+from core.infrastructure.db import ConflictoConcurrencia, reintentar_en_conflicto
+from core.infrastructure.metricas import contar_transicion
+from inventario.models import Articulo, ArticuloEstado, Producto, Ubicacion
+from ventas.models import MetodoPago, Venta, VentaDetalle, VentaEstado, Pago
 
 
+def _reserva_vence() -> datetime:
+    return timezone.now() + timedelta(minutes=settings.VENTAS_RESERVA_TTL_MINUTOS)
+
+
+# ----------------------------
+# Locks
+# Orden global para evitar deadlocks entre cajeros/admin:
+#   1) ventas (por id)  2) artículos (por id)
+# Todo servicio que bloquee filas debe pasar por estos helpers.
+# ----------------------------
+def _bloquear_venta(venta_id: int) -> Venta:
+    return Venta.objects.select_for_update().get(pk=venta_id)
+
+
+def _bloquear_ventas(venta_ids) -> list[Venta]:
+    """Lock de ventas en un solo query, siempre ordenado por id."""
+    return list(Venta.objects.select_for_update().filter(pk__in=venta_ids).order_by("pk"))
+
+
+def _articulos_por_venta(venta_ids) -> dict[int, list[int]]:
+    por_venta: dict[int, list[int]] = defaultdict(list)
+    detalles = (
+        VentaDetalle.objects.filter(venta_id__in=venta_ids)
+        .order_by("venta_id", "articulo_id")
+        .values_list("venta_id", "articulo_id")
+    )
+    for venta_id, articulo_id in detalles:
+        por_venta[venta_id].append(articulo_id)
+    return por_venta
+
+
+def _reservas_manuales(articulo_ids) -> set[int]:
+    """
+    De `articulo_ids` (ya leídos/bloqueados por el llamador), los RESERVADO sin vencimiento:
+    reserva manual del admin, que ninguna venta debe tomar como propia.
+    """
+    if not articulo_ids:
+        return set()
+    return set(
+        Articulo.objects.filter(
+            id__in=articulo_ids, estado=ArticuloEstado.RESERVADO, reservado_hasta__isnull=True
+        ).values_list("id", flat=True)
+    )
+
+
+def _bloquear_articulos(articulo_ids) -> dict[int, str]:
+    """Lock de artículos en un solo query, siempre ordenado por id. Devuelve {id: estado}."""
+    if not articulo_ids:
+        return {}
+    return dict(
+        Articulo.objects.select_for_update()
+        .filter(id__in=articulo_ids)
+        .order_by("id")
+        .values_list("id", "estado")
+    )
+
+
+# ----------------------------
+# Lectura/escritura según modo de concurrencia (settings.VENTAS_CONCURRENCIA)
+# - pesimista: lee con FOR UPDATE (mismo orden de locks) y escribe normal
+# - optimista: lee sin locks y escribe con compare-and-swap sobre `version`;
+#   si otra transacción ganó, ConflictoConcurrencia (reintentable)
+# En ambos modos toda escritura incrementa `version`.
+# ----------------------------
+def _modo_optimista() -> bool:
+    return settings.VENTAS_CONCURRENCIA == "optimista"
+
+
+def _leer_venta(venta_id: int) -> Venta:
+    if _modo_optimista():
+        return Venta.objects.get(pk=venta_id)
+    return _bloquear_venta(venta_id)
+
+
+def _leer_articulos(articulo_ids) -> dict[int, tuple[str, int]]:
+    """Devuelve {id: (estado, version)} ordenado por id."""
+    qs = Articulo.objects.filter(id__in=articulo_ids).order_by("id")
+    if not _modo_optimista():
+        qs = qs.select_for_update()
+    return {a_id: (estado, version) for a_id, estado, version in qs.values_list("id", "estado", "version")}
+
+
+def _guardar_venta(venta: Venta, *campos: str) -> None:
+    qs = Venta.objects.filter(pk=venta.pk)
+    if _modo_optimista():
+        qs = qs.filter(version=venta.version)
+    if not qs.update(version=F("version") + 1, **{c: getattr(venta, c) for c in campos}):
+        raise ConflictoConcurrencia(f"La venta {venta.pk} cambió mientras se procesaba.")
+    venta.version += 1
+
+
+def _actualizar_articulos(leidos: dict[int, tuple[str, int]], solo_estado: str | None = None, **campos) -> None:
+    ids = [a_id for a_id, (estado, _) in leidos.items() if solo_estado is None or estado == solo_estado]
+    if not ids:
+        return
+
+    if _modo_optimista():
+        qs = Articulo.objects.filter(reduce(or_, (Q(id=a_id, version=leidos[a_id][1]) for a_id in ids)))
+    else:
+        qs = Articulo.objects.filter(id__in=ids)
+
+    if qs.update(version=F("version") + 1, **campos) != len(ids):
+        raise ConflictoConcurrencia("Algún artículo cambió mientras se procesaba la venta.")
+
+
+def _recalcular(venta: Venta) -> Venta:
+    version = venta.version if _modo_optimista() else None
+    totales = Venta.recalcular_totales_por_id(venta.pk, version=version)
+    if totales is None:
+        raise ConflictoConcurrencia(f"La venta {venta.pk} cambió mientras se recalculaba.")
+    for campo, valor in totales.items():
+        setattr(venta, campo, valor)
+    venta.version += 1
+    return venta
+
+
+# ----------------------------
+# Servicios por venta
+# ----------------------------
+@reintentar_en_conflicto
 @transaction.atomic
 def recalcular_totales(venta: Venta) -> Venta:
     """
     Recalcula subtotal/descuento/impuestos/total usando el método centralizado del modelo.
     Esto evita duplicar lógica en services/admin/signals.
+    En modo optimista no toma locks: solo un UPDATE condicionado a la versión leída.
     """
-    venta = Venta.objects.select_for_update().get(pk=venta.pk)
-    Venta.recalcular_totales_por_id(venta.id)
-    venta.refresh_from_db(fields=["subtotal", "descuento", "impuestos", "total"])
-    return venta
+    return _recalcular(_leer_venta(venta.pk))
 
 
+@reintentar_en_conflicto
 @transaction.atomic
 def reservar_articulos(venta: Venta) -> Venta:
     """
-    BORRADOR -> RESERVADO (solo si estaban DISPONIBLE).
-    Con locks para evitar carreras.
+    BORRADOR -> RESERVADO (solo si estaban DISPONIBLE, o ya reservados por esta venta con TTL).
+    Con locks (o versión) para evitar carreras.
     """
-    venta = Venta.objects.select_for_update().get(pk=venta.pk)
+    venta = _leer_venta(venta.pk)
 
     if venta.estado != VentaEstado.BORRADOR:
         raise ValidationError("Solo puedes reservar una venta en BORRADOR.")
 
-    articulo_ids = list(venta.detalles.values_list("articulo_id", flat=True))
+    articulo_ids = list(venta.detalles.order_by("articulo_id").values_list("articulo_id", flat=True))
     if not articulo_ids:
         raise ValidationError("La venta no tiene artículos.")
 
-    articulos = list(
-        Articulo.objects.select_for_update()
-        .filter(id__in=articulo_ids)
-        .only("id", "estado")
+    leidos = _leer_articulos(articulo_ids)
+
+    # RESERVADO con vencimiento también vale: solo lo ponen los servicios de venta sobre
+    # artículos de sus detalles (p. ej. asignar_unidades) y el detalle es exclusivo (OneToOne),
+    # así que la reserva es de esta venta; reservar de nuevo solo renueva el TTL.
+    # La reserva manual (admin, reservado_hasta NULL) no es de ninguna venta: se rechaza.
+    manuales = _reservas_manuales([a_id for a_id, (estado, _) in leidos.items() if estado == ArticuloEstado.RESERVADO])
+    for a_id, (estado, _) in leidos.items():
+        if a_id in manuales:
+            raise ValidationError(f"Artículo {a_id} no disponible (reserva manual).")
+        if estado not in (ArticuloEstado.DISPONIBLE, ArticuloEstado.RESERVADO):
+            raise ValidationError(f"Artículo {a_id} no disponible (estado={estado}).")
+
+    _actualizar_articulos(
+        leidos,
+        estado=ArticuloEstado.RESERVADO,
+        reservado_hasta=_reserva_vence(),
     )
-
-    for a in articulos:
-        if a.estado != ArticuloEstado.DISPONIBLE:
-            raise ValidationError(f"Artículo {a.id} no disponible (estado={a.estado}).")
-
-    Articulo.objects.filter(id__in=articulo_ids).update(estado=ArticuloEstado.RESERVADO)
+    # Sin cambios de campos: solo valida/incrementa versión (nadie canceló/pagó en medio)
+    _guardar_venta(venta)
+    contar_transicion("reservada")
     return venta
 
 
+@reintentar_en_conflicto
 @transaction.atomic
 def marcar_pagada(
     venta: Venta,
@@ -63,9 +202,9 @@ def marcar_pagada(
 ) -> Venta:
     """
     Registra pago y marca la venta PAGADA si pagos >= total.
-    Cambia artículos a VENDIDO con locks.
+    Cambia artículos a VENDIDO con locks (o versión).
     """
-    venta = Venta.objects.select_for_update().get(pk=venta.pk)
+    venta = _leer_venta(venta.pk)
 
     if venta.estado == VentaEstado.CANCELADA:
         raise ValidationError("No puedes pagar una venta CANCELADA.")
@@ -74,29 +213,25 @@ def marcar_pagada(
     if monto is None or monto < Decimal("0.00"):
         raise ValidationError("Monto inválido.")
 
-    # Totales al día (y lock de la venta ya tomado)
-    venta = recalcular_totales(venta)
+    # Totales al día (sobre la misma venta ya leída/bloqueada)
+    venta = _recalcular(venta)
 
-    articulo_ids = list(venta.detalles.values_list("articulo_id", flat=True))
+    articulo_ids = list(venta.detalles.order_by("articulo_id").values_list("articulo_id", flat=True))
     if not articulo_ids:
         raise ValidationError("La venta no tiene artículos.")
 
-    # Lock de artículos
-    articulos = list(
-        Articulo.objects.select_for_update()
-        .filter(id__in=articulo_ids)
-        .only("id", "estado")
-    )
+    # Artículos (después de la venta, por id)
+    leidos = _leer_articulos(articulo_ids)
 
-    for a in articulos:
-        if a.estado == ArticuloEstado.VENDIDO:
-            raise ValidationError(f"Artículo {a.id} ya está VENDIDO.")
-        if a.estado == ArticuloEstado.BAJA:
-            raise ValidationError(f"Artículo {a.id} está en BAJA.")
-        if exigir_reservado and a.estado != ArticuloEstado.RESERVADO:
-            raise ValidationError(f"Artículo {a.id} debe estar RESERVADO (estado={a.estado}).")
-        if not exigir_reservado and a.estado not in (ArticuloEstado.RESERVADO, ArticuloEstado.DISPONIBLE):
-            raise ValidationError(f"Artículo {a.id} no puede venderse (estado={a.estado}).")
+    for a_id, (estado, _) in leidos.items():
+        if estado == ArticuloEstado.VENDIDO:
+            raise ValidationError(f"Artículo {a_id} ya está VENDIDO.")
+        if estado == ArticuloEstado.BAJA:
+            raise ValidationError(f"Artículo {a_id} está en BAJA.")
+        if exigir_reservado and estado != ArticuloEstado.RESERVADO:
+            raise ValidationError(f"Artículo {a_id} debe estar RESERVADO (estado={estado}).")
+        if not exigir_reservado and estado not in (ArticuloEstado.RESERVADO, ArticuloEstado.DISPONIBLE):
+            raise ValidationError(f"Artículo {a_id} no puede venderse (estado={estado}).")
 
     # Crear pago
     Pago.objects.create(venta=venta, metodo=metodo, monto=monto, referencia=referencia)
@@ -107,20 +242,22 @@ def marcar_pagada(
         raise ValidationError("Pagos insuficientes para marcar como PAGADA.")
 
     # Vender artículos
-    Articulo.objects.filter(id__in=articulo_ids).update(estado=ArticuloEstado.VENDIDO)
+    _actualizar_articulos(leidos, estado=ArticuloEstado.VENDIDO, reservado_hasta=None)
 
     venta.estado = VentaEstado.PAGADA
     venta.pagada_en = venta.pagada_en or timezone.now()
-    venta.save(update_fields=["estado", "pagada_en"])
+    _guardar_venta(venta, "estado", "pagada_en")
+    contar_transicion("pagada")
     return venta
 
 
+@reintentar_en_conflicto
 @transaction.atomic
 def cancelar_venta(venta: Venta) -> Venta:
     """
     Cancela venta y libera artículos RESERVADO -> DISPONIBLE.
     """
-    venta = Venta.objects.select_for_update().get(pk=venta.pk)
+    venta = _leer_venta(venta.pk)
 
     if venta.estado == VentaEstado.CANCELADA:
         return venta
@@ -128,36 +265,349 @@ def cancelar_venta(venta: Venta) -> Venta:
     if venta.estado in (VentaEstado.PAGADA, VentaEstado.ENTREGADA):
         raise ValidationError("No puedes cancelar una venta PAGADA/ENTREGADA (haz devolución después).")
 
-    articulo_ids = list(venta.detalles.values_list("articulo_id", flat=True))
-    if not articulo_ids:
-        venta.estado = VentaEstado.CANCELADA
-        venta.save(update_fields=["estado"])
-        return venta
-
-    # Lock de artículos
-    Articulo.objects.select_for_update().filter(id__in=articulo_ids)
-
-    # Libera solo reservados
-    Articulo.objects.filter(id__in=articulo_ids, estado=ArticuloEstado.RESERVADO).update(
-        estado=ArticuloEstado.DISPONIBLE
-    )
+    articulo_ids = list(venta.detalles.order_by("articulo_id").values_list("articulo_id", flat=True))
+    if articulo_ids:
+        # Artículos (después de la venta, por id); libera solo reservados
+        leidos = _leer_articulos(articulo_ids)
+        _actualizar_articulos(
+            leidos,
+            solo_estado=ArticuloEstado.RESERVADO,
+            estado=ArticuloEstado.DISPONIBLE,
+            reservado_hasta=None,
+        )
 
     venta.estado = VentaEstado.CANCELADA
-    venta.save(update_fields=["estado"])
+    _guardar_venta(venta, "estado")
+    contar_transicion("cancelada")
     return venta
 
 
+@reintentar_en_conflicto
 @transaction.atomic
 def marcar_entregada(venta: Venta) -> Venta:
     """
     Entrega solo si está PAGADA.
     """
-    venta = Venta.objects.select_for_update().get(pk=venta.pk)
+    venta = _leer_venta(venta.pk)
 
     if venta.estado != VentaEstado.PAGADA:
         raise ValidationError("Solo puedes entregar una venta PAGADA.")
 
     venta.estado = VentaEstado.ENTREGADA
     venta.entregada_en = venta.entregada_en or timezone.now()
-    venta.save(update_fields=["estado", "entregada_en"])
+    _guardar_venta(venta, "estado", "entregada_en")
+    contar_transicion("entregada")
     return venta
+
+
+@reintentar_en_conflicto
+@transaction.atomic
+def asignar_unidades(
+    venta: Venta,
+    producto: Producto,
+    cantidad: int = 1,
+    *,
+    grado: str = "",
+    condicion: str = "",
+    ubicacion: Ubicacion | None = None,
+    precio: Decimal | None = None,
+) -> list[VentaDetalle]:
+    """
+    POS: agrega a la venta `cantidad` unidades DISPONIBLE cualesquiera del producto
+    y las deja RESERVADO.
+    SELECT ... FOR UPDATE SKIP LOCKED: cajeros concurrentes se llevan unidades
+    distintas sin esperarse entre sí (índice producto+estado).
+    """
+    if cantidad < 1:
+        raise ValidationError("La cantidad debe ser al menos 1.")
+
+    venta = _bloquear_venta(venta.pk)
+    if venta.estado != VentaEstado.BORRADOR:
+        raise ValidationError("Solo puedes agregar artículos a una venta en BORRADOR.")
+
+    qs = Articulo.objects.filter(producto=producto, estado=ArticuloEstado.DISPONIBLE).exclude(
+        # Un artículo en cualquier detalle (aunque la venta se haya cancelado) ya no se puede volver a ligar.
+        Exists(VentaDetalle.objects.filter(articulo_id=OuterRef("pk")))
+    )
+    if grado:
+        qs = qs.filter(grado=grado)
+    if condicion:
+        qs = qs.filter(condicion=condicion)
+    if ubicacion is not None:
+        qs = qs.filter(ubicacion=ubicacion)
+
+    articulo_ids = list(
+        qs.select_for_update(skip_locked=True).order_by("id").values_list("id", flat=True)[:cantidad]
+    )
+    if len(articulo_ids) < cantidad:
+        raise ValidationError(
+            f"Solo hay {len(articulo_ids)} unidad(es) disponible(s) de {producto.sku} con esos filtros."
+        )
+
+    precio = producto.precio_venta if precio is None else precio
+    # bulk_create: VentaDetalle.save() rechazaría el artículo en cuanto quede RESERVADO.
+    detalles = VentaDetalle.objects.bulk_create(
+        [VentaDetalle(venta=venta, articulo_id=a_id, precio=precio) for a_id in articulo_ids]
+    )
+    Articulo.objects.filter(id__in=articulo_ids).update(
+        estado=ArticuloEstado.RESERVADO,
+        reservado_hasta=_reserva_vence(),
+        version=F("version") + 1,
+    )
+    Venta.recalcular_totales_por_id(venta.pk)
+    contar_transicion("unidad_asignada", len(detalles))
+    return detalles
+
+
+# ----------------------------
+# Operaciones en lote (acciones de admin / cierre del día)
+# ----------------------------
+@dataclass
+class ResultadoLote:
+    """
+    Resultado por venta de una operación en lote.
+    - ok: ventas que sí cambiaron
+    - omitidas: no aplicaba (estado distinto al esperado)
+    - fallidas: aplicaba pero no pasó validación
+    """
+
+    ok: list[int] = field(default_factory=list)
+    omitidas: dict[int, str] = field(default_factory=dict)
+    fallidas: dict[int, str] = field(default_factory=dict)
+
+
+def _marcar_inexistentes(resultado: ResultadoLote, venta_ids, ventas: list[Venta]) -> None:
+    encontradas = {v.pk for v in ventas}
+    for venta_id in venta_ids:
+        if venta_id not in encontradas:
+            resultado.fallidas[venta_id] = "La venta no existe."
+
+
+@reintentar_en_conflicto
+@transaction.atomic
+def recalcular_totales_lote(venta_ids) -> ResultadoLote:
+    """
+    Recalcula totales de muchas ventas con un GROUP BY y un bulk_update.
+    """
+    venta_ids = list(venta_ids)
+    resultado = ResultadoLote()
+
+    ventas = _bloquear_ventas(venta_ids)
+    _marcar_inexistentes(resultado, venta_ids, ventas)
+
+    Venta.recalcular_totales_por_ids([v.pk for v in ventas])
+    resultado.ok = [v.pk for v in ventas]
+    return resultado
+
+
+@reintentar_en_conflicto
+@transaction.atomic
+def reservar_articulos_lote(venta_ids) -> ResultadoLote:
+    """
+    BORRADOR -> RESERVADO para muchas ventas.
+    Lock de ventas y artículos en un query cada uno; validación por conjunto;
+    un solo UPDATE para todos los artículos de las ventas que pasan.
+    """
+    venta_ids = list(venta_ids)
+    resultado = ResultadoLote()
+
+    ventas = _bloquear_ventas(venta_ids)
+    _marcar_inexistentes(resultado, venta_ids, ventas)
+
+    candidatas = []
+    for v in ventas:
+        if v.estado != VentaEstado.BORRADOR:
+            resultado.omitidas[v.pk] = f"No está en BORRADOR (estado={v.estado})."
+        else:
+            candidatas.append(v.pk)
+
+    por_venta = _articulos_por_venta(candidatas)
+    estados = _bloquear_articulos([a for ids in por_venta.values() for a in ids])
+    # Misma regla que reservar_articulos: la reserva manual (sin vencimiento) no se toma
+    manuales = _reservas_manuales([a for a, estado in estados.items() if estado == ArticuloEstado.RESERVADO])
+
+    a_reservar: list[int] = []
+    for venta_id in candidatas:
+        articulo_ids = por_venta.get(venta_id)
+        if not articulo_ids:
+            resultado.fallidas[venta_id] = "La venta no tiene artículos."
+            continue
+
+        no_disponibles = [
+            a
+            for a in articulo_ids
+            if estados.get(a) not in (ArticuloEstado.DISPONIBLE, ArticuloEstado.RESERVADO) or a in manuales
+        ]
+        if no_disponibles:
+            a = no_disponibles[0]
+            motivo = "reserva manual" if a in manuales else f"estado={estados.get(a)}"
+            resultado.fallidas[venta_id] = f"Artículo {a} no disponible ({motivo})."
+            continue
+
+        a_reservar.extend(articulo_ids)
+        resultado.ok.append(venta_id)
+
+    if a_reservar:
+        Articulo.objects.filter(id__in=a_reservar).update(
+            estado=ArticuloEstado.RESERVADO,
+            reservado_hasta=_reserva_vence(),
+            version=F("version") + 1,
+        )
+    contar_transicion("reservada", len(resultado.ok))
+    return resultado
+
+
+@reintentar_en_conflicto
+@transaction.atomic
+def marcar_pagadas_lote(venta_ids, metodo: str = MetodoPago.EFECTIVO, referencia: str = "") -> ResultadoLote:
+    """
+    Paga cada venta por su total (mismas reglas que marcar_pagada sin exigir_reservado):
+    - recalcula totales en lote
+    - valida artículos por conjunto
+    - bulk_create de pagos + un UPDATE de artículos + un UPDATE de ventas
+    """
+    venta_ids = list(venta_ids)
+    resultado = ResultadoLote()
+
+    ventas = _bloquear_ventas(venta_ids)
+    _marcar_inexistentes(resultado, venta_ids, ventas)
+
+    candidatas = []
+    for v in ventas:
+        if v.estado == VentaEstado.PAGADA:
+            resultado.omitidas[v.pk] = "Ya está PAGADA."
+        elif v.estado == VentaEstado.CANCELADA:
+            resultado.fallidas[v.pk] = "No puedes pagar una venta CANCELADA."
+        elif v.estado == VentaEstado.ENTREGADA:
+            resultado.fallidas[v.pk] = "No puedes pagar una venta ENTREGADA."
+        else:
+            candidatas.append(v.pk)
+
+    totales = Venta.recalcular_totales_por_ids(candidatas)
+
+    por_venta = _articulos_por_venta(candidatas)
+    estados = _bloquear_articulos([a for ids in por_venta.values() for a in ids])
+
+    vendibles = (ArticuloEstado.RESERVADO, ArticuloEstado.DISPONIBLE)
+    a_vender: list[int] = []
+    pagos: list[Pago] = []
+    for venta_id in candidatas:
+        articulo_ids = por_venta.get(venta_id)
+        if not articulo_ids:
+            resultado.fallidas[venta_id] = "La venta no tiene artículos."
+            continue
+
+        error = None
+        for a in articulo_ids:
+            estado = estados.get(a)
+            if estado == ArticuloEstado.VENDIDO:
+                error = f"Artículo {a} ya está VENDIDO."
+            elif estado == ArticuloEstado.BAJA:
+                error = f"Artículo {a} está en BAJA."
+            elif estado not in vendibles:
+                error = f"Artículo {a} no puede venderse (estado={estado})."
+            if error:
+                break
+        if error:
+            resultado.fallidas[venta_id] = error
+            continue
+
+        # Se paga exactamente el total: pagado >= total siempre se cumple.
+        pagos.append(
+            Pago(venta_id=venta_id, metodo=metodo, monto=totales[venta_id]["total"], referencia=referencia)
+        )
+        a_vender.extend(articulo_ids)
+        resultado.ok.append(venta_id)
+
+    if resultado.ok:
+        Pago.objects.bulk_create(pagos)
+        Articulo.objects.filter(id__in=a_vender).update(
+            estado=ArticuloEstado.VENDIDO,
+            reservado_hasta=None,
+            version=F("version") + 1,
+        )
+        Venta.objects.filter(pk__in=resultado.ok).update(
+            estado=VentaEstado.PAGADA,
+            version=F("version") + 1,
+            pagada_en=Coalesce("pagada_en", Value(timezone.now())),
+        )
+    contar_transicion("pagada", len(resultado.ok))
+    return resultado
+
+
+@reintentar_en_conflicto
+@transaction.atomic
+def cancelar_ventas_lote(venta_ids) -> ResultadoLote:
+    """
+    Cancela ventas en BORRADOR y libera sus artículos RESERVADO -> DISPONIBLE.
+    Mismo orden de locks que el resto: ventas por id, luego artículos por id.
+    """
+    venta_ids = list(venta_ids)
+    resultado = ResultadoLote()
+
+    ventas = _bloquear_ventas(venta_ids)
+    _marcar_inexistentes(resultado, venta_ids, ventas)
+
+    for v in ventas:
+        if v.estado != VentaEstado.BORRADOR:
+            resultado.omitidas[v.pk] = f"No está en BORRADOR (estado={v.estado})."
+        else:
+            resultado.ok.append(v.pk)
+
+    por_venta = _articulos_por_venta(resultado.ok)
+    articulo_ids = [a for ids in por_venta.values() for a in ids]
+    _bloquear_articulos(articulo_ids)
+
+    if articulo_ids:
+        Articulo.objects.filter(id__in=articulo_ids, estado=ArticuloEstado.RESERVADO).update(
+            estado=ArticuloEstado.DISPONIBLE,
+            reservado_hasta=None,
+            version=F("version") + 1,
+        )
+    if resultado.ok:
+        Venta.objects.filter(pk__in=resultado.ok).update(estado=VentaEstado.CANCELADA, version=F("version") + 1)
+    contar_transicion("cancelada", len(resultado.ok))
+    return resultado
+
+
+# ----------------------------
+# Reservas vencidas
+# ----------------------------
+@reintentar_en_conflicto
+@transaction.atomic
+def _liberar_lote_vencido(ahora: datetime, lote: int) -> int:
+    # SKIP LOCKED: si un cajero está pagando/cancelando ese artículo, no lo esperamos;
+    # si sigue vencido lo toma el siguiente barrido.
+    ids = list(
+        Articulo.objects.select_for_update(skip_locked=True)
+        .filter(estado=ArticuloEstado.RESERVADO, reservado_hasta__lt=ahora)
+        .order_by("id")
+        .values_list("id", flat=True)[:lote]
+    )
+    if not ids:
+        return 0
+    liberadas = Articulo.objects.filter(id__in=ids, estado=ArticuloEstado.RESERVADO).update(
+        estado=ArticuloEstado.DISPONIBLE,
+        reservado_hasta=None,
+        version=F("version") + 1,
+    )
+    contar_transicion("reserva_vencida", liberadas)
+    return liberadas
+
+
+def liberar_reservas_vencidas(lote: int = 500, ahora: datetime | None = None) -> int:
+    """
+    RESERVADO -> DISPONIBLE para reservas con reservado_hasta < ahora.
+    Lotes cortos (una transacción por lote) para no retener locks; usa el índice
+    parcial articulo_reserva_vence_idx y nunca toca reservas vigentes ni las
+    reservas manuales (reservado_hasta NULL).
+    """
+    if lote < 1:
+        raise ValueError(f"lote debe ser >= 1 (recibido: {lote}).")
+    ahora = ahora or timezone.now()
+    total = 0
+    while True:
+        liberadas = _liberar_lote_vencido(ahora, lote)
+        total += liberadas
+        if liberadas < lote:
+            return total
@@ -8,6 +8,7 @@ from django.core.validators import MinValueValidator
 from django.db import models, transaction
 from django.db.models import Sum
 
+from core.infrastructure.db import DbReturningCharField, ValidacionEnBDMixin, VersionadoMixin
 from inventario.models import ArticuloEstado
 
 
@@ -44,9 +45,22 @@ class MetodoPago(models.TextChoices):
 # ----------------------------
 # Venta
 # ----------------------------
-class Venta(models.Model):
-    # Lo generará la BD (trigger/sequence). Django no lo pide en forms/admin.
-    folio = models.CharField(
+class VentaQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Asigna folio a todo el lote en un round trip (mismo formato que el trigger).
+        """
+        from ventas.infrastructure.folio import asignar_folios  # import local (OK)
+
+        objs = list(objs)
+        asignar_folios(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class Venta(VersionadoMixin, models.Model):
+    # Lo genera la BD (trigger/sequence). Django no lo pide en forms/admin;
+    # regresa en el INSERT ... RETURNING (DbReturningCharField).
+    folio = DbReturningCharField(
         max_length=30,
         unique=True,
         db_index=True,
@@ -68,6 +82,11 @@ class Venta(models.Model):
     pagada_en = models.DateTimeField(null=True, blank=True)
     entregada_en = models.DateTimeField(null=True, blank=True)
 
+    # Concurrencia optimista: todo cambio la incrementa (servicios con F(); save() vía VersionadoMixin).
+    version = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = VentaQuerySet.as_manager()
+
     class Meta:
         ordering = ("-creada_en", "-id")
         indexes = [
@@ -92,38 +111,83 @@ class Venta(models.Model):
             raise ValidationError(errors)
 
     @staticmethod
-    def recalcular_totales_por_id(venta_id: int) -> None:
+    def calcular_totales(subtotal: Decimal | None, descuento: Decimal | None) -> dict[str, Decimal]:
         """
-        Recalcula subtotal/descuento/total en BD.
+        Regla única de totales a partir de la suma de detalles.
         - IVA/impuestos: 0 por ahora (luego lo metemos).
         """
+        subtotal = subtotal or Decimal("0.00")
+        descuento = descuento or Decimal("0.00")
+
+        impuestos = Decimal("0.00")
+        total = subtotal - descuento + impuestos
+        if total < 0:
+            total = Decimal("0.00")
+
+        return {
+            "subtotal": subtotal,
+            "descuento": descuento,
+            "impuestos": impuestos,
+            "total": total,
+        }
+
+    @staticmethod
+    def recalcular_totales_por_id(venta_id: int, version: int | None = None) -> dict[str, Decimal] | None:
+        """
+        Recalcula subtotal/descuento/total en BD (e incrementa version).
+        Con `version`, el UPDATE es compare-and-swap: devuelve None si la venta
+        ya no está en esa versión.
+        """
         from ventas.models import VentaDetalle  # import local (OK)
 
         agg = VentaDetalle.objects.filter(venta_id=venta_id).aggregate(
             subtotal=Sum("precio"),
             descuento=Sum("descuento"),
         )
+        totales = Venta.calcular_totales(agg["subtotal"], agg["descuento"])
 
-        subtotal = agg["subtotal"] or Decimal("0.00")
-        descuento = agg["descuento"] or Decimal("0.00")
+        qs = Venta.objects.filter(pk=venta_id)
+        if version is not None:
+            qs = qs.filter(version=version)
+        if not qs.update(version=models.F("version") + 1, **totales):
+            return None
+        return totales
 
-        impuestos = Decimal("0.00")
-        total = subtotal - descuento + impuestos
-        if total < 0:
-            total = Decimal("0.00")
+    @staticmethod
+    def recalcular_totales_por_ids(venta_ids) -> dict[int, dict[str, Decimal]]:
+        """
+        Versión en lote: un solo GROUP BY sobre detalles y un solo UPDATE (bulk_update).
+        Devuelve {venta_id: totales} para que el llamador no tenga que releer.
+        """
+        from ventas.models import VentaDetalle  # import local (OK)
 
-        Venta.objects.filter(pk=venta_id).update(
-            subtotal=subtotal,
-            descuento=descuento,
-            impuestos=impuestos,
-            total=total,
-        )
+        venta_ids = list(venta_ids)
+        if not venta_ids:
+            return {}
+
+        agg = {
+            row["venta_id"]: row
+            for row in VentaDetalle.objects.filter(venta_id__in=venta_ids)
+            .order_by()
+            .values("venta_id")
+            .annotate(subtotal=Sum("precio"), descuento=Sum("descuento"))
+        }
+
+        totales: dict[int, dict[str, Decimal]] = {}
+        ventas = []
+        for venta_id in venta_ids:
+            row = agg.get(venta_id, {})
+            totales[venta_id] = Venta.calcular_totales(row.get("subtotal"), row.get("descuento"))
+            ventas.append(Venta(pk=venta_id, version=models.F("version") + 1, **totales[venta_id]))
+
+        Venta.objects.bulk_update(ventas, ["subtotal", "descuento", "impuestos", "total", "version"])
+        return totales
 
 
 # ----------------------------
 # Detalle (líneas)
 # ----------------------------
-class VentaDetalle(models.Model):
+class VentaDetalle(ValidacionEnBDMixin, models.Model):
     """
     Un Articulo SOLO puede estar en una venta (y por ende venderse una vez).
     """
@@ -169,7 +233,7 @@ class VentaDetalle(models.Model):
             raise ValidationError(errors)
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        # Validación: ValidacionEnBDMixin (reglas en Python, UNIQUE en la BD)
         super().save(*args, **kwargs)
         venta_id = self.venta_id
         transaction.on_commit(lambda: Venta.recalcular_totales_por_id(venta_id))
@@ -183,7 +247,7 @@ class VentaDetalle(models.Model):
 # ----------------------------
 # Pagos
 # ----------------------------
-class Pago(models.Model):
+class Pago(ValidacionEnBDMixin, models.Model):
     venta = models.ForeignKey(Venta, on_delete=models.CASCADE, related_name="pagos")
     metodo = models.CharField(max_length=20, choices=MetodoPago.choices)
 
@@ -206,10 +270,6 @@ class Pago(models.Model):
     def __str__(self) -> str:
         return f"{self.venta.folio or self.venta_id} - {self.metodo} {self.monto}"
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
-
     def delete(self, *args, **kwargs):
         super().delete(*args, **kwargs)
 
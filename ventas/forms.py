@@ -5,7 +5,7 @@ from decimal import Decimal
 from django import forms
 from django.core.exceptions import ValidationError
 
-from inventario.models import Articulo, ArticuloEstado
+from inventario.models import Articulo, ArticuloEstado, Producto, Ubicacion
 from .models import Cliente, Venta, VentaDetalle, Pago, MetodoPago
 
 
@@ -54,6 +54,25 @@ class VentaDetalleForm(forms.ModelForm):
         return cleaned
 
 
+class AsignarUnidadesForm(forms.Form):
+    """
+    POS: "N unidades de este SKU", sin elegir serie.
+    """
+
+    producto = forms.ModelChoiceField(queryset=Producto.objects.filter(activo=True).order_by("sku"))
+    cantidad = forms.IntegerField(min_value=1, initial=1)
+    grado = forms.CharField(max_length=10, required=False)
+    condicion = forms.CharField(max_length=50, required=False)
+    ubicacion = forms.ModelChoiceField(queryset=Ubicacion.objects.order_by("nombre"), required=False)
+    precio = forms.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        min_value=Decimal("0.00"),
+        required=False,
+        help_text="Vacío = precio de venta del producto.",
+    )
+
+
 class PagoForm(forms.ModelForm):
     class Meta:
         model = Pago
@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.db import connection
+
+SEQ_NAME = "ventas_folio_seq"
+
+def format_folio(n: int, fecha: date) -> str:
+    # Mismo formato que el trigger ventas_set_folio: VTA-YYYYMMDD-00000001
+    return f"VTA-{fecha:%Y%m%d}-{str(n).zfill(8)}"
+
+def next_folio_nums(n: int) -> list[int]:
+    """n valores de la secuencia en un round trip (el llamador pone la fecha)."""
+    if n <= 0:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT nextval('{SEQ_NAME}') FROM generate_series(1, %s)", [n])
+        return sorted(int(val) for (val,) in cursor.fetchall())
+
+def reservar_folios(n: int) -> list[str]:
+    """
+    Reserva n folios en un solo round trip.
+    CURRENT_DATE sale de la misma sesión que usaría el trigger, así la fecha coincide.
+    """
+    if n <= 0:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT nextval('{SEQ_NAME}'), CURRENT_DATE FROM generate_series(1, %s)",
+            [n],
+        )
+        filas = sorted(cursor.fetchall())
+    return [format_folio(int(val), fecha) for val, fecha in filas]
+
+def asignar_folios(ventas) -> None:
+    pendientes = [v for v in ventas if not (v.folio or "").strip()]
+    for v, folio in zip(pendientes, reservar_folios(len(pendientes))):
+        v.folio = folio
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from core.infrastructure.db import es_error_reintentable
+from inventario.models import Articulo, ArticuloEstado, Producto
+from ventas.application.services import (
+    asignar_unidades,
+    cancelar_venta,
+    cancelar_ventas_lote,
+    marcar_pagada,
+    marcar_pagadas_lote,
+    reservar_articulos,
+    reservar_articulos_lote,
+)
+from ventas.models import Cliente, MetodoPago, Venta, VentaDetalle, VentaEstado
+
+OPERACIONES = ("asignar", "reservar", "pagar", "cancelar", "reservar_lote", "pagar_lote", "cancelar_lote")
+
+
+@dataclass
+class Escenario:
+    hilos: int = 8
+    duracion: float = 30.0  # segundos
+    productos: int = 5  # pocos SKUs = más choque por las mismas unidades
+    unidades: int = 2_000  # Articulo DISPONIBLE por producto
+    lote: int = 6  # ventas por operación en lote (traslapadas entre hilos)
+    semilla: int = 1
+    prefijo: str = "STRESS"
+
+
+@dataclass
+class ResultadoStress:
+    duracion: float = 0.0
+    latencias: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))  # ms por operación
+    rechazadas: int = 0  # ValidationError: regla de negocio, no falla del harness
+    errores: list[str] = field(default_factory=list)  # DatabaseError que escaparon
+    reintentos: int = 0  # conflictos absorbidos por reintentar_en_conflicto
+    deadlocks: int = 0  # pg_stat_database.deadlocks (delta)
+    espera_locks_s: float = 0.0  # muestreo de pg_stat_activity (wait_event_type = Lock)
+    max_esperando: int = 0
+    violaciones: list[str] = field(default_factory=list)
+
+    @property
+    def operaciones(self) -> int:
+        return sum(len(v) for v in self.latencias.values())
+
+
+def percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+class _ContadorReintentos(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.n = 0
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        with self._lock:
+            self.n += 1
+
+
+# ----------------------------
+# Datos del escenario
+# ----------------------------
+def preparar(escenario: Escenario, vendedor) -> tuple[Cliente, list[Producto]]:
+    """Productos/artículos propios del harness (por prefijo), creados con bulk_create."""
+    if Producto.objects.filter(sku__startswith=f"{escenario.prefijo}-").exists():
+        raise ValueError(f"Ya hay datos con prefijo {escenario.prefijo!r}: usa --limpiar u otro --prefijo.")
+
+    cliente = Cliente.objects.create(nombre=f"{escenario.prefijo} cliente")
+    productos = Producto.objects.bulk_create(
+        [
+            Producto(sku=f"{escenario.prefijo}-{k:03d}", nombre=f"Stress {k}", precio_venta=Decimal("100.00"))
+            for k in range(escenario.productos)
+        ]
+    )
+    Articulo.objects.bulk_create(
+        [
+            Articulo(producto=p, serie=f"{p.sku}-{n:06d}", created_by=vendedor)
+            for p in productos
+            for n in range(escenario.unidades)
+        ],
+        batch_size=5_000,
+    )
+    return cliente, productos
+
+
+def limpiar(prefijo: str) -> None:
+    ventas = Venta.objects.filter(cliente__nombre=f"{prefijo} cliente")
+    ventas.delete()  # CASCADE: detalles y pagos
+    Articulo.objects.filter(producto__sku__startswith=f"{prefijo}-").delete()
+    Producto.objects.filter(sku__startswith=f"{prefijo}-").delete()
+    Cliente.objects.filter(nombre=f"{prefijo} cliente").delete()
+
+
+# ----------------------------
+# Muestreo de locks
+# ----------------------------
+def _deadlocks() -> int:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_stat_clear_snapshot()")
+        cursor.execute("SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()")
+        return int(cursor.fetchone()[0])
+
+
+def _muestrear_locks(resultado: ResultadoStress, alto: threading.Event, intervalo: float = 0.05) -> None:
+    """Backends esperando un lock × intervalo ≈ tiempo total de espera por locks."""
+    try:
+        with connection.cursor() as cursor:
+            while not alto.is_set():
+                cursor.execute(
+                    "SELECT count(*) FROM pg_stat_activity "
+                    "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+                )
+                esperando = int(cursor.fetchone()[0])
+                resultado.espera_locks_s += esperando * intervalo
+                resultado.max_esperando = max(resultado.max_esperando, esperando)
+                alto.wait(intervalo)
+    finally:
+        connection.close()
+
+
+# ----------------------------
+# Trabajadores
+# ----------------------------
+def _trabajador(
+    n: int,
+    escenario: Escenario,
+    cliente: Cliente,
+    productos: list[Producto],
+    vendedor,
+    mis_ventas: list[int],
+    todas: list[int],
+    resultado: ResultadoStress,
+    lock: threading.Lock,
+    barrera: threading.Barrier,
+    fin: float,
+) -> None:
+    """
+    Un cajero: abre ventas y pelea por las mismas unidades (asignar, SKIP LOCKED),
+    reserva/paga/cancela las suyas y, como el admin, corre lotes sobre ventas de
+    todos los hilos (sets traslapados, orden aleatorio a propósito).
+    """
+    rnd = random.Random(escenario.semilla * 1_000 + n)
+    latencias: dict[str, list[float]] = defaultdict(list)
+    rechazadas = 0
+    errores: list[str] = []
+
+    def venta_propia() -> Venta | None:
+        return Venta(pk=rnd.choice(mis_ventas)) if mis_ventas else None
+
+    try:
+        barrera.wait()
+        while time.monotonic() < fin:
+            op = rnd.choices(OPERACIONES, weights=(30, 15, 20, 10, 10, 8, 7))[0]
+            t0 = time.perf_counter()
+            try:
+                if op == "asignar":
+                    venta = Venta.objects.create(cliente=cliente, vendedor=vendedor)
+                    mis_ventas.append(venta.pk)
+                    with lock:
+                        todas.append(venta.pk)
+                    asignar_unidades(venta, rnd.choice(productos), rnd.randint(1, 3))
+                elif op in ("reservar", "pagar", "cancelar"):
+                    venta = venta_propia()
+                    if venta is None:
+                        continue
+                    if op == "reservar":
+                        reservar_articulos(venta)
+                    elif op == "pagar":
+                        marcar_pagada(venta, MetodoPago.EFECTIVO, Decimal("300.00"))
+                    else:
+                        cancelar_venta(venta)
+                else:
+                    with lock:
+                        ids = rnd.sample(todas, k=min(escenario.lote, len(todas)))
+                    if not ids:
+                        continue
+                    {
+                        "reservar_lote": reservar_articulos_lote,
+                        "pagar_lote": marcar_pagadas_lote,
+                        "cancelar_lote": cancelar_ventas_lote,
+                    }[op](ids)
+            except ValidationError:
+                rechazadas += 1
+            except DatabaseError as e:
+                # Con el orden global de locks no debería escapar ninguno (ni tras reintentos)
+                tipo = "deadlock/serialización" if es_error_reintentable(e) else "BD"
+                errores.append(f"{op} [{tipo}]: {e}")
+                continue
+            latencias[op].append((time.perf_counter() - t0) * 1000)
+    finally:
+        connection.close()
+        with lock:
+            for op, valores in latencias.items():
+                resultado.latencias[op].extend(valores)
+            resultado.rechazadas += rechazadas
+            resultado.errores.extend(errores)
+
+
+# ----------------------------
+# Invariantes
+# ----------------------------
+def verificar(prefijo: str) -> list[str]:
+    violaciones = []
+    ventas = Venta.objects.filter(cliente__nombre=f"{prefijo} cliente")
+    detalles = VentaDetalle.objects.filter(venta__in=ventas)
+    vendidas = (VentaEstado.PAGADA, VentaEstado.ENTREGADA)
+
+    # Vendido dos veces / vendido sin venta pagada
+    n = Articulo.objects.filter(producto__sku__startswith=f"{prefijo}-", estado=ArticuloEstado.VENDIDO).exclude(
+        venta_detalle__venta__estado__in=vendidas
+    ).count()
+    if n:
+        violaciones.append(f"{n} artículos VENDIDO sin venta PAGADA/ENTREGADA")
+    n = detalles.filter(venta__estado__in=vendidas).exclude(articulo__estado=ArticuloEstado.VENDIDO).count()
+    if n:
+        violaciones.append(f"{n} detalles de ventas pagadas con artículo no VENDIDO")
+    n = detalles.values("articulo_id").annotate(n=Count("id")).filter(n__gt=1).count()
+    if n:
+        violaciones.append(f"{n} artículos en más de un detalle")
+
+    # Reservas colgadas
+    n = detalles.filter(venta__estado=VentaEstado.CANCELADA, articulo__estado=ArticuloEstado.RESERVADO).count()
+    if n:
+        violaciones.append(f"{n} artículos RESERVADO en ventas CANCELADAS")
+
+    # Totales vs detalles
+    dinero = DecimalField(max_digits=12, decimal_places=2)
+    por_venta = VentaDetalle.objects.filter(venta=OuterRef("pk")).order_by().values("venta")
+    suma = Coalesce(
+        Subquery(por_venta.annotate(s=Sum("precio")).values("s")),
+        Value(Decimal("0.00")),
+        output_field=dinero,
+    )
+    n = ventas.annotate(suma=suma).exclude(subtotal=F("suma")).count()
+    if n:
+        violaciones.append(f"{n} ventas con subtotal distinto a la suma de detalles")
+
+    # Pagadas con pagos insuficientes
+    pagado = Coalesce(Sum("pagos__monto"), Value(Decimal("0.00")), output_field=dinero)
+    n = ventas.filter(estado__in=vendidas).annotate(pagado=pagado).filter(pagado__lt=F("total")).count()
+    if n:
+        violaciones.append(f"{n} ventas pagadas con pagos < total")
+    n = ventas.exclude(estado__in=vendidas).filter(~Q(pagos=None)).count()
+    if n:
+        violaciones.append(f"{n} ventas sin pagar con pagos registrados")
+    return violaciones
+
+
+def correr(escenario: Escenario, vendedor) -> ResultadoStress:
+    resultado = ResultadoStress()
+    cliente, productos = preparar(escenario, vendedor)
+
+    contador = _ContadorReintentos()
+    logger = logging.getLogger("core.infrastructure.db")
+    logger.addHandler(contador)
+    deadlocks_antes = _deadlocks()
+
+    alto = threading.Event()
+    muestreo = threading.Thread(target=_muestrear_locks, args=(resultado, alto), daemon=True)
+    lock = threading.Lock()
+    barrera = threading.Barrier(escenario.hilos + 1)
+    todas: list[int] = []
+    fin = time.monotonic() + escenario.duracion + 1  # +1: margen para la barrera
+
+    hilos = [
+        threading.Thread(
+            target=_trabajador,
+            args=(n, escenario, cliente, productos, vendedor, [], todas, resultado, lock, barrera, fin),
+        )
+        for n in range(escenario.hilos)
+    ]
+    try:
+        for h in hilos:
+            h.start()
+        muestreo.start()
+        barrera.wait()
+        inicio = time.monotonic()
+        for h in hilos:
+            h.join()
+        resultado.duracion = time.monotonic() - inicio
+    finally:
+        alto.set()
+        muestreo.join()
+        logger.removeHandler(contador)
+
+    resultado.reintentos = contador.n
+    resultado.deadlocks = _deadlocks() - deadlocks_antes
+    resultado.violaciones = verificar(escenario.prefijo)
+    return resultado
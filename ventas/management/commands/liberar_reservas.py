@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ventas.application.services import liberar_reservas_vencidas
+
+
+class Command(BaseCommand):
+    help = "Libera reservas vencidas (RESERVADO -> DISPONIBLE). Pensado para correr cada minuto."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=500,
+            help="Artículos por transacción (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        if options["lote"] < 1:
+            raise CommandError("--lote debe ser >= 1.")
+        liberadas = liberar_reservas_vencidas(lote=options["lote"])
+        self.stdout.write(self.style.SUCCESS(f"Reservas liberadas: {liberadas}"))
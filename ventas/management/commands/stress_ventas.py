@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ventas.infrastructure.stress import OPERACIONES, Escenario, correr, limpiar, percentil
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress de concurrencia sobre ventas: N hilos reservan/pagan/cancelan sets traslapados contra "
+        "PostgreSQL local. Reporta throughput, p50/p99, espera por locks, deadlocks e invariantes."
+    )
+
+    def add_arguments(self, parser):
+        defaults = Escenario()
+        parser.add_argument("--hilos", type=int, default=defaults.hilos)
+        parser.add_argument("--duracion", type=float, default=defaults.duracion, help="Segundos.")
+        parser.add_argument("--productos", type=int, default=defaults.productos)
+        parser.add_argument("--unidades", type=int, default=defaults.unidades, help="Artículos por producto.")
+        parser.add_argument("--lote", type=int, default=defaults.lote, help="Ventas por operación en lote.")
+        parser.add_argument("--semilla", type=int, default=defaults.semilla)
+        parser.add_argument("--prefijo", default=defaults.prefijo)
+        parser.add_argument("--usuario", default="", help="username vendedor (default: primer superuser).")
+        parser.add_argument("--salida", default="", help="JSON con el reporte (opcional).")
+        parser.add_argument("--limpiar", action="store_true", help="Borra los datos del prefijo antes y después.")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if options["usuario"]:
+            vendedor = User.objects.filter(username=options["usuario"]).first()
+        else:
+            vendedor = User.objects.filter(is_superuser=True).order_by("id").first()
+        if vendedor is None:
+            raise CommandError("Se necesita un usuario (--usuario o un superuser) como vendedor.")
+
+        escenario = Escenario(
+            hilos=options["hilos"],
+            duracion=options["duracion"],
+            productos=options["productos"],
+            unidades=options["unidades"],
+            lote=options["lote"],
+            semilla=options["semilla"],
+            prefijo=options["prefijo"],
+        )
+
+        if options["limpiar"]:
+            limpiar(escenario.prefijo)
+        try:
+            resultado = correr(escenario, vendedor)
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            if options["limpiar"]:
+                limpiar(escenario.prefijo)
+
+        reporte = {
+            "hilos": escenario.hilos,
+            "duracion_s": round(resultado.duracion, 2),
+            "operaciones": resultado.operaciones,
+            "throughput_ops_s": round(resultado.operaciones / resultado.duracion, 1) if resultado.duracion else 0,
+            "rechazadas": resultado.rechazadas,
+            "reintentos": resultado.reintentos,
+            "deadlocks": resultado.deadlocks,
+            "espera_locks_s": round(resultado.espera_locks_s, 2),
+            "max_esperando_lock": resultado.max_esperando,
+            "errores": resultado.errores,
+            "violaciones": resultado.violaciones,
+            "latencias_ms": {
+                op: {
+                    "n": len(resultado.latencias[op]),
+                    "p50": round(percentil(resultado.latencias[op], 50), 2),
+                    "p99": round(percentil(resultado.latencias[op], 99), 2),
+                }
+                for op in OPERACIONES
+                if resultado.latencias.get(op)
+            },
+        }
+
+        self.stdout.write(
+            f"{reporte['operaciones']} ops en {reporte['duracion_s']}s · {reporte['throughput_ops_s']} ops/s · "
+            f"{reporte['hilos']} hilos"
+        )
+        self.stdout.write(f"{'operación':<16} {'n':>7} {'p50 ms':>9} {'p99 ms':>9}")
+        for op, lat in reporte["latencias_ms"].items():
+            self.stdout.write(f"{op:<16} {lat['n']:>7} {lat['p50']:>9} {lat['p99']:>9}")
+        self.stdout.write(
+            f"Rechazadas (reglas): {reporte['rechazadas']} · Reintentos: {reporte['reintentos']} · "
+            f"Deadlocks (pg_stat): {reporte['deadlocks']} · Espera por locks: {reporte['espera_locks_s']}s "
+            f"(máx {reporte['max_esperando_lock']} esperando)"
+        )
+
+        if options["salida"]:
+            Path(options["salida"]).write_text(json.dumps(reporte, indent=2, ensure_ascii=False), encoding="utf-8")
+
+        fallas = resultado.errores + resultado.violaciones
+        for f in fallas:
+            self.stderr.write(self.style.ERROR(f))
+        if fallas:
+            raise CommandError(f"{len(resultado.errores)} errores, {len(resultado.violaciones)} violaciones")
+        self.stdout.write(self.style.SUCCESS("Sin errores ni violaciones de invariantes ✅"))
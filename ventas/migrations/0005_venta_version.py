@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventas', '0004_alter_ventadetalle_descuento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venta',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
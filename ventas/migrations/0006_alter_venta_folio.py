@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 23:32
+
+import core.infrastructure.db
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventas', '0005_venta_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='venta',
+            name='folio',
+            field=core.infrastructure.db.DbReturningCharField(blank=True, db_index=True, editable=False, max_length=30, unique=True),
+        ),
+    ]
@@ -1,3 +1,497 @@
-from django.test import TestCase
+from __future__ import annotations
 
-# Create your tests here.
+import random
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from core.infrastructure.db import ConflictoConcurrencia, ValidacionEnBDMixin, es_error_reintentable
+from core.infrastructure.metricas import REINTENTOS
+from inventario.models import Articulo, ArticuloEstado, Producto
+from ventas.application import services
+from ventas.application.services import (
+    asignar_unidades,
+    cancelar_venta,
+    cancelar_ventas_lote,
+    liberar_reservas_vencidas,
+    marcar_pagada,
+    marcar_pagadas_lote,
+    recalcular_totales_lote,
+    reservar_articulos,
+    reservar_articulos_lote,
+)
+from ventas.infrastructure.folio import reservar_folios
+from ventas.models import Cliente, MetodoPago, Pago, Venta, VentaDetalle, VentaEstado
+
+
+class OrdenDeLocksStressTests(TransactionTestCase):
+    """
+    Cajeros, admin y el barrido de reservas en paralelo sobre las mismas ventas.
+    Los artículos de cada venta van intercalados por id con los de las demás y cada
+    hilo pasa los lotes en otro orden (ascendente, descendente, aleatorio): sin el
+    orden global de locks habría deadlocks. Tampoco vale que el reintento los tape:
+    el contador de reintentos no debe moverse.
+    """
+
+    HILOS = 8
+    ITERACIONES = 30
+    VENTAS = 12
+    ARTICULOS_POR_VENTA = 4
+    LIBRES = 40
+
+    def setUp(self):
+        vendedor = get_user_model().objects.create_user(username="cajero", password="x")
+        cliente = Cliente.objects.create(nombre="Cliente stress")
+        self.producto = Producto.objects.create(sku="STRESS-1", nombre="Stress", precio_venta=Decimal("100.00"))
+
+        ventas = [Venta.objects.create(cliente=cliente, vendedor=vendedor) for _ in range(self.VENTAS)]
+        # Round-robin: los ids de artículo de una venta quedan intercalados con los de las otras
+        for j in range(self.ARTICULOS_POR_VENTA):
+            for i, venta in enumerate(ventas):
+                articulo = Articulo.objects.create(producto=self.producto, serie=f"S-{i}-{j}")
+                VentaDetalle.objects.create(venta=venta, articulo=articulo, precio=Decimal("100.00"))
+        # Unidades sueltas que asignar_unidades reparte entre las ventas
+        for k in range(self.LIBRES):
+            Articulo.objects.create(producto=self.producto, serie=f"L-{k}")
+        self.venta_ids = [v.pk for v in ventas]
+
+    def _trabajador(self, semilla: int, barrera: threading.Barrier, errores: list):
+        rnd = random.Random(semilla)
+        manana = timezone.now() + timedelta(days=1)
+        # (peso, operación)
+        operaciones = [
+            (4, lambda ids: reservar_articulos_lote(ids)),
+            (3, lambda ids: recalcular_totales_lote(ids)),
+            (3, lambda ids: reservar_articulos(Venta(pk=ids[0]))),
+            (3, lambda ids: asignar_unidades(Venta(pk=ids[0]), self.producto)),
+            # Toma RESERVADO por id sin pasar por la venta (SKIP LOCKED)
+            (3, lambda ids: liberar_reservas_vencidas(lote=5, ahora=manana)),
+            (1, lambda ids: cancelar_ventas_lote(ids[:2])),
+            (1, lambda ids: cancelar_venta(Venta(pk=ids[0]))),
+            (1, lambda ids: marcar_pagadas_lote(ids[:2])),
+            (1, lambda ids: marcar_pagada(Venta(pk=ids[0]), metodo=MetodoPago.EFECTIVO, monto=Decimal("1000.00"))),
+        ]
+        ordenar = (sorted, lambda ids: sorted(ids, reverse=True), lambda ids: ids)[semilla % 3]
+        try:
+            barrera.wait()
+            for _ in range(self.ITERACIONES):
+                # La mitad de las ventas en cada lote: los hilos se pisan siempre
+                ids = ordenar(rnd.sample(self.venta_ids, k=self.VENTAS // 2))
+                _, operacion = rnd.choices(operaciones, weights=[peso for peso, _ in operaciones])[0]
+                try:
+                    operacion(ids)
+                except ValidationError:
+                    pass
+                except DatabaseError as e:
+                    errores.append(e)
+        finally:
+            connection.close()
+
+    def _reintentos(self) -> float:
+        return sum(s.value for s in REINTENTOS.collect()[0].samples if s.name.endswith("_total"))
+
+    def test_sin_deadlocks_bajo_carga_paralela(self):
+        errores: list[DatabaseError] = []
+        barrera = threading.Barrier(self.HILOS)
+        hilos = [
+            threading.Thread(target=self._trabajador, args=(semilla, barrera, errores))
+            for semilla in range(self.HILOS)
+        ]
+        reintentos = self._reintentos()
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+
+        # Un deadlock reintentado con éxito no llega a `errores`, pero sí al contador
+        self.assertEqual(self._reintentos(), reintentos)
+        deadlocks = [e for e in errores if es_error_reintentable(e)]
+        self.assertEqual(deadlocks, [])
+        self.assertEqual(errores, [])
+
+        # Invariantes: pagadas => todo VENDIDO; canceladas/borrador => nada VENDIDO
+        for venta in Venta.objects.prefetch_related("detalles__articulo"):
+            estados = {d.articulo.estado for d in venta.detalles.all()}
+            if venta.estado == VentaEstado.PAGADA:
+                self.assertEqual(estados, {ArticuloEstado.VENDIDO})
+            else:
+                self.assertNotIn(ArticuloEstado.VENDIDO, estados)
+
+
+class LiberarReservasTests(TestCase):
+    def setUp(self):
+        producto = Producto.objects.create(sku="TTL-1", nombre="TTL", precio_venta=Decimal("10.00"))
+        self.ahora = timezone.now()
+        self.vencida = Articulo.objects.create(
+            producto=producto, estado=ArticuloEstado.RESERVADO, reservado_hasta=self.ahora - timedelta(minutes=1)
+        )
+        self.vigente = Articulo.objects.create(
+            producto=producto, estado=ArticuloEstado.RESERVADO, reservado_hasta=self.ahora + timedelta(minutes=5)
+        )
+        self.manual = Articulo.objects.create(producto=producto, estado=ArticuloEstado.RESERVADO)
+
+    def test_libera_solo_vencidas(self):
+        self.assertEqual(liberar_reservas_vencidas(lote=1, ahora=self.ahora), 1)
+        estados = dict(Articulo.objects.values_list("id", "estado"))
+        self.assertEqual(estados[self.vencida.pk], ArticuloEstado.DISPONIBLE)
+        self.assertEqual(estados[self.vigente.pk], ArticuloEstado.RESERVADO)
+        self.assertEqual(estados[self.manual.pk], ArticuloEstado.RESERVADO)
+
+    def test_lote_invalido(self):
+        for lote in (0, -1):
+            with self.subTest(lote=lote):
+                with self.assertRaises(ValueError):
+                    liberar_reservas_vencidas(lote=lote)
+                with self.assertRaises(CommandError):
+                    call_command("liberar_reservas", f"--lote={lote}")
+
+
+# ----------------------------
+# Validación respaldada por constraints (ValidacionEnBDMixin)
+# ----------------------------
+class ArticuloValidado(ValidacionEnBDMixin, Articulo):
+    """Articulo con el mixin, para probar un UniqueConstraint condicional (uniq_articulo_serie)."""
+
+    class Meta:
+        proxy = True
+        app_label = "inventario"
+
+
+class _DatosVenta:
+    def _datos(self):
+        vendedor = get_user_model().objects.create_user(username="constraints", password="x")
+        cliente = Cliente.objects.create(nombre="Cliente constraints")
+        self.producto = Producto.objects.create(sku="UNQ-1", nombre="Unique", precio_venta=Decimal("10.00"))
+        self.venta = Venta.objects.create(cliente=cliente, vendedor=vendedor)
+        self.otra = Venta.objects.create(cliente=cliente, vendedor=vendedor)
+        self.articulo = Articulo.objects.create(producto=self.producto, serie="UNQ-S1")
+        # bulk_create: sin pasar por save(); el artículo sigue DISPONIBLE
+        VentaDetalle.objects.bulk_create([VentaDetalle(venta=self.venta, articulo=self.articulo, precio=1)])
+
+    def _duplicado(self) -> VentaDetalle:
+        return VentaDetalle(venta=self.otra, articulo=self.articulo, precio=Decimal("1.00"))
+
+    def _errores_full_clean(self, obj) -> dict:
+        with self.assertRaises(ValidationError) as ctx:
+            obj.full_clean()
+        return ctx.exception.message_dict
+
+    def _errores_save(self, obj) -> dict:
+        with self.assertRaises(ValidationError) as ctx:
+            obj.save()
+        self.assertIsInstance(ctx.exception.__cause__, IntegrityError)
+        return ctx.exception.message_dict
+
+
+class ValidacionEnBDTests(_DatosVenta, TestCase):
+    def setUp(self):
+        self._datos()
+        VentaDetalle.unicos_en_bd.cache_clear()
+        self.addCleanup(VentaDetalle.unicos_en_bd.cache_clear)
+
+    def test_unique_dentro_de_atomic_igual_que_full_clean(self):
+        esperado = self._errores_full_clean(self._duplicado())
+        self.assertIn("articulo", esperado)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._errores_save(self._duplicado()), esperado)
+        self.assertTrue(any(q["sql"].startswith("SAVEPOINT") for q in ctx.captured_queries))
+        # El savepoint dejó usable la transacción del llamador
+        self.assertEqual(VentaDetalle.objects.filter(articulo=self.articulo).count(), 1)
+
+    def test_nombre_uniq_de_django(self):
+        # unique agregado por AlterField: Django lo nombra ..._uniq, no <tabla>_<col>_key
+        tabla = VentaDetalle._meta.db_table
+        nombre = f"{tabla}_articulo_id_0abc_uniq"
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {tabla} RENAME CONSTRAINT {tabla}_articulo_id_key TO {nombre}")
+        self.assertEqual(self._errores_save(self._duplicado()), self._errores_full_clean(self._duplicado()))
+        self.assertEqual(VentaDetalle.unicos_en_bd(), {nombre: ("articulo",)})
+
+    @mock.patch.object(ArticuloValidado._meta, "constraints", Articulo._meta.constraints)
+    def test_unique_constraint_condicional(self):
+        # El Meta de un modelo concreto no se hereda al proxy (y los checks no aceptan repetirlo)
+        nuevo = ArticuloValidado(producto=self.producto, serie="UNQ-S1")
+        esperado = self._errores_full_clean(nuevo)
+        self.assertEqual(self._errores_save(ArticuloValidado(producto=self.producto, serie="UNQ-S1")), esperado)
+        # Fuera de la condición (serie vacía) no hay constraint
+        ArticuloValidado(producto=self.producto, serie="").save()
+        ArticuloValidado(producto=self.producto, serie="").save()
+
+    def test_sin_constraints_sin_savepoint(self):
+        self.assertFalse(Pago.hay_que_traducir())
+        with CaptureQueriesContext(connection) as ctx:
+            Pago.objects.create(venta=self.venta, metodo=MetodoPago.EFECTIVO, monto=Decimal("1.00"))
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    @override_settings(VALIDACION_EN_BD=False)
+    def test_modo_full_clean(self):
+        esperado = self._errores_full_clean(self._duplicado())
+        with self.assertRaises(ValidationError) as ctx:
+            self._duplicado().save()
+        self.assertIsNone(ctx.exception.__cause__)
+        self.assertEqual(ctx.exception.message_dict, esperado)
+
+
+class ValidacionEnBDAutocommitTests(_DatosVenta, TransactionTestCase):
+    def setUp(self):
+        self._datos()
+
+    def test_unique_fuera_de_atomic_igual_que_full_clean(self):
+        self.assertFalse(connection.in_atomic_block)
+        esperado = self._errores_full_clean(self._duplicado())
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._errores_save(self._duplicado()), esperado)
+        self.assertFalse(any(q["sql"].startswith("SAVEPOINT") for q in ctx.captured_queries))
+        self.assertEqual(VentaDetalle.objects.filter(articulo=self.articulo).count(), 1)
+
+
+# ----------------------------
+# Concurrencia optimista (VENTAS_CONCURRENCIA=optimista) y VersionadoMixin
+# ----------------------------
+class _VentaConArticulos:
+    def _datos(self):
+        self.vendedor = get_user_model().objects.create_user(username="optimista", password="x")
+        cliente = Cliente.objects.create(nombre="Cliente optimista")
+        self.producto = Producto.objects.create(sku="OPT-1", nombre="Optimista", precio_venta=Decimal("10.00"))
+        self.venta = Venta.objects.create(cliente=cliente, vendedor=self.vendedor)
+        self.articulos = [Articulo.objects.create(producto=self.producto, serie=f"OPT-{i}") for i in range(2)]
+        for articulo in self.articulos:
+            VentaDetalle.objects.create(venta=self.venta, articulo=articulo, precio=Decimal("10.00"))
+
+    def _editar_en_medio(self, veces: int):
+        """
+        Entre la lectura y la escritura del servicio, alguien guarda el artículo (admin/form):
+        VersionadoMixin incrementa su versión y el compare-and-swap ya no la encuentra.
+        """
+        leer = services._leer_articulos
+        llamadas = []
+
+        def _leer_articulos(articulo_ids):
+            leidos = leer(articulo_ids)
+            llamadas.append(articulo_ids)
+            if len(llamadas) <= veces:
+                Articulo.objects.get(pk=self.articulos[0].pk).save()
+            return leidos
+
+        return mock.patch.object(services, "_leer_articulos", _leer_articulos), llamadas
+
+    def _version_venta(self) -> int:
+        return Venta.objects.values_list("version", flat=True).get(pk=self.venta.pk)
+
+    def _estados(self) -> set[str]:
+        return set(Articulo.objects.filter(pk__in=[a.pk for a in self.articulos]).values_list("estado", flat=True))
+
+
+@override_settings(VENTAS_CONCURRENCIA="optimista")
+class ConcurrenciaOptimistaTests(_VentaConArticulos, TestCase):
+    def setUp(self):
+        self._datos()
+
+    def test_cas_falla_si_otro_guardo_el_articulo(self):
+        parche, llamadas = self._editar_en_medio(veces=1)
+        # Dentro de un atomic() no se reintenta: el conflicto llega al llamador
+        version = self._version_venta()
+        with parche, self.assertRaises(ConflictoConcurrencia):
+            reservar_articulos(self.venta)
+        self.assertEqual(len(llamadas), 1)
+        self.assertEqual(self._estados(), {ArticuloEstado.DISPONIBLE})
+        self.assertEqual(self._version_venta(), version)
+
+    def test_sin_conflicto(self):
+        version = self._version_venta()
+        venta = reservar_articulos(self.venta)
+        self.assertEqual(venta.version, version + 1)
+        self.assertEqual(self._version_venta(), venta.version)
+        self.assertEqual(self._estados(), {ArticuloEstado.RESERVADO})
+
+    def test_save_incrementa_version(self):
+        articulo = Articulo.objects.get(pk=self.articulos[0].pk)
+        articulo.observaciones = "editado"
+        articulo.save()
+        self.assertEqual(articulo.version, 1)
+
+        articulo.observaciones = "otra vez"
+        articulo.save(update_fields=["observaciones"])
+        self.assertEqual(articulo.version, 2)
+        self.assertEqual(Articulo.objects.get(pk=articulo.pk).version, 2)
+
+        version = self._version_venta()
+        Venta.objects.get(pk=self.venta.pk).save()
+        self.assertEqual(self._version_venta(), version + 1)
+
+    def test_save_del_admin_incrementa_version(self):
+        admin = get_user_model().objects.create_superuser(username="admin-opt", password="x")
+        self.client.force_login(admin)
+        articulo = self.articulos[0]
+        url = reverse("admin:inventario_articulo_change", args=[articulo.pk])
+        prefijo = self.client.get(url, secure=True).context["inline_admin_formsets"][0].formset.prefix
+        datos = {
+            "producto": self.producto.pk,
+            "serie": articulo.serie,
+            "estado": ArticuloEstado.DISPONIBLE,
+            "observaciones": "desde el admin",
+            f"{prefijo}-TOTAL_FORMS": 0,
+            f"{prefijo}-INITIAL_FORMS": 0,
+        }
+        for campo in ("etiqueta_interna", "condicion", "grado", "accesorios", "ubicacion", "created_by"):
+            datos[campo] = ""
+
+        resp = self.client.post(url, datos, secure=True)
+        self.assertEqual(resp.status_code, 302)
+        articulo.refresh_from_db()
+        self.assertEqual((articulo.observaciones, articulo.version), ("desde el admin", 1))
+
+
+@override_settings(VENTAS_CONCURRENCIA="optimista")
+class ReintentoConflictoTests(_VentaConArticulos, TransactionTestCase):
+    def setUp(self):
+        self._datos()
+
+    def _reintentos(self) -> float:
+        return REGISTRY.get_sample_value("db_reintentos_conflicto_total", {"funcion": "reservar_articulos"}) or 0
+
+    @mock.patch("core.infrastructure.db.time.sleep")
+    def test_conflicto_se_reintenta(self, _sleep):
+        antes, version = self._reintentos(), self._version_venta()
+        parche, llamadas = self._editar_en_medio(veces=1)
+        with parche, self.assertLogs("core.infrastructure.db", "WARNING") as logs:
+            venta = reservar_articulos(self.venta)
+        self.assertEqual(len(logs.records), 1)
+
+        self.assertEqual(len(llamadas), 2)
+        self.assertEqual(self._reintentos(), antes + 1)
+        self.assertEqual(self._estados(), {ArticuloEstado.RESERVADO})
+        # El save() del primer intento se deshizo con su transacción
+        self.assertEqual(self._version_venta(), version + 1)
+        self.assertEqual(venta.version, version + 1)
+        self.assertEqual(Articulo.objects.get(pk=self.articulos[0].pk).version, 1)
+
+    @mock.patch("core.infrastructure.db.time.sleep")
+    def test_conflicto_persistente_se_propaga(self, _sleep):
+        parche, llamadas = self._editar_en_medio(veces=10)
+        with parche, self.assertLogs("core.infrastructure.db", "WARNING"), self.assertRaises(ConflictoConcurrencia):
+            reservar_articulos(self.venta)
+        self.assertEqual(len(llamadas), 4)
+        self.assertEqual(self._estados(), {ArticuloEstado.DISPONIBLE})
+
+
+# ----------------------------
+# asignar_unidades (POS: cualquier unidad DISPONIBLE del producto)
+# ----------------------------
+class _UnidadesSueltas:
+    def _datos(self):
+        vendedor = get_user_model().objects.create_user(username="pos", password="x")
+        self.cliente = Cliente.objects.create(nombre="Cliente POS")
+        self.venta = Venta.objects.create(cliente=self.cliente, vendedor=vendedor)
+        self.producto = Producto.objects.create(sku="POS-1", nombre="POS", precio_venta=Decimal("50.00"))
+        self.unidades = [
+            Articulo.objects.create(producto=self.producto, serie=f"POS-{i}", grado="A" if i % 2 else "B")
+            for i in range(4)
+        ]
+
+
+class AsignarUnidadesTests(_UnidadesSueltas, TestCase):
+    def setUp(self):
+        self._datos()
+
+    def test_reserva_las_primeras_disponibles_y_recalcula(self):
+        detalles = asignar_unidades(self.venta, self.producto, 2)
+
+        self.assertEqual([d.articulo_id for d in detalles], [a.pk for a in self.unidades[:2]])
+        self.assertEqual({d.precio for d in detalles}, {Decimal("50.00")})
+        estados = dict(Articulo.objects.values_list("pk", "estado"))
+        self.assertEqual(
+            [estados[a.pk] for a in self.unidades],
+            [ArticuloEstado.RESERVADO, ArticuloEstado.RESERVADO, ArticuloEstado.DISPONIBLE, ArticuloEstado.DISPONIBLE],
+        )
+        # Reserva con vencimiento (la de venta), no manual
+        manuales = Articulo.objects.filter(estado=ArticuloEstado.RESERVADO, reservado_hasta__isnull=True)
+        self.assertFalse(manuales.exists())
+        self.venta.refresh_from_db()
+        self.assertEqual(self.venta.subtotal, Decimal("100.00"))
+
+    def test_filtros_y_articulos_ya_ligados(self):
+        # Ligado a otra venta (cancelada y ya DISPONIBLE): no se vuelve a asignar
+        otra = Venta.objects.create(cliente=self.cliente, vendedor=self.venta.vendedor, estado=VentaEstado.CANCELADA)
+        VentaDetalle.objects.bulk_create([VentaDetalle(venta=otra, articulo=self.unidades[1], precio=1)])
+
+        detalles = asignar_unidades(self.venta, self.producto, 1, grado="A")
+        self.assertEqual([d.articulo_id for d in detalles], [self.unidades[3].pk])
+
+    def test_faltan_unidades(self):
+        with self.assertRaisesMessage(ValidationError, "Solo hay 2 unidad(es) disponible(s) de POS-1"):
+            asignar_unidades(self.venta, self.producto, 3, grado="A")
+        self.assertFalse(self.venta.detalles.exists())
+        self.assertFalse(Articulo.objects.exclude(estado=ArticuloEstado.DISPONIBLE).exists())
+
+    def test_venta_fuera_de_borrador_o_cantidad_invalida(self):
+        with self.assertRaises(ValidationError):
+            asignar_unidades(self.venta, self.producto, 0)
+        Venta.objects.filter(pk=self.venta.pk).update(estado=VentaEstado.PAGADA)
+        with self.assertRaisesMessage(ValidationError, "BORRADOR"):
+            asignar_unidades(self.venta, self.producto, 1)
+        self.assertFalse(self.venta.detalles.exists())
+
+
+class AsignarUnidadesSkipLockedTests(_UnidadesSueltas, TransactionTestCase):
+    def setUp(self):
+        self._datos()
+
+    def test_salta_las_unidades_bloqueadas_por_otro_cajero(self):
+        bloqueada, liberar = threading.Event(), threading.Event()
+
+        def otro_cajero():
+            try:
+                with transaction.atomic():
+                    Articulo.objects.select_for_update().filter(pk=self.unidades[0].pk).exists()
+                    bloqueada.set()
+                    liberar.wait(timeout=10)
+            finally:
+                connection.close()
+
+        hilo = threading.Thread(target=otro_cajero)
+        hilo.start()
+        try:
+            self.assertTrue(bloqueada.wait(timeout=10))
+            with connection.cursor() as cursor:
+                # Si esperara el lock en vez de saltarlo, falla rápido en lugar de colgarse
+                cursor.execute("SET lock_timeout = '2s'")
+            self.addCleanup(lambda: connection.cursor().execute("RESET lock_timeout"))
+            detalles = asignar_unidades(self.venta, self.producto, 2)
+        finally:
+            liberar.set()
+            hilo.join()
+
+        self.assertEqual([d.articulo_id for d in detalles], [self.unidades[1].pk, self.unidades[2].pk])
+        self.assertEqual(Articulo.objects.get(pk=self.unidades[0].pk).estado, ArticuloEstado.DISPONIBLE)
+
+
+class FolioEnBloqueTests(TestCase):
+    def test_bulk_create_usa_el_formato_del_trigger(self):
+        vendedor = get_user_model().objects.create_user(username="folios", password="x")
+        cliente = Cliente.objects.create(nombre="Cliente folios")
+        por_trigger = Venta.objects.create(cliente=cliente, vendedor=vendedor)
+
+        with CaptureQueriesContext(connection) as ctx:
+            ventas = Venta.objects.bulk_create([Venta(cliente=cliente, vendedor=vendedor) for _ in range(3)])
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+        prefijo, numero = por_trigger.folio.rsplit("-", 1)
+        esperados = [f"{prefijo}-{int(numero) + i:08d}" for i in (1, 2, 3)]
+        self.assertEqual([v.folio for v in ventas], esperados)
+        en_bd = Venta.objects.filter(pk__in=[v.pk for v in ventas]).order_by("pk").values_list("folio", flat=True)
+        self.assertEqual(list(en_bd), esperados)
+        self.assertEqual(reservar_folios(0), [])
@@ -17,6 +17,7 @@ urlpatterns = [
 
     # Detalles
     path("<int:venta_id>/detalles/agregar/", web_views.venta_add_detalle, name="venta_add_detalle"),
+    path("<int:venta_id>/detalles/unidades/", web_views.venta_add_unidades, name="venta_add_unidades"),
     path("<int:venta_id>/detalles/<int:detalle_id>/eliminar/", web_views.venta_delete_detalle, name="venta_delete_detalle"),
 
     # Pagos
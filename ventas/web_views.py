@@ -10,14 +10,18 @@ from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
+from core.infrastructure.db import ConflictoConcurrencia
+from core.middleware import presupuesto_queries
+
 from .application.services import (
+    asignar_unidades,
     recalcular_totales,
     reservar_articulos,
     marcar_pagada,
     cancelar_venta,
     marcar_entregada,
 )
-from .forms import ClienteForm, VentaCreateForm, VentaDetalleForm, PagoForm
+from .forms import AsignarUnidadesForm, ClienteForm, VentaCreateForm, VentaDetalleForm, PagoForm
 from .models import Cliente, Venta, VentaEstado, MetodoPago
 
 
@@ -26,6 +30,7 @@ from .models import Cliente, Venta, VentaEstado, MetodoPago
 # ----------------------------
 @login_required
 @require_http_methods(["GET"])
+@presupuesto_queries(8)
 def ventas_list(request):
     q = (request.GET.get("q") or "").strip()
     estado = (request.GET.get("estado") or "").strip()
@@ -92,8 +97,8 @@ def venta_create(request):
         if form.is_valid():
             venta = form.save(commit=False)
             venta.vendedor = request.user
-            venta.save()
-            messages.success(request, f"Venta creada ({venta.folio or 'sin folio aún'}).")
+            venta.save()  # folio regresa en el INSERT ... RETURNING
+            messages.success(request, f"Venta creada ({venta.folio}).")
             return redirect("ventas:venta_detail", venta_id=venta.id)
         messages.error(request, "Revisa el formulario.")
     else:
@@ -104,6 +109,7 @@ def venta_create(request):
 
 @login_required
 @require_http_methods(["GET"])
+@presupuesto_queries(15)
 def venta_detail(request, venta_id: int):
     venta = get_object_or_404(
         Venta.objects.select_related("cliente", "vendedor").prefetch_related("detalles__articulo__producto", "pagos"),
@@ -111,6 +117,7 @@ def venta_detail(request, venta_id: int):
     )
 
     detalle_form = VentaDetalleForm(venta=venta)
+    unidades_form = AsignarUnidadesForm()
     pago_form = PagoForm()
 
     return render(
@@ -119,6 +126,7 @@ def venta_detail(request, venta_id: int):
         {
             "venta": venta,
             "detalle_form": detalle_form,
+            "unidades_form": unidades_form,
             "pago_form": pago_form,
         },
     )
@@ -145,6 +153,33 @@ def venta_add_detalle(request, venta_id: int):
     return redirect("ventas:venta_detail", venta_id=venta.id)
 
 
+@login_required
+@require_http_methods(["POST"])
+def venta_add_unidades(request, venta_id: int):
+    venta = get_object_or_404(Venta, pk=venta_id)
+
+    form = AsignarUnidadesForm(request.POST)
+    if form.is_valid():
+        data = form.cleaned_data
+        try:
+            detalles = asignar_unidades(
+                venta,
+                data["producto"],
+                data["cantidad"],
+                grado=data["grado"],
+                condicion=data["condicion"],
+                ubicacion=data["ubicacion"],
+                precio=data["precio"],
+            )
+            messages.success(request, f"{len(detalles)} unidad(es) de {data['producto'].sku} agregada(s) y reservada(s).")
+        except ValidationError as e:
+            messages.error(request, f"Validación: {e.messages}")
+    else:
+        messages.error(request, "No se pudieron agregar unidades. Revisa los datos.")
+
+    return redirect("ventas:venta_detail", venta_id=venta.id)
+
+
 @login_required
 @require_http_methods(["POST"])
 @transaction.atomic
@@ -182,8 +217,9 @@ def venta_add_pago(request, venta_id: int):
 # ----------------------------
 @login_required
 @require_http_methods(["POST"])
-@transaction.atomic
 def venta_action(request, venta_id: int, action: str):
+    # Sin atomic() aquí: cada servicio abre su propia transacción (con orden de
+    # locks venta -> artículos) y puede reintentarla si hay deadlock/serialización.
     venta = get_object_or_404(Venta, pk=venta_id)
 
     try:
@@ -196,7 +232,7 @@ def venta_action(request, venta_id: int, action: str):
             messages.success(request, "Artículos reservados.")
 
         elif action == "pagar_efectivo":
-            recalcular_totales(venta)
+            venta = recalcular_totales(venta)
             total = Decimal(venta.total or Decimal("0.00"))
             marcar_pagada(venta, metodo=MetodoPago.EFECTIVO, monto=total, referencia="")
             messages.success(request, "Venta marcada como PAGADA (efectivo).")
@@ -212,6 +248,9 @@ def venta_action(request, venta_id: int, action: str):
         else:
             messages.error(request, "Acción no soportada.")
 
+    except ConflictoConcurrencia:
+        messages.warning(request, "La venta cambió mientras se procesaba. Intenta de nuevo.")
+
     except ValidationError as e:
         # Django puede mandar dict/lista/string, lo normalizamos
         msg = getattr(e, "message_dict", None) or getattr(e, "messages", None) or [str(e)]